@@ -0,0 +1,52 @@
+from packages.Board import Board, GridStorages
+from packages.Block import Block
+from packages.Player import Player
+import random
+import timeit
+import copy
+
+REPEAT = 2000
+
+
+def filled_board(width: int, height: int, fill: float, storage: GridStorages) -> Board:
+    board = Board(width, height, Player(persistent=False), engine="BITBOARD", storage=storage, seed=1)
+    cells = random.Random(1)
+    for x in range(width):
+        for y in range(2, height):
+            if cells.random() < fill:
+                board.grid[x][y] = Block.shared()
+    return board
+
+
+def snapshot_cost(board: Board) -> float:
+    ''' microseconds of a snapshot, a write that unshares one column and the restore '''
+    column = board.grid[0]
+
+    def lookahead():
+        snapshot = board.snapshot()
+        column[1] = Block.shared()
+        board.restore(snapshot)
+
+    return min(timeit.repeat(lookahead, number=REPEAT, repeat=3)) / REPEAT * 10**6
+
+
+def deepcopy_cost(board: Board) -> float:
+    ''' microseconds of the same lookahead done with a deep copy of the board '''
+    def lookahead():
+        copy.deepcopy(board).grid[0][1] = Block.shared()
+
+    return min(timeit.repeat(lookahead, number=REPEAT // 20, repeat=3)) / (REPEAT // 20) * 10**6
+
+
+def main():
+    print(f"{'board':>10} {'storage':>8} {'fill':>5} {'snapshot+restore':>17} {'deepcopy':>10}")
+    for width, height in ((12, 20), (48, 60)):
+        for storage in ("LIST", "COMPACT"):
+            for fill in (0.0, 0.5, 0.9):
+                board = filled_board(width, height, fill, storage)
+                print(f"{width}x{height:<7} {storage:>8} {fill:>5.1f} {snapshot_cost(board):>14.2f} us "
+                      f"{deepcopy_cost(board):>7.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from packages.SimulationFarm import SimulationFarm, MatchConfig, FarmPolicies
+from packages.Difficulty import shifted_difficulty
+from typing import get_args
+import functools
+import argparse
+import itertools
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roda partidas headless em paralelo e agrega as estatísticas.")
+    parser.add_argument("--matches", type=int, default=100, help="partidas por configuração")
+    parser.add_argument("--master-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--sizes", nargs="+", default=["12x20"], help="dimensões, ex: 12x20 10x24")
+    parser.add_argument("--multipliers", nargs="+", type=float, default=[1.0])
+    parser.add_argument("--level-shifts", nargs="+", type=int, default=[0],
+                        help="desloca a curva de dificuldade em níveis")
+    parser.add_argument("--max-ticks", type=int, default=200_000)
+    parser.add_argument("--output", default=None, help="arquivo .csv ou .jsonl")
+    parser.add_argument("--policy", choices=get_args(FarmPolicies), default="RANDOM_PLACEMENT",
+                        help="quem joga as partidas")
+    args = parser.parse_args()
+
+    configs: list[MatchConfig] = []
+    for size, multiplier, shift in itertools.product(args.sizes, args.multipliers, args.level_shifts):
+        width, height = (int(value) for value in size.split("x"))
+        curve = functools.partial(shifted_difficulty, shift)
+        curve.__name__ = f"shift{shift:+d}"  # type: ignore
+        configs.append(MatchConfig(width, height, curve, multiplier, policy=args.policy, max_ticks=args.max_ticks))
+
+    farm = SimulationFarm(configs, args.matches, args.master_seed, args.workers)
+    start = time.perf_counter()
+    summaries = farm.run(args.output)
+    elapsed = time.perf_counter() - start
+
+    for label, summary in summaries.items():
+        print(label)
+        for name, field in summary.items():
+            print(f"  {name:>7}: média {field.mean:10.1f}  desvio {field.stdev:10.1f}  "
+                  f"min {field.minimum:8g}  mediana {field.median:8g}  max {field.maximum:8g}")
+    print(f"{len(configs) * args.matches} partidas em {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,27 @@
 from packages.GameManager import GameManager
+from packages.AutoShift import AutoShift
+import argparse
 import curses
+import signal
 
 
-def main(stdscr: curses.window):
-    mgr = GameManager(stdscr)
+def main(stdscr: curses.window, args: argparse.Namespace):
+    auto_shift = AutoShift(args.das, args.arr) if args.das != None else None
+    mgr = GameManager(stdscr, autoplay=args.autoplay, auto_shift=auto_shift, profile_path=args.profile)
+    profiler = mgr.profiler
+    if profiler != None and hasattr(signal, "SIGUSR1"):
+        # kill -USR1 writes the timings of the match so far
+        signal.signal(signal.SIGUSR1, lambda signum, frame: profiler.request_dump())
     mgr.menu(True)
 
 
 if __name__ == "__main__":
-    curses.wrapper(main)
+    parser = argparse.ArgumentParser(description="Fallock no terminal.")
+    parser.add_argument("--autoplay", action="store_true", help="o computador joga as partidas")
+    parser.add_argument("--das", type=float, default=None,
+                        help="ms segurando esquerda/direita até a peça deslizar sozinha, desligado por padrão")
+    parser.add_argument("--arr", type=float, default=33, help="ms entre os deslizes, 0 desliza até a parede")
+    parser.add_argument("--profile", default=None, metavar="ARQUIVO",
+                        help="mede cada fase do laço do jogo e grava em ARQUIVO (JSON) ao fim da partida ou com SIGUSR1")
+    args = parser.parse_args()
+    curses.wrapper(main, args)
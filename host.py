@@ -0,0 +1,53 @@
+from packages.Session import Session
+from packages.SessionRuntime import SessionRuntime
+from packages.SimulationFarm import RandomPlacementPolicy
+import argparse
+import asyncio
+import time
+
+
+async def bot(runtime: SessionRuntime, session_id: int, session: Session, seed: int, interval: float):
+    policy = RandomPlacementPolicy(seed)
+    while session_id in runtime.sessions:
+        runtime.send(session_id, policy.command(session.board))
+        await asyncio.sleep(interval)
+
+
+async def host(sessions: int, seconds: float, interval: float, master_seed: int):
+    runtime = SessionRuntime()
+    bots: list[asyncio.Task[None]] = []
+    for index in range(sessions):
+        session = Session(seed=master_seed + index)
+        session_id = runtime.start(session)
+        bots.append(asyncio.create_task(bot(runtime, session_id, session, master_seed + index, interval)))
+
+    start = time.perf_counter()
+    await asyncio.sleep(seconds)
+    lateness = runtime.max_lateness
+    active = len(runtime.sessions)
+    await runtime.stop_all()
+    await asyncio.gather(*bots, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    steps = sum(result.physics_ticks for result in runtime.results.values())
+    print(f"{sessions} sessões, {active} ainda ativas após {elapsed:.1f}s")
+    print(f"{steps} passos de física, {steps / elapsed:.0f} por segundo")
+    print(f"maior atraso de um passo: {lateness * 1000:.1f} ms")
+    failed = sum(result.error != None for result in runtime.results.values())
+    if failed:
+        print(f"{failed} sessões falharam, veja o log")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hospeda várias partidas com bots em um único processo.")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=0.05, help="segundos entre os comandos de cada bot")
+    parser.add_argument("--master-seed", type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(host(args.sessions, args.seconds, args.interval, args.master_seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+from packages.Board import Board
+from packages.BoardSnapshot import BoardSnapshot
+from packages.Piece import Piece
+from packages.Command import Command
+from packages.Placements import Placement
+from dataclasses import dataclass
+from typing import Literal, TypeAlias
+import time
+
+# PLACE: steer the piece to a resting placement and drop it there
+# TELEPORTER: steer the piece over the placement columns and teleport its blocks down
+# BOMB: turn the piece into a bomb and drop the bomb on the placement
+MoveKinds: TypeAlias = Literal["PLACE", "TELEPORTER", "BOMB"]
+
+
+@dataclass(frozen=True)
+class FeatureWeights:
+    aggregate_height: float = -0.510066
+    lines: float = 0.760666
+    holes: float = -0.35663
+    bumpiness: float = -0.184483
+    # spending the power up has to buy at least this much
+    power_up: float = -0.5
+
+
+@dataclass(frozen=True)
+class Move:
+    kind: MoveKinds
+    placement: Placement
+
+
+@dataclass
+class SearchNode:
+    # first move from the searched position, the one that gets played
+    move: Move | None
+    # None on the last level, nothing is searched from there
+    snapshot: BoardSnapshot | None
+    value: float
+
+
+def evaluate(board: Board, lines: int, weights: FeatureWeights) -> float:
+    if board.game_over:
+        return float("-inf")
+
+    features = board.features
+    return (weights.aggregate_height * features.aggregate_height + weights.lines * lines
+            + weights.holes * features.holes + weights.bumpiness * features.bumpiness)
+
+
+def apply_move(board: Board, move: Move):
+    ''' plays the move at once, without the steps in between '''
+    if move.kind == "BOMB":
+        board.movement("TRIGGER_POWERUP")
+
+    piece = board.player_piece
+    piece.origin.x, piece.origin.y, piece.rotation = move.placement
+
+    if move.kind == "TELEPORTER":
+        board.movement("TRIGGER_POWERUP")
+        return
+
+    board.petrify_piece(piece)
+    board.score_line()
+
+
+def step_state(state: Placement, step: Command) -> Placement:
+    x, y, rotation = state
+    if step == "LEFT":
+        return (x - 1, y, rotation)
+    if step == "RIGHT":
+        return (x + 1, y, rotation)
+    if step == "CLOCKWISE_ROTATION":
+        return (x, y, (rotation + 1) % 4)
+    if step == "COUNTERWISE_ROTATION":
+        return (x, y, (rotation - 1) % 4)
+    return state
+
+
+class AutoPlayer:
+    '''
+    Plays the game through the same commands as the keyboard.
+
+    Every new piece starts a beam search over the resting placements of the
+    active piece and of the visible spawnlist, scored by the weighted board
+    features. The search runs on a clone of the board and stops when the move
+    budget runs out. The best move of the deepest finished level is played, or
+    the best one scored so far when even the first level did not finish.
+    '''
+    budget_ms: float | None
+    beam_width: int
+    depth: int
+    weights: FeatureWeights
+    piece: Piece | None
+    move: Move | None
+    plan: list[Command]
+    expected: Placement
+    last_search_depth: int
+
+    def __init__(self, budget_ms: float | None = 20, beam_width: int = 4, depth: int = 2, weights: FeatureWeights = FeatureWeights()):
+        # None searches every level, the moves then only depend on the board
+        self.budget_ms = budget_ms
+        self.beam_width = beam_width
+        self.depth = depth
+        self.weights = weights
+        self.piece = None
+        self.move = None
+        self.plan = []
+        self.expected = (0, 0, 0)
+        self.last_search_depth = 0
+
+    def command(self, board: Board) -> Command:
+        if board.game_over or board.is_animating:
+            return None
+
+        piece = board.player_piece
+        state = (piece.origin.x, piece.origin.y, piece.rotation)
+        if piece is not self.piece:
+            self.piece = piece
+            self.move = self.search(board)
+            self.follow(board, state)
+        else:
+            x, y, rotation = self.expected
+            if self.plan and self.plan[0] == None and state == (x, y + 1, rotation):
+                # gravity took the step the plan was waiting for
+                self.plan.pop(0)
+                self.expected = state
+            if state != self.expected:
+                self.follow(board, state)
+
+        if not self.plan:
+            return None
+
+        step = self.plan[0]
+        if step == None:
+            if any(self.plan):
+                return None
+            # only falls left, the hard drop lands on the same placement
+            self.plan.clear()
+            return "HARD_DROP"
+
+        self.plan.pop(0)
+        self.expected = step_state(state, step)
+        return step
+
+    def follow(self, board: Board, state: Placement):
+        ''' plans the commands from the piece state to the chosen move, searching again when it is out of reach '''
+        self.expected = state
+        self.plan = []
+        if self.move == None:
+            return
+
+        if self.move.kind == "BOMB":
+            # the bomb is a new piece, its placement is planned when it spawns
+            self.plan = ["TRIGGER_POWERUP"]
+            return
+
+        paths = board.reachable_placements()
+        if self.move.placement not in paths:
+            self.move = self.search(board)
+            if self.move == None or self.move.kind == "BOMB":
+                self.plan = [] if self.move == None else ["TRIGGER_POWERUP"]
+                return
+            paths = board.reachable_placements()
+
+        path = list(paths[self.move.placement])
+        if self.move.kind == "TELEPORTER":
+            # the teleport only needs the columns and the rotation
+            while path and path[-1] == None:
+                path.pop()
+            path.append("TRIGGER_POWERUP")
+        self.plan = path
+
+    def candidate_moves(self, board: Board, with_power_ups: bool) -> list[Move]:
+        moves = [Move("PLACE", placement) for placement in board.reachable_placements()]
+        power_up = board.player_manager.power_up
+        if not with_power_ups or board.player_piece.type == "BOMB" or power_up.is_active:
+            return moves
+
+        if power_up.name == "TELEPORTER":
+            columns: set[tuple[int, int]] = set()
+            for move in moves[:]:
+                x, _, rotation = move.placement
+                if (x, rotation) not in columns:
+                    columns.add((x, rotation))
+                    moves.append(Move("TELEPORTER", move.placement))
+
+        if power_up.name == "BOMB":
+            snapshot = board.snapshot()
+            board.movement("TRIGGER_POWERUP")
+            moves += [Move("BOMB", placement) for placement in board.reachable_placements()]
+            board.restore(snapshot)
+
+        return moves
+
+    def search(self, board: Board) -> Move | None:
+        deadline = None if self.budget_ms == None else time.perf_counter() + self.budget_ms / 1000
+        # the clone shares the placement cache, lookahead boards settle collapses at once
+        probe = board.clone()
+        probe.collapse_mode = "INSTANT"
+        start_lines = probe.lines_cleared
+        # the active piece and the previews the player can see
+        depth = min(self.depth, 1 + len(probe.spawnlist))
+
+        beam = [SearchNode(None, probe.snapshot(), 0.0)]
+        best: Move | None = None
+        self.last_search_depth = 0
+
+        for level in range(depth):
+            children: list[SearchNode] = []
+            timed_out = False
+
+            for node in beam:
+                assert node.snapshot != None
+                probe.restore(node.snapshot)
+                if probe.game_over:
+                    continue
+
+                for move in self.candidate_moves(probe, level == 0):
+                    # at least one move is always scored, so there is something to play
+                    if deadline != None and children and time.perf_counter() > deadline:
+                        timed_out = True
+                        break
+
+                    probe.restore(node.snapshot)
+                    apply_move(probe, move)
+                    first_move = move if node.move == None else node.move
+                    value = evaluate(probe, probe.lines_cleared - start_lines, self.weights)
+                    if first_move.kind != "PLACE":
+                        value += self.weights.power_up
+                    snapshot = probe.snapshot() if level + 1 < depth else None
+                    children.append(SearchNode(first_move, snapshot, value))
+
+                if timed_out:
+                    break
+
+            if not children:
+                break
+            if timed_out:
+                # a level cut short only ranks part of the beam, the previous level decides
+                if level == 0:
+                    best = max(children, key=lambda child: child.value).move
+                break
+
+            children.sort(key=lambda child: child.value, reverse=True)
+            beam = children[:self.beam_width]
+            best = beam[0].move
+            self.last_search_depth = level + 1
+
+        return best
@@ -0,0 +1,87 @@
+from typing import Literal, TypeAlias
+
+Direction: TypeAlias = Literal["LEFT", "RIGHT"]
+DIRECTIONS: tuple[Direction, ...] = ("LEFT", "RIGHT")
+
+
+class AutoShift:
+    '''
+    Delayed auto shift (DAS) and auto repeat (ARR) of the sideways moves.
+
+    Pressing a direction shifts the piece once. Held for `das_ms` it shifts
+    again, then once every `arr_ms`, and with an ARR of 0 it slides all the
+    way at once. Everything is measured on the timestamps of the press and
+    release events and the time `due_shifts` is asked at, never on how often
+    the caller looks, so the shifts due since the last call come out as one
+    multi cell shift. The direction pressed last wins while both are held.
+    '''
+    das_ns: int
+    arr_ns: int
+    held: list[Direction]
+    taps: list[Direction]
+    charge_start: int
+    auto_shifts: int
+
+    def __init__(self, das_ms: float = 167, arr_ms: float = 33):
+        self.das_ns = round(das_ms * 10**6)
+        self.arr_ns = round(arr_ms * 10**6)
+        self.clear()
+
+    def clear(self):
+        self.held = []
+        # single shifts of the presses not handed out yet
+        self.taps = []
+        self.charge_start = 0
+        self.auto_shifts = 0
+
+    @property
+    def active(self) -> Direction | None:
+        return self.held[-1] if self.held else None
+
+    def press(self, direction: Direction, time_ns: int, tap: bool = True):
+        if direction in self.held:
+            return
+
+        self.held.append(direction)
+        if tap:
+            self.taps.append(direction)
+        self.charge(time_ns)
+
+    def release(self, direction: Direction, time_ns: int):
+        if direction not in self.held:
+            return
+
+        was_active = direction == self.active
+        self.held.remove(direction)
+        if was_active and self.held:
+            # the direction still held charges again from here, without a new tap
+            self.charge(time_ns)
+
+    def charge(self, time_ns: int):
+        self.charge_start = time_ns
+        self.auto_shifts = 0
+
+    def due_shifts(self, time_ns: int) -> list[tuple[Direction, int]]:
+        ''' shifts due up to `time_ns` as (direction, cells), the cell count of an instant ARR is -1 '''
+        shifts: list[tuple[Direction, int]] = [(direction, 1) for direction in self.taps]
+        self.taps = []
+
+        direction = self.active
+        if direction == None:
+            return shifts
+
+        charged = time_ns - self.charge_start
+        if charged < self.das_ns:
+            return shifts
+
+        if self.arr_ns == 0:
+            if self.auto_shifts == 0:
+                shifts.append((direction, -1))
+                self.auto_shifts = 1
+            return shifts
+
+        total = 1 + (charged - self.das_ns) // self.arr_ns
+        if total > self.auto_shifts:
+            shifts.append((direction, total - self.auto_shifts))
+            self.auto_shifts = total
+        return shifts
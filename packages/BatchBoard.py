@@ -0,0 +1,402 @@
+from packages.Piece import Piece, PIECE_CODES
+from packages.PowerUp import PowerUpNames
+from packages.Command import Command
+from packages.Difficulty import difficulty
+from typing import get_args
+import numpy as np
+
+# piece types are numbered like the keyframes and hashes, the codes after the bomb are the drawn types
+BOMB_TYPE = PIECE_CODES.index("BOMB")
+FIRST_DRAWN_TYPE = BOMB_TYPE + 1
+
+# power up codes, 0 means no power up
+POWERUP_NAMES: tuple[PowerUpNames | None, ...] = (None,) + get_args(PowerUpNames)
+TELEPORTER_CODE = POWERUP_NAMES.index("TELEPORTER")
+BOMB_CODE = POWERUP_NAMES.index("BOMB")
+
+COMMAND_CODES: tuple[Command, ...] = (
+    None, "LEFT", "RIGHT", "CLOCKWISE_ROTATION", "COUNTERWISE_ROTATION", "TRIGGER_POWERUP", "HARD_DROP")
+
+# same blast pattern as Board.run_powerup.explode_bomb
+BOMB_BLAST = np.array([(0, 2),
+                       (-1, -1), (0, -1), (1, -1),
+                       (-2, 0), (-1, 0), (1, 0), (2, 0),
+                       (-1, 1), (0, 1), (1, 1),
+                       (0, -2)], dtype=np.int32)
+
+# past this level the difficulty curve is flat
+DIFFICULTY_LEVELS = 256
+
+
+def build_rotation_table() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Returns (offsets, valid, block_count) where offsets[type, rotation, block] is
+    the relative (x, y) of every block after `rotation` clockwise turns, in the
+    same block order Piece uses. Pieces with less than 4 blocks are padded.
+    '''
+    offsets = np.zeros((len(PIECE_CODES), 4, 4, 2), dtype=np.int32)
+    valid = np.zeros((len(PIECE_CODES), 4), dtype=np.bool_)
+    block_count = np.zeros(len(PIECE_CODES), dtype=np.int32)
+
+    for type_index, piece_type in enumerate(PIECE_CODES):
+        rotations = Piece.ROTATION_OFFSETS[piece_type]
+        block_count[type_index] = len(rotations[0])
+        valid[type_index, :len(rotations[0])] = True
+
+        for rotation, rotation_offsets in enumerate(rotations):
+            for block_index in range(4):
+                offsets[type_index, rotation, block_index] = rotation_offsets[block_index % len(rotation_offsets)]
+
+    return offsets, valid, block_count
+
+
+class BatchBoard:
+    '''
+    N boards advanced together as one (N, height, width) uint8 array.
+
+    `step` follows HeadlessEnvironment.step for every board at once: the
+    collapse animation advances every tick, otherwise the piece falls every
+    `difficulty(level)` ticks, and then every board applies its own command.
+    Locking, line clears, scoring, power ups and the collapse scan follow the
+    Board rules cell for cell.
+    '''
+    count: int
+    width: int
+    height: int
+    cells: np.ndarray
+    game_over: np.ndarray
+    score: np.ndarray
+    level: np.ndarray
+    tick: int
+
+    def __init__(self, count: int, width: int, height: int, seed: int | None = None, chunk_size: int = 1024):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.rng = np.random.default_rng(seed)
+        self.boards = np.arange(count)
+        self.tick = 0
+
+        self.offsets, self.valid, self.block_count = build_rotation_table()
+        self.difficulty_table = np.array(
+            [difficulty(max(level, 1)) for level in range(DIFFICULTY_LEVELS)], dtype=np.int32)
+
+        self.cells = np.zeros((count, height, width), dtype=np.uint8)
+        self.game_over = np.zeros(count, dtype=np.bool_)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.level = np.ones(count, dtype=np.int32)
+        self.tickrate_counter = np.zeros(count, dtype=np.int32)
+
+        # collapse animation, same fields as Board
+        self.is_animating = np.zeros(count, dtype=np.bool_)
+        self.blocks_fell_in_scan = np.zeros(count, dtype=np.bool_)
+        self.collapse_height = np.full(count, -1, dtype=np.int32)
+        self.scan_height = np.full(count, -1, dtype=np.int32)
+
+        # power up of every player and the piece held while the bomb is falling
+        self.power_up = np.zeros(count, dtype=np.int8)
+        self.power_up_active = np.zeros(count, dtype=np.bool_)
+        self.has_held = np.zeros(count, dtype=np.bool_)
+        self.held = np.zeros((count, 4), dtype=np.int32)
+
+        # random draws are generated in chunks, one row per board
+        self.piece_sequence = self.rng.integers(
+            FIRST_DRAWN_TYPE, len(PIECE_CODES), (count, chunk_size), dtype=np.int8)
+        self.piece_cursor = np.zeros(count, dtype=np.int64)
+        self.powerup_sequence = self.rng.integers(
+            1, len(POWERUP_NAMES), (count, chunk_size), dtype=np.int8)
+        self.powerup_cursor = np.zeros(count, dtype=np.int64)
+
+        # active piece as (type, rotation, x, y) and the next pieces in the spawnlist
+        self.piece_type = np.zeros(count, dtype=np.int32)
+        self.piece_rotation = np.zeros(count, dtype=np.int32)
+        self.piece_x = np.zeros(count, dtype=np.int32)
+        self.piece_y = np.zeros(count, dtype=np.int32)
+        self.spawnlist = np.zeros((count, 3), dtype=np.int32)
+
+        self.spawnlist[:, 0] = self.draw_piece_types(self.boards)
+        self.spawnlist[:, 1] = self.draw_piece_types(self.boards)
+        self.spawnlist[:, 2] = self.draw_piece_types(self.boards)
+        self.generate_piece(self.boards)
+
+    @staticmethod
+    def encode_commands(commands: list[Command]) -> np.ndarray:
+        return np.array([COMMAND_CODES.index(command) for command in commands], dtype=np.int8)
+
+    def draw_piece_types(self, boards: np.ndarray) -> np.ndarray:
+        exhausted = boards[self.piece_cursor[boards] >= self.chunk_size]
+        if exhausted.size:
+            self.piece_sequence[exhausted] = self.rng.integers(
+                FIRST_DRAWN_TYPE, len(PIECE_CODES), (exhausted.size, self.chunk_size), dtype=np.int8)
+            self.piece_cursor[exhausted] = 0
+
+        types = self.piece_sequence[boards, self.piece_cursor[boards]]
+        self.piece_cursor[boards] += 1
+        return types
+
+    def draw_powerups(self, boards: np.ndarray) -> np.ndarray:
+        exhausted = boards[self.powerup_cursor[boards] >= self.chunk_size]
+        if exhausted.size:
+            self.powerup_sequence[exhausted] = self.rng.integers(
+                1, len(POWERUP_NAMES), (exhausted.size, self.chunk_size), dtype=np.int8)
+            self.powerup_cursor[exhausted] = 0
+
+        names = self.powerup_sequence[boards, self.powerup_cursor[boards]]
+        self.powerup_cursor[boards] += 1
+        return names
+
+    def block_positions(self, boards: np.ndarray, rotation: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        ''' returns the absolute (x, y) of every block of the active pieces plus the padding mask '''
+        piece_type = self.piece_type[boards]
+        if rotation is None:
+            rotation = self.piece_rotation[boards]
+
+        offsets = self.offsets[piece_type, rotation]
+        xs = offsets[:, :, 0] + self.piece_x[boards, None]
+        ys = offsets[:, :, 1] + self.piece_y[boards, None]
+        return xs, ys, self.valid[piece_type]
+
+    def piece_cells(self, board: int) -> list[tuple[int, int]]:
+        xs, ys, valid = self.block_positions(np.array([board]))
+        return [(int(x), int(y)) for x, y in zip(xs[0][valid[0]], ys[0][valid[0]])]
+
+    def has_collided(self, boards: np.ndarray) -> np.ndarray:
+        xs, ys, valid = self.block_positions(boards)
+        on_floor = ys == self.height-1
+        below_y = np.minimum(ys + 1, self.height - 1)
+        below = self.cells[boards[:, None], below_y, np.clip(xs, 0, self.width-1)] != 0
+        return ((on_floor | below) & valid).any(axis=1)
+
+    def piece_can_move(self, boards: np.ndarray, direction_delta: int) -> np.ndarray:
+        xs, ys, valid = self.block_positions(boards)
+        xs = xs + direction_delta
+        outside = (xs < 0) | (xs >= self.width)
+        inside_rows = (ys >= 0) & (ys < self.height)
+        occupied = self.cells[boards[:, None], np.clip(ys, 0, self.height-1),
+                              np.clip(xs, 0, self.width-1)] != 0
+        return ~((outside | (occupied & inside_rows)) & valid).any(axis=1)
+
+    def piece_can_rotate(self, boards: np.ndarray, rotation: np.ndarray) -> np.ndarray:
+        xs, ys, valid = self.block_positions(boards, rotation)
+        outside = (xs < 0) | (xs >= self.width) | (ys < 0) | (ys >= self.height)
+        occupied = self.cells[boards[:, None], np.clip(ys, 0, self.height-1),
+                              np.clip(xs, 0, self.width-1)] != 0
+        return ~((outside | occupied) & valid).any(axis=1)
+
+    def landing_row(self, boards: np.ndarray) -> np.ndarray:
+        xs, ys, valid = self.block_positions(boards)
+        columns = self.cells[boards[:, None], :, np.clip(xs, 0, self.width-1)] != 0
+        filled_below = columns & (np.arange(self.height) > ys[:, :, None])
+        first_filled_below = np.where(filled_below.any(axis=2),
+                                      np.argmax(filled_below, axis=2), self.height)
+        drop = np.where(valid, first_filled_below - 1 - ys, self.height).min(axis=1)
+        return self.piece_y[boards] + drop
+
+    def hard_drop(self, boards: np.ndarray):
+        self.piece_y[boards] = self.landing_row(boards)
+        self.petrify_piece(boards)
+        self.score_line(boards)
+
+    def generate_piece(self, boards: np.ndarray):
+        self.piece_type[boards] = self.spawnlist[boards, 0]
+        self.piece_rotation[boards] = 0
+        self.piece_x[boards] = self.width // 2
+        self.piece_y[boards] = 0
+        self.spawnlist[boards, :2] = self.spawnlist[boards, 1:]
+        self.spawnlist[boards, 2] = self.draw_piece_types(boards)
+
+    def restore_held_piece(self, boards: np.ndarray):
+        self.piece_type[boards] = self.held[boards, 0]
+        self.piece_rotation[boards] = self.held[boards, 1]
+        self.piece_x[boards] = self.held[boards, 2]
+        self.piece_y[boards] = self.held[boards, 3]
+        self.has_held[boards] = False
+
+    def start_collapse(self, boards: np.ndarray, collapse_height: np.ndarray | int):
+        self.is_animating[boards] = True
+        self.collapse_height[boards] = collapse_height
+        self.scan_height[boards] = self.collapse_height[boards] - 1
+        self.blocks_fell_in_scan[boards] = False
+
+    def score_line(self, boards: np.ndarray):
+        if not boards.size:
+            return
+
+        full = self.cells[boards].all(axis=2)
+        lines = full.sum(axis=1)
+        scoring = lines > 0
+        if not scoring.any():
+            return
+
+        boards = boards[scoring]
+        full = full[scoring]
+        lines = lines[scoring]
+
+        self.level[boards] += 1
+        # the n-th cleared line is worth 100 * n
+        self.score[boards] += 50 * lines * (lines + 1)
+
+        rolling = boards[self.power_up[boards] == 0]
+        self.power_up[rolling] = self.draw_powerups(rolling)
+
+        self.cells[boards] *= ~full[:, :, None]
+        lowest_full_line = self.height - 1 - np.argmax(full[:, ::-1], axis=1)
+        self.start_collapse(boards, lowest_full_line)
+
+    def apply_block_gravity(self, boards: np.ndarray):
+        scan_height = self.scan_height[boards]
+        scan_done = scan_height < 0
+
+        finished = boards[scan_done]
+        fell = self.blocks_fell_in_scan[finished]
+
+        rescan = finished[fell]
+        self.blocks_fell_in_scan[rescan] = False
+        self.scan_height[rescan] = self.collapse_height[rescan] - 1
+
+        settled = finished[~fell]
+        self.collapse_height[settled] = -1
+        self.scan_height[settled] = -1
+        self.is_animating[settled] = False
+        self.score_line(settled)
+
+        scanning = boards[~scan_done & (self.collapse_height[boards] != -1)]
+        rows = self.scan_height[scanning]
+        has_row_below = rows + 1 < self.height
+        moving_boards = scanning[has_row_below]
+        rows = rows[has_row_below]
+
+        row = self.cells[moving_boards, rows]
+        below = self.cells[moving_boards, rows + 1]
+        moving = row & (below ^ 1)
+        self.cells[moving_boards, rows + 1] = below | moving
+        self.cells[moving_boards, rows] = row ^ moving
+        self.blocks_fell_in_scan[moving_boards] |= moving.any(axis=1)
+
+        self.scan_height[scanning] -= 1
+
+    def petrify_piece(self, boards: np.ndarray):
+        # split before the bombs run, an exploded bomb leaves a new piece that must not land as well
+        is_bomb = self.piece_type[boards] == BOMB_TYPE
+        pieces = boards[~is_bomb]
+
+        bombs = boards[is_bomb]
+        bombs = bombs[self.power_up[bombs] != 0]
+        self.run_powerup(bombs)
+        self.generate_piece(bombs)
+
+        xs, ys, valid = self.block_positions(pieces)
+
+        # blocks are written in order until one of them is above the board
+        too_high = (ys < 1) & valid
+        written = valid & (np.cumsum(too_high, axis=1) == 0)
+        rows, blocks = np.nonzero(written)
+        self.cells[pieces[rows], ys[rows, blocks], xs[rows, blocks]] = 1
+
+        lost = too_high.any(axis=1)
+        self.game_over[pieces[lost]] = True
+        self.generate_piece(pieces[~lost])
+
+    def physics_logic(self, boards: np.ndarray):
+        animating = self.is_animating[boards]
+        self.apply_block_gravity(boards[animating])
+
+        boards = boards[~animating]
+        collided = self.has_collided(boards)
+
+        landing = boards[collided]
+        self.petrify_piece(landing)
+        self.score_line(landing)
+
+        self.piece_y[boards[~collided]] += 1
+
+    def run_powerup(self, boards: np.ndarray):
+        power_up = self.power_up[boards]
+        self.teleport_piece(boards[power_up == TELEPORTER_CODE])
+
+        bombs = boards[power_up == BOMB_CODE]
+        active = self.power_up_active[bombs]
+        self.explode_bomb(bombs[active])
+        self.activate_bomb(bombs[~active])
+
+    def teleport_piece(self, boards: np.ndarray):
+        xs, _, valid = self.block_positions(boards)
+
+        for block_index in range(xs.shape[1]):
+            placing = valid[:, block_index]
+            targets = boards[placing]
+            columns = xs[placing, block_index]
+
+            empty = self.cells[targets, :, columns] == 0
+            has_empty = empty.any(axis=1)
+            lowest_empty = self.height - 1 - np.argmax(empty[:, ::-1], axis=1)
+            self.cells[targets[has_empty], lowest_empty[has_empty], columns[has_empty]] = 1
+
+        self.score_line(boards)
+        self.generate_piece(boards)
+        self.power_up[boards] = 0
+
+    def activate_bomb(self, boards: np.ndarray):
+        self.power_up_active[boards] = True
+        self.held[boards] = np.stack([self.piece_type[boards], self.piece_rotation[boards],
+                                      self.piece_x[boards], self.piece_y[boards]], axis=1)
+        self.has_held[boards] = True
+
+        self.piece_type[boards] = BOMB_TYPE
+        self.piece_rotation[boards] = 0
+        self.piece_x[boards] = self.width // 2
+        self.piece_y[boards] = 0
+
+    def explode_bomb(self, boards: np.ndarray):
+        xs, ys, _ = self.block_positions(boards)
+        blast_x = xs[:, :1] + BOMB_BLAST[:, 0]
+        blast_y = ys[:, :1] + BOMB_BLAST[:, 1]
+        inside = (blast_x >= 0) & (blast_x < self.width) & (
+            blast_y >= 0) & (blast_y < self.height)
+
+        rows, blasts = np.nonzero(inside)
+        self.cells[boards[rows], blast_y[rows, blasts], blast_x[rows, blasts]] = 0
+        self.score += 10 * np.bincount(boards[rows], minlength=self.count)
+
+        self.power_up[boards] = 0
+        self.power_up_active[boards] = False
+        self.start_collapse(boards, self.height)
+        self.restore_held_piece(boards)
+
+    def movement(self, boards: np.ndarray, commands: np.ndarray):
+        for direction_delta, code in ((-1, 1), (1, 2)):
+            moving = boards[commands == code]
+            moving = moving[self.piece_can_move(moving, direction_delta)]
+            self.piece_x[moving] += direction_delta
+
+        for rotation_delta, code in ((1, 3), (-1, 4)):
+            rotating = boards[commands == code]
+            rotation = (self.piece_rotation[rotating] + rotation_delta) % 4
+            can_rotate = self.piece_can_rotate(rotating, rotation)
+            self.piece_rotation[rotating[can_rotate]] = rotation[can_rotate]
+
+        triggering = boards[commands == 5]
+        self.run_powerup(triggering[self.power_up[triggering] != 0])
+
+        self.hard_drop(boards[(commands == 6) & ~self.is_animating[boards]])
+
+    def step(self, commands: np.ndarray | None = None):
+        ''' advances every board one logic tick, `commands` holds one COMMAND_CODES index per board '''
+        playing = self.boards[~self.game_over]
+
+        animating = self.is_animating[playing]
+        self.physics_logic(playing[animating])
+
+        ticking = playing[~animating]
+        levels = np.minimum(self.level[ticking], DIFFICULTY_LEVELS - 1)
+        # not ==, a level up can shorten the interval under the ticks already counted
+        falling = self.tickrate_counter[ticking] >= self.difficulty_table[levels]
+        self.physics_logic(ticking[falling])
+        self.tickrate_counter[ticking[falling]] = 0
+        self.tickrate_counter[ticking] += 1
+
+        if commands is not None:
+            self.movement(playing, commands[playing])
+
+        self.tick += 1
@@ -2,5 +2,31 @@ class Block:
     color: list[int]
     symbol: str
 
+    # flyweight table shared by every board, index 0 is the empty cell
+    palette: list['Block | None'] = [None]
+    palette_ids: dict[str, int] = {}
+
     def __init__(self, symbol: str = '#'):
         self.symbol = symbol
+
+    @staticmethod
+    def shared(symbol: str = '#') -> 'Block':
+        return Block.palette[Block.palette_id(symbol)]  # type: ignore
+
+    @staticmethod
+    def palette_id(symbol: str) -> int:
+        palette_id = Block.palette_ids.get(symbol)
+        if palette_id != None:
+            return palette_id
+
+        # compact grids store the id in a single byte
+        if len(Block.palette) > 255:
+            raise ValueError("Block palette is full")
+
+        palette_id = len(Block.palette)
+        Block.palette.append(Block(symbol))
+        Block.palette_ids[symbol] = palette_id
+        return palette_id
+
+
+Block.palette_id('#')
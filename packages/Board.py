@@ -1,16 +1,61 @@
 from packages.Block import Block
+from packages.Bitboard import Bitboard
+from packages.GridColumn import GridColumn
+from packages.CompactGrid import CompactGrid
+from packages.SparseGrid import SparseGrid
 from packages.Piece import Piece, generatableTypes
 from packages.Vector2 import Vector2
-from packages.InputHandler import Command
+from packages.Command import Command
 from packages.Player import Player
 from packages.PowerUp import PowerUp, PowerUpNamesNSpecials
-from typing import Callable, Any, Literal
+from packages.RandomGenerator import RandomGenerator
+from packages.BoardSnapshot import BoardSnapshot, SNAPSHOT_FIELDS
+from packages.BoardFeatures import BoardFeatures
+from packages.Zobrist import cell_keys, piece_key, spawn_key, POWER_UP_KEYS
+from packages.Placements import PlacementPaths, enumerate_placements
+from packages.TranspositionTable import TranspositionTable
+from typing import Callable, Any, Iterator, Literal, Sequence, TypeAlias
+from dataclasses import dataclass
+import copy
+
+# GRID walks the cell lists, BITBOARD answers collisions with row bitmasks
+BoardEngines: TypeAlias = Literal["GRID", "BITBOARD"]
+# LIST keeps a list of Block references per column, COMPACT one bytearray of palette ids,
+# SPARSE only the chunks of rows holding a block, for mega and endless boards
+GridStorages: TypeAlias = Literal["LIST", "COMPACT", "SPARSE"]
+# ANIMATED drops the blocks one scan row per physics call, INSTANT settles them right away
+CollapseModes: TypeAlias = Literal["ANIMATED", "INSTANT"]
+
+
+@dataclass(frozen=True)
+class CollapseFrame:
+    ''' one step of an animated collapse, it never changes after the board moves on '''
+    scan_height: int
+    # occupancy after the step, bit y of column_masks[x] set when (x, y) is filled
+    column_masks: tuple[int, ...]
+    # (x, y) of every cell filled or emptied by the step, line clears included
+    changed: tuple[tuple[int, int], ...]
 
 
 class Board:
     player_piece: Piece
     player_manager: Player
-    grid: list[list[Block | None]]
+    generator: RandomGenerator
+    seed: int
+    grid: list[GridColumn] | CompactGrid | SparseGrid
+    storage: GridStorages
+    engine: BoardEngines
+    bitboard: Bitboard | None
+    collapse_mode: CollapseModes
+    column_masks: list[int]
+    column_heights: list[int]
+    row_counts: list[int]
+    full_rows: set[int]
+    features: BoardFeatures
+    shared_columns: int
+    cell_keys: Sequence[int]
+    cell_hash: int
+    placement_cache: TranspositionTable[PlacementPaths]
     height: int
     width: int
     collapse_height: int
@@ -18,40 +63,235 @@ class Board:
     is_falling_blocks: bool
     is_animating: bool
     blocks_fell_in_scan: bool
+    is_resolving: bool
     game_over: bool
     level: int
-
-    def __init__(self, width: int, height: int, player_manager: Player, level: int = 1):
+    lines_cleared: int
+    pieces_placed: int
+    physics_ticks: int
+    revision: int
+
+    def __init__(self, width: int, height: int, player_manager: Player, level: int = 1, engine: BoardEngines = "GRID", collapse_mode: CollapseModes = "ANIMATED", storage: GridStorages = "LIST", seed: int | None = None):
+        # every piece and power up roll of the match comes from this generator
+        self.generator = RandomGenerator(seed)
+        self.seed = self.generator.seed
         self.player_manager = player_manager
+        self.player_manager.generator = self.generator
         self.height = height
         self.width = width
-        self.grid = []
+        self.storage = storage
         self.is_animating = False
         self.is_falling_blocks = False
         self.blocks_fell_in_scan = False
+        self.is_resolving = False
+        self.collapse_mode = collapse_mode
         self.collapse_height = -1
         self.scan_height = -1
         self.game_over = False
         self.level = level
+        self.lines_cleared = 0
+        self.pieces_placed = 0
+        # number of physics_logic calls, replays stamp every command with it
+        self.physics_ticks = 0
+        # goes up on every call that can change what is shown, renderers skip a frame when it did not
+        self.revision = 0
+        self.engine = engine
+        self.bitboard = Bitboard(width, height) if engine == "BITBOARD" else None
+        # bit y of column_masks[x] is set when (x, y) is filled, column_heights[x] is
+        # the topmost filled row of the column (height when the column is empty)
+        self.column_masks = [0] * width
+        self.column_heights = [height] * width
+        # number of filled cells of every row and the rows that are completely filled
+        self.row_counts = [0] * height
+        self.full_rows = set()
+        # holes, heights, bumpiness, transitions and wells, kept up to date by write_cell
+        self.features = BoardFeatures(width, height)
+        # bit x is set while the column object is also held by a snapshot
+        self.shared_columns = 0
+        # zobrist hash of the filled cells, updated on every occupancy change
+        self.cell_keys = cell_keys(width, height)
+        self.cell_hash = 0
+        # reachable placements by cells and starting piece, clones share it
+        self.placement_cache = TranspositionTable(4096)
         self.spawnlist: list[Piece] = [
-            Piece(Vector2(self.width//2, 0)), Piece(Vector2(self.width//2, 0)), Piece(Vector2(self.width//2, 0))]
+            Piece(Vector2(self.width//2, 0), self.generator.next_piece_type()) for _ in range(3)]
         self.generate_piece()
 
-        for _ in range(self.width):
-            self.grid.append([])
+        if storage == "COMPACT":
+            self.grid = CompactGrid(width, height, self.write_cell)
+        elif storage == "SPARSE":
+            self.grid = SparseGrid(width, height, self.write_cell)
+        else:
+            self.grid = [GridColumn(x, self.write_cell, [None] * self.height)
+                         for x in range(self.width)]
+
+    def clone(self) -> 'Board':
+        board = copy.copy(self)
+
+        if isinstance(self.grid, (CompactGrid, SparseGrid)):
+            board.grid = self.grid.copy(board.write_cell)
+        else:
+            board.grid = [GridColumn(x, board.write_cell, column)
+                          for x, column in enumerate(self.grid)]
+
+        if self.bitboard != None:
+            board.bitboard = copy.copy(self.bitboard)
+            board.bitboard.rows = self.bitboard.rows.copy()
+
+        board.shared_columns = 0
+        board.column_masks = self.column_masks.copy()
+        board.column_heights = self.column_heights.copy()
+        board.row_counts = self.row_counts.copy()
+        board.full_rows = self.full_rows.copy()
+        board.features = self.features.copy()
+        board.player_piece = self.player_piece.copy()
+        board.spawnlist = [piece.copy() for piece in self.spawnlist]
+        board.generator = self.generator.copy()
+        board.player_manager = self.player_manager.copy()
+        board.player_manager.generator = board.generator
+        return board
+
+    def snapshot(self) -> BoardSnapshot:
+        '''
+        Saves the match state in O(width + height), however full the board is.
+        Columns are shared with the snapshot until the board writes to them.
+        '''
+        if isinstance(self.grid, CompactGrid):
+            grid: list[GridColumn] | bytes | dict[int, bytes] = bytes(self.grid.cells)
+        elif isinstance(self.grid, SparseGrid):
+            grid = self.grid.frozen_chunks()
+        else:
+            grid = list(self.grid)
+            self.shared_columns = (1 << self.width) - 1
+
+        power_up = self.player_manager.power_up
+        return BoardSnapshot(grid, None if self.bitboard == None else self.bitboard.rows.copy(),
+                             self.column_masks.copy(), self.column_heights.copy(),
+                             self.row_counts.copy(), self.full_rows.copy(), self.features.copy(),
+                             self.player_piece.copy(), [piece.copy() for piece in self.spawnlist],
+                             self.player_manager.score, power_up.name, power_up.is_active,
+                             self.generator.copy(), tuple(getattr(self, name) for name in SNAPSHOT_FIELDS))
+
+    def restore(self, snapshot: BoardSnapshot):
+        ''' goes back to a snapshot of this board, the snapshot can be restored again later '''
+        if isinstance(self.grid, CompactGrid):
+            self.grid.cells[:] = snapshot.grid  # type: ignore
+        elif isinstance(self.grid, SparseGrid):
+            self.grid.load_chunks(snapshot.grid)  # type: ignore
+        else:
+            self.grid[:] = snapshot.grid  # type: ignore
+            self.shared_columns = (1 << self.width) - 1
+
+        if self.bitboard != None and snapshot.bitboard_rows != None:
+            self.bitboard.rows = snapshot.bitboard_rows.copy()
+        self.column_masks = snapshot.column_masks.copy()
+        self.column_heights = snapshot.column_heights.copy()
+        self.row_counts = snapshot.row_counts.copy()
+        self.full_rows = snapshot.full_rows.copy()
+        self.features = snapshot.features.copy()
+        self.player_piece = snapshot.player_piece.copy()
+        self.spawnlist = [piece.copy() for piece in snapshot.spawnlist]
+
+        self.player_manager.score = snapshot.score
+        self.player_manager.power_up = PowerUp(snapshot.power_up_name)
+        self.player_manager.power_up.is_active = snapshot.power_up_active
+        self.generator = snapshot.generator.copy()
+        self.player_manager.generator = self.generator
+
+        for name, value in zip(SNAPSHOT_FIELDS, snapshot.fields):
+            setattr(self, name, value)
+        self.revision += 1
+
+    def write_cell(self, x: int, y: int, block: Block | None):
+        # every grid write ends up here, keep the engine indexes in sync
+        if y < 0:
+            y += self.height
+
+        column = self.grid[x]
+        if self.shared_columns >> x & 1:
+            # copy on write, the snapshot keeps the old column object
+            column = GridColumn(x, self.write_cell, column)
+            self.grid[x] = column  # type: ignore
+            self.shared_columns &= ~(1 << x)
+
+        was_filled = column[y] != None
+        is_filled = block != None
+        column.raw_set(y, block)
+
+        if was_filled == is_filled:
+            return
+
+        self.cell_hash ^= self.cell_keys[x * self.height + y]
+        row_count = self.row_counts[y] + (1 if is_filled else -1)
+        self.row_counts[y] = row_count
+        if row_count == self.width:
+            self.full_rows.add(y)
+        else:
+            self.full_rows.discard(y)
+
+        if self.bitboard != None:
+            self.bitboard.set_cell(x, y, is_filled)
+
+        if is_filled:
+            column_mask = self.column_masks[x] | 1 << y
+        else:
+            column_mask = self.column_masks[x] & ~(1 << y)
+        self.column_masks[x] = column_mask
+        self.column_heights[x] = (column_mask & -column_mask).bit_length() - 1 if column_mask else self.height
+        self.features.cell_changed(self, x, y)
+
+    def position_hash(self) -> int:
+        ''' 64 bit hash of the cells, the active piece, the spawnlist and the power up '''
+        return (self.cell_hash ^ piece_key(self.player_piece) ^ spawn_key(self.spawnlist)
+                ^ POWER_UP_KEYS[self.player_manager.power_up.name])
+
+    def reachable_placements(self) -> PlacementPaths:
+        ''' every resting (x, y, rotation) the active piece can reach, with the commands to get there '''
+        # the exact piece state, a hashed one could hand back the placements of another position
+        piece = self.player_piece
+        key = (self.cell_hash, piece.type, piece.rotation, piece.origin.x, piece.origin.y)
+        paths = self.placement_cache.get(key)
+        if paths == None:
+            paths = enumerate_placements(self, self.player_piece)
+            self.placement_cache.put(key, paths)
+        return paths
+
+    def landing_row(self, piece: Piece) -> int:
+        ''' returns the origin row where the piece stops if it falls straight down '''
+        origin = piece.origin
+        drop = self.height
+
+        for relative_x, relative_y in piece.offsets:
+            x = origin.x + relative_x
+            y = origin.y + relative_y
 
-        for column in self.grid:
-            for _ in range(self.height):
-                column.append(None)
+            first_filled_below = self.column_heights[x]
+            if first_filled_below <= y:
+                # the block is under an overhang, look for the next filled cell below it
+                below = self.column_masks[x] >> (y + 1)
+                first_filled_below = y + (below & -below).bit_length() if below else self.height
+
+            drop = min(drop, first_filled_below - 1 - y)
+
+        return origin.y + drop
+
+    def lowest_empty_row(self, x: int) -> int:
+        ''' returns the lowest empty row of the column or -1 when it is full '''
+        empty_rows = ~self.column_masks[x] & ((1 << self.height) - 1)
+        return empty_rows.bit_length() - 1
 
     def has_collided(self, piece: Piece) -> bool:
-        for relative_block in piece.blocks_relative_pos:
-            block_absolute_pos = piece.getBlockAbsPos(relative_block)
+        if self.bitboard != None:
+            return self.bitboard.has_collided(piece)
 
-            if block_absolute_pos.y == self.height-1:
+        origin = piece.origin
+        for relative_x, relative_y in piece.offsets:
+            y = origin.y + relative_y
+
+            if y == self.height-1:
                 return True
             else:
-                target = self.grid[block_absolute_pos.x][block_absolute_pos.y+1]
+                target = self.grid[origin.x + relative_x][y+1]
                 if not target == None:
                     return True
         return False
@@ -62,6 +302,8 @@ class Board:
         if len(self.spawnlist) > 3 and type == None:
             return
 
+        if type == None:
+            type = self.generator.next_piece_type()
         self.spawnlist.append(Piece(Vector2(self.width//2, 0), type))
 
     def petrify_piece(self, piece: Piece):
@@ -72,48 +314,50 @@ class Board:
             self.generate_piece()
             return
 
-        for relative_block in piece.blocks_relative_pos:
-            block_abs_pos = Piece.getBlockAbsPos(piece, relative_block)
+        for relative_x, relative_y in piece.offsets:
+            x = piece.origin.x + relative_x
+            y = piece.origin.y + relative_y
 
-            if block_abs_pos.y < 1:
+            if y < 1:
                 self.game_over = True
                 return
 
-            self.grid[block_abs_pos.x][block_abs_pos.y] = Block()
+            self.grid[x][y] = Block.shared()
 
+        self.pieces_placed += 1
         self.generate_piece()
 
     def piece_can_rotate(self, piece: Piece, is_clock_wise: bool) -> bool:
-        new_rel_pos: list[Vector2] = []
-
-        for block in piece.blocks_relative_pos:
-            block = piece.vectorRightRotation(block, is_clock_wise)
-            new_rel_pos.append(block)
+        if self.bitboard != None:
+            return self.bitboard.piece_can_rotate(piece, is_clock_wise)
 
-        new_rel_abs_pos: list[Vector2] = []
-        for block in new_rel_pos:
-            abs_pos = piece.getBlockAbsPos(block)
-            new_rel_abs_pos.append(abs_pos)
+        origin = piece.origin
+        for relative_x, relative_y in piece.rotated_offsets(is_clock_wise):
+            x = origin.x + relative_x
+            y = origin.y + relative_y
 
-        for block in new_rel_abs_pos:
-            if block.x > self.width - 1 or block.x < 0:
+            if x > self.width - 1 or x < 0:
                 return False
-            if block.y > self.height - 1 or block.y < 0:
+            if y > self.height - 1 or y < 0:
                 return False
 
-            if isinstance(self.grid[block.x][block.y], Block):
+            if isinstance(self.grid[x][y], Block):
                 return False
 
         return True
 
-    def piece_can_move(self, direction: Literal["LEFT", "RIGHT"]) -> bool:
+    def piece_can_move(self, direction: Literal["LEFT", "RIGHT"], piece: Piece | None = None) -> bool:
+        if piece == None:
+            piece = self.player_piece
+        if self.bitboard != None:
+            return self.bitboard.piece_can_move(piece, direction)
+
         direction_delta = 1 if direction == "RIGHT" else -1
-        piece = self.player_piece
+        origin = piece.origin
 
-        for relative_block in piece.blocks_relative_pos:
-            abs_pos = piece.getBlockAbsPos(relative_block)
-            new_x = abs_pos.x + direction_delta
-            new_y = abs_pos.y
+        for relative_x, relative_y in piece.offsets:
+            new_x = origin.x + relative_x + direction_delta
+            new_y = origin.y + relative_y
 
             if new_x < 0 or new_x >= self.width:
                 return False
@@ -125,16 +369,19 @@ class Board:
         return True
 
     def movement(self, command: Command):
+        # the revision only moves on for commands that change something, a blocked move redraws nothing
         if command == "RIGHT":
             if not self.piece_can_move("RIGHT"):
                 return
             self.player_piece.origin.x += 1
+            self.revision += 1
             return
 
         if command == "LEFT":
             if not self.piece_can_move("LEFT"):
                 return
             self.player_piece.origin.x -= 1
+            self.revision += 1
             return
 
         if command == "CLOCKWISE_ROTATION":
@@ -143,6 +390,7 @@ class Board:
                 return
 
             self.player_piece.rotateBlocks(is_clockwise)
+            self.revision += 1
             return
 
         if command == "COUNTERWISE_ROTATION":
@@ -151,15 +399,43 @@ class Board:
                 return
 
             self.player_piece.rotateBlocks(is_clockwise)
+            self.revision += 1
+            return
+
+        if command == "HARD_DROP":
+            # the piece waits out a collapse like it does in physics_logic
+            if self.is_animating:
+                return
+            self.player_piece.origin.y = self.landing_row(self.player_piece)
+            self.petrify_piece(self.player_piece)
+            self.score_line()
+            self.revision += 1
             return
 
         if command == "TRIGGER_POWERUP":
             if self.player_manager.power_up.name != None:
                 self.run_powerup(self.player_manager.power_up)
+                self.revision += 1
 
         # implement function to prevent piece from moving outside of the board
 
+    def shift(self, direction: Literal["LEFT", "RIGHT"], cells: int) -> int:
+        ''' moves the piece up to `cells` columns in one go, to the first obstacle when negative, returns how far it went '''
+        if cells < 0 or cells > self.width:
+            cells = self.width
+
+        delta = 1 if direction == "RIGHT" else -1
+        moved = 0
+        while moved < cells and self.piece_can_move(direction):
+            self.player_piece.origin.x += delta
+            moved += 1
+        if moved:
+            self.revision += 1
+        return moved
+
     def physics_logic(self):
+        self.physics_ticks += 1
+        self.revision += 1
         if self.is_animating:
             if self.is_falling_blocks:
                 self.apply_block_gravity()
@@ -176,22 +452,14 @@ class Board:
         self.level += 1
 
     def score_line(self):
-        full_lines: list[int] = []
-
-        for y in range(self.height-1, -1, -1):
-            checking_line: list[Block | None] = []
-
-            for x in range(self.width):
-                checking_line.append(self.grid[x][y])
-
-            if None in checking_line:
-                continue
-
-            full_lines.append(y)
+        # only the rows whose fill counter reached the width can be full, bottom to top
+        self.clear_lines(sorted(self.full_rows, reverse=True))
 
+    def clear_lines(self, full_lines: list[int]):
         if full_lines:
             multiplier: float = 1.0
             self.increase_level()
+            self.lines_cleared += len(full_lines)
 
             for y in full_lines:
                 self.player_manager.add_score("LINE_CLEAR", multiplier)
@@ -208,6 +476,89 @@ class Board:
         self.scan_height = collapse_height - 1
         self.blocks_fell_in_scan = False
 
+        if self.collapse_mode == "INSTANT" and not self.is_resolving:
+            self.resolve_collapse()
+
+    def resolve_collapse(self):
+        # settles the collapse in one pass per column: every block between the top and
+        # the collapse height ends up stacked on the collapse height, exactly where
+        # the animated scan would leave it, then re-scores until nothing else clears
+        self.is_resolving = True
+
+        while self.is_falling_blocks:
+            if self.collapse_height != -1:
+                bottom = min(self.collapse_height, self.height - 1)
+
+                for x, column in enumerate(self.grid):
+                    landing_height = bottom
+                    # only the filled cells move, read from the column mask from the bottom up
+                    filled = self.column_masks[x] & ((2 << bottom) - 1)
+                    while filled:
+                        y = filled.bit_length() - 1
+                        filled ^= 1 << y
+
+                        if y != landing_height:
+                            column[landing_height] = column[y]
+                            column[y] = None
+                        landing_height -= 1
+
+            self.collapse_height = -1
+            self.scan_height = -1
+            self.blocks_fell_in_scan = False
+            self.is_animating = False
+            self.is_falling_blocks = False
+            self.score_line()
+
+        self.is_resolving = False
+
+    def retire_rows(self, depth: int) -> int:
+        '''
+        Endless mode: drops the rows lying more than `depth` rows under the top of
+        the stack and scrolls the rest of the stack down by as many rows. Costs
+        O(live blocks), returns the number of rows retired.
+        '''
+        if self.is_animating:
+            return 0
+
+        retired = self.height - (min(self.column_heights) + depth)
+        if retired <= 0:
+            return 0
+
+        cutoff = self.height - retired
+        self.revision += 1
+        for x in range(self.width):
+            # bottom up, every cell a block lands on was already moved or dropped
+            filled = self.column_masks[x]
+            while filled:
+                y = filled.bit_length() - 1
+                filled ^= 1 << y
+
+                block = self.grid[x][y]
+                self.grid[x][y] = None
+                if y < cutoff:
+                    self.grid[x][y + retired] = block
+        return retired
+
+    def collapse_frames(self) -> Iterator[CollapseFrame]:
+        '''
+        Lazily plays the running collapse one scan row at a time and yields a frame
+        after every step, including the collapses started by cascading line clears.
+        Works on every storage, an INSTANT collapse is already settled and has none.
+        '''
+        while self.is_falling_blocks:
+            before = tuple(self.column_masks)
+            self.apply_block_gravity()
+
+            after = tuple(self.column_masks)
+            changed: list[tuple[int, int]] = []
+            for x, (old, new) in enumerate(zip(before, after)):
+                flipped = old ^ new
+                while flipped:
+                    lowest_bit = flipped & -flipped
+                    changed.append((x, lowest_bit.bit_length() - 1))
+                    flipped ^= lowest_bit
+            yield CollapseFrame(self.scan_height, after, tuple(changed))
+
     def apply_block_gravity(self):
         # i will first check from the collapse height and upwards(per line) if there is a block with an empty space below
         # if i find a line with an empty space below i will move the blocks which can move, set the blocks_moved variable and then end the frame
@@ -227,10 +578,27 @@ class Board:
             self.score_line()
             return
 
-        for column in range(self.width):
-            if self.scan_height == -1 or self.collapse_height == -1:
-                return
+        if self.scan_height == -1 or self.collapse_height == -1:
+            return
+
+        if self.bitboard != None:
+            falling = self.bitboard.falling_mask(self.scan_height)
+            if falling:
+                self.blocks_fell_in_scan = True
 
+            while falling:
+                lowest_bit = falling & -falling
+                column = lowest_bit.bit_length() - 1
+                falling ^= lowest_bit
+
+                self.grid[column][self.scan_height +
+                                  1] = self.grid[column][self.scan_height]
+                self.grid[column][self.scan_height] = None
+
+            self.scan_height -= 1
+            return
+
+        for column in range(self.width):
             if self.grid[column][self.scan_height] == None:
                 continue
 
@@ -260,14 +628,13 @@ class Board:
     def run_powerup(self, powerup: PowerUp):
 
         def teleport_piece():
-            for block in self.player_piece.blocks_relative_pos:
-                abs_block = self.player_piece.getBlockAbsPos(block)
-
-                for scanning_height in range(self.height-1, -1, -1):
-                    current_place = self.grid[abs_block.x][scanning_height]
-                    if current_place == None:
-                        self.grid[abs_block.x][scanning_height] = Block()
-                        break
+            for relative_x, _ in self.player_piece.offsets:
+                x = self.player_piece.origin.x + relative_x
+
+                lowest_empty_row = self.lowest_empty_row(x)
+                if lowest_empty_row != -1:
+                    self.grid[x][lowest_empty_row] = Block.shared()
+            self.pieces_placed += 1
             self.score_line()
 
             self.generate_piece()
@@ -290,8 +657,8 @@ class Board:
                 Vector2(-1, 1), Vector2(0, 1), Vector2(1, 1),
                 Vector2(0, -2)]
 
-            bomb_pos = self.player_piece.getBlockAbsPos(
-                self.player_piece.blocks_relative_pos[0])
+            relative_x, relative_y = self.player_piece.offsets[0]
+            bomb_pos = self.player_piece.origin + Vector2(relative_x, relative_y)
 
             for delete_vector in delete_vectors:
                 abs_delete_pos = bomb_pos + delete_vector
@@ -0,0 +1,127 @@
+from typing import TYPE_CHECKING
+import copy
+
+if TYPE_CHECKING:
+    from packages.Board import Board
+
+
+class BoardFeatures:
+    '''
+    Evaluation features of a board, updated by Board.write_cell in O(1) per
+    changed cell. Read them through the properties, the board owns the updates.
+
+    Column heights count the cells from the floor to the topmost filled one,
+    holes are the empty cells under the top of their column, row transitions
+    count filled/empty changes between neighbours of a row with the walls
+    taken as filled, and a well is how far a column sits below the lower of
+    its neighbours, the walls being as high as the board.
+    '''
+    width: int
+    height: int
+    _heights: list[int]
+    _holes: list[int]
+    _row_transitions: list[int]
+    _wells: list[int]
+    _aggregate_height: int
+    _hole_count: int
+    _bumpiness: int
+    _row_transition_count: int
+    _well_sum: int
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self._heights = [0] * width
+        self._holes = [0] * width
+        # an empty row only changes at both walls
+        self._row_transitions = [2] * height
+        # a lone column is a well between the two walls
+        self._wells = [0] * width
+        if width == 1:
+            self._wells[0] = height
+        self._aggregate_height = 0
+        self._hole_count = 0
+        self._bumpiness = 0
+        self._row_transition_count = 2 * height
+        self._well_sum = sum(self._wells)
+
+    def copy(self) -> 'BoardFeatures':
+        features = copy.copy(self)
+        features._heights = self._heights.copy()
+        features._holes = self._holes.copy()
+        features._row_transitions = self._row_transitions.copy()
+        features._wells = self._wells.copy()
+        return features
+
+    def cell_changed(self, board: 'Board', x: int, y: int):
+        ''' called after the occupancy of (x, y) flipped, with the board indexes already updated '''
+        masks = board.column_masks
+        filled = masks[x] >> y & 1
+        left = 1 if x == 0 else masks[x - 1] >> y & 1
+        right = 1 if x == self.width - 1 else masks[x + 1] >> y & 1
+
+        # the pairs around the cell flip all together, 2 transitions become 0 and so on
+        transitions = (left != filled) + (filled != right)
+        self._row_transitions[y] += 2 * transitions - 2
+        self._row_transition_count += 2 * transitions - 2
+
+        column_height = self.height - board.column_heights[x]
+        holes = column_height - masks[x].bit_count()
+        self._hole_count += holes - self._holes[x]
+        self._holes[x] = holes
+
+        previous_height = self._heights[x]
+        if column_height == previous_height:
+            return
+
+        self._heights[x] = column_height
+        self._aggregate_height += column_height - previous_height
+        for neighbour in (x - 1, x + 1):
+            if 0 <= neighbour < self.width:
+                self._bumpiness += (abs(column_height - self._heights[neighbour])
+                                    - abs(previous_height - self._heights[neighbour]))
+        for column in range(max(0, x - 1), min(self.width, x + 2)):
+            self.update_well(column)
+
+    def update_well(self, x: int):
+        left = self.height if x == 0 else self._heights[x - 1]
+        right = self.height if x == self.width - 1 else self._heights[x + 1]
+        depth = max(0, min(left, right) - self._heights[x])
+        self._well_sum += depth - self._wells[x]
+        self._wells[x] = depth
+
+    @property
+    def column_heights(self) -> tuple[int, ...]:
+        return tuple(self._heights)
+
+    @property
+    def column_holes(self) -> tuple[int, ...]:
+        return tuple(self._holes)
+
+    @property
+    def row_transitions(self) -> tuple[int, ...]:
+        return tuple(self._row_transitions)
+
+    @property
+    def well_depths(self) -> tuple[int, ...]:
+        return tuple(self._wells)
+
+    @property
+    def aggregate_height(self) -> int:
+        return self._aggregate_height
+
+    @property
+    def holes(self) -> int:
+        return self._hole_count
+
+    @property
+    def bumpiness(self) -> int:
+        return self._bumpiness
+
+    @property
+    def total_row_transitions(self) -> int:
+        return self._row_transition_count
+
+    @property
+    def well_sum(self) -> int:
+        return self._well_sum
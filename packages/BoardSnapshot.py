@@ -0,0 +1,36 @@
+from packages.GridColumn import GridColumn
+from packages.BoardFeatures import BoardFeatures
+from packages.Piece import Piece
+from packages.PowerUp import PowerUpNamesNSpecials
+from packages.RandomGenerator import RandomGenerator
+from dataclasses import dataclass
+
+# plain values of the board copied as they are
+SNAPSHOT_FIELDS = ("collapse_height", "scan_height", "is_falling_blocks", "is_animating",
+                   "blocks_fell_in_scan", "game_over", "level", "lines_cleared",
+                   "pieces_placed", "physics_ticks", "cell_hash")
+
+
+@dataclass
+class BoardSnapshot:
+    '''
+    State of a Board at one point of a match, made by Board.snapshot.
+
+    With the LIST storage `grid` holds the very column objects of the board,
+    the board copies a column the first time it writes to it afterwards. With
+    the SPARSE storage it holds the bytes of the stored chunks by index.
+    '''
+    grid: list[GridColumn] | bytes | dict[int, bytes]
+    bitboard_rows: list[int] | None
+    column_masks: list[int]
+    column_heights: list[int]
+    row_counts: list[int]
+    full_rows: set[int]
+    features: BoardFeatures
+    player_piece: Piece
+    spawnlist: list[Piece]
+    score: int
+    power_up_name: PowerUpNamesNSpecials
+    power_up_active: bool
+    generator: RandomGenerator
+    fields: tuple[object, ...]
@@ -0,0 +1,5 @@
+from typing import Literal, TypeAlias
+
+Command: TypeAlias = Literal["UP", "DOWN",
+                             "LEFT", "RIGHT", "ESCAPE", "DUMP", "TRIGGER_POWERUP", "CLOCKWISE_ROTATION", "COUNTERWISE_ROTATION", "RETURN", "MOUSE_CLICK", "MOUSE_MOVEMENT", "HARD_DROP"] | None
+KeyPress: TypeAlias = int | None
@@ -0,0 +1,93 @@
+from packages.Block import Block
+from packages.GridColumn import CellWriter
+from typing import Any, Iterator
+
+
+class CompactColumn:
+    '''
+    Column view over a CompactGrid, reads and writes like a GridColumn.
+    '''
+    grid: 'CompactGrid'
+    x: int
+
+    def __init__(self, grid: 'CompactGrid', x: int):
+        self.grid = grid
+        self.x = x
+
+    def __len__(self) -> int:
+        return self.grid.height
+
+    def __getitem__(self, y: int) -> Block | None:
+        height = self.grid.height
+        if y < 0:
+            y += height
+        if not 0 <= y < height:
+            raise IndexError("column index out of range")
+
+        return Block.palette[self.grid.cells[y * self.grid.width + self.x]]
+
+    def __setitem__(self, y: int, block: Block | None):
+        self.grid.on_write(self.x, y, block)
+
+    def __iter__(self) -> Iterator[Block | None]:
+        cells = self.grid.cells
+        palette = Block.palette
+        for index in range(self.x, len(cells), self.grid.width):
+            yield palette[cells[index]]
+
+    def raw_set(self, y: int, block: Block | None):
+        palette_id = 0 if block == None else Block.palette_id(block.symbol)
+        self.grid.cells[y * self.grid.width + self.x] = palette_id
+
+
+class CompactGrid:
+    '''
+    Board grid stored as one row-major bytearray of Block palette ids.
+
+    Indexes like the column-major list grid (`grid[x][y]`) so every Board method
+    works unchanged, while a whole board costs one byte per cell and copies,
+    pickles and hashes as a single buffer.
+    '''
+    width: int
+    height: int
+    cells: bytearray
+    on_write: CellWriter
+    columns: list[CompactColumn]
+
+    def __init__(self, width: int, height: int, on_write: CellWriter, cells: bytearray | None = None):
+        self.width = width
+        self.height = height
+        self.on_write = on_write
+        self.cells = bytearray(width * height) if cells == None else cells
+        self.columns = [CompactColumn(self, x) for x in range(width)]
+
+    def __len__(self) -> int:
+        return self.width
+
+    def __getitem__(self, x: int) -> CompactColumn:
+        return self.columns[x]
+
+    def __iter__(self) -> Iterator[CompactColumn]:
+        return iter(self.columns)
+
+    def row(self, y: int) -> memoryview:
+        ''' returns a read only view of the palette ids of row y '''
+        start = y * self.width
+        return memoryview(self.cells)[start:start + self.width].toreadonly()
+
+    def key(self) -> bytes:
+        ''' returns the cells as bytes, usable as a dictionary key or hashed '''
+        return bytes(self.cells)
+
+    def copy(self, on_write: CellWriter) -> 'CompactGrid':
+        return CompactGrid(self.width, self.height, on_write, bytearray(self.cells))
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the column views are rebuilt on load
+        state = self.__dict__.copy()
+        del state["columns"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self.columns = [CompactColumn(self, x) for x in range(self.width)]
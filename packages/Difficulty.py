@@ -0,0 +1,14 @@
+import functools
+import math
+
+
+@functools.cache
+def difficulty(level: int) -> int:
+    # mathematical function that represnts the number of frames that
+    # takes for the block to fall based on the level
+    return math.ceil(1.096**(-(level-36))+4.6)
+
+
+def shifted_difficulty(shift: int, level: int) -> int:
+    # the same curve started `shift` levels later, used by balance sweeps
+    return difficulty(max(level + shift, 1))
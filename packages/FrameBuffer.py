@@ -0,0 +1,57 @@
+from typing import Iterator
+
+# never drawn, a shadow filled with it differs from every frame
+UNKNOWN = ""
+
+
+class FrameBuffer:
+    '''
+    Character cells of one terminal screen, row-major.
+
+    The renderer draws a frame in one buffer and compares it with another
+    holding what the terminal shows, `changes` yields the runs of cells that
+    differ so only those are sent. Writes past the edges are clipped.
+    '''
+    height: int
+    width: int
+    rows: list[list[str]]
+
+    def __init__(self, height: int, width: int, fill: str = " "):
+        self.height = height
+        self.width = width
+        self.rows = [[fill] * width for _ in range(height)]
+
+    def clear(self, fill: str = " "):
+        for row in self.rows:
+            row[:] = [fill] * self.width
+
+    def addstr(self, y: int, x: int, text: str):
+        if not 0 <= y < self.height or x >= self.width:
+            return
+        if x < 0:
+            text = text[-x:]
+            x = 0
+
+        text = text[:self.width - x]
+        self.rows[y][x:x + len(text)] = text
+
+    def row_text(self, y: int) -> str:
+        return "".join(self.rows[y])
+
+    def changes(self, shown: 'FrameBuffer') -> Iterator[tuple[int, int, str]]:
+        ''' (y, x, text) runs where this buffer differs from `shown`, which must be the same size '''
+        for y, (row, shown_row) in enumerate(zip(self.rows, shown.rows)):
+            # most rows stay the same between frames, compared whole first
+            if row == shown_row:
+                continue
+
+            start = -1
+            for x, (cell, shown_cell) in enumerate(zip(row, shown_row)):
+                if cell != shown_cell:
+                    if start < 0:
+                        start = x
+                elif start >= 0:
+                    yield y, start, "".join(row[start:x])
+                    start = -1
+            if start >= 0:
+                yield y, start, "".join(row[start:])
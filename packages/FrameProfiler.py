@@ -0,0 +1,112 @@
+from packages.Histogram import Histogram
+from typing import Any, Callable, Literal, TypeAlias, get_args
+import json
+import time
+
+Phases: TypeAlias = Literal["INPUT", "LOGIC", "RENDER", "FRAME"]
+
+
+class FrameProfiler:
+    '''
+    Phase timings of the game loop, in nanoseconds.
+
+    Every pass of the loop calls `start`, then `lap` once per phase and
+    `finish`. INPUT is reading and applying the commands, LOGIC the due ticks,
+    RENDER the draw and FRAME the whole pass without the sleep. Each phase
+    goes in its own Histogram, passes whose work took longer than a frame
+    are counted as over budget. `dump` writes everything as JSON.
+    The game loop only calls in when a profiler is set, without one it pays
+    a None check per phase.
+    '''
+    target_tickrate: float
+    target_framerate: float
+    budget_ns: int
+    clock: Callable[[], int]
+    histograms: dict[Phases, Histogram]
+    started_at: int | None
+    pass_start: int
+    last: int
+    ticks: int
+    frames: int
+    passes: int
+    over_budget: int
+    dump_path: str | None
+    dump_requested: bool
+
+    def __init__(self, target_tickrate: float, target_framerate: float, dump_path: str | None = None,
+                 clock: Callable[[], int] = time.perf_counter_ns):
+        self.target_tickrate = target_tickrate
+        self.target_framerate = target_framerate
+        self.budget_ns = round(10**9 / target_framerate)
+        self.clock = clock
+        self.histograms = {phase: Histogram() for phase in get_args(Phases)}
+        self.dump_path = dump_path
+        self.dump_requested = False
+        self.reset()
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.started_at = None
+        self.pass_start = 0
+        self.last = 0
+        self.ticks = 0
+        self.frames = 0
+        self.passes = 0
+        self.over_budget = 0
+
+    def start(self):
+        now = self.clock()
+        if self.started_at == None:
+            self.started_at = now
+        self.pass_start = now
+        self.last = now
+
+    def lap(self, phase: Phases, record: bool = True):
+        ''' closes `phase`, a phase that did nothing this pass is left out with `record` False '''
+        now = self.clock()
+        if record:
+            self.histograms[phase].record(now - self.last)
+        self.last = now
+
+    def finish(self, ticks: int, drew: bool):
+        work = self.last - self.pass_start
+        self.histograms["FRAME"].record(work)
+        if work > self.budget_ns:
+            self.over_budget += 1
+        self.ticks += ticks
+        self.frames += drew
+        self.passes += 1
+
+        if self.dump_requested:
+            self.dump_requested = False
+            self.dump()
+
+    def request_dump(self):
+        ''' safe from a signal handler, the dump happens at the end of the current pass '''
+        self.dump_requested = True
+
+    def report(self) -> dict[str, Any]:
+        elapsed = 0 if self.started_at == None else self.last - self.started_at
+        seconds = elapsed / 10**9
+        return {
+            "elapsed_ns": elapsed,
+            "passes": self.passes,
+            "ticks": self.ticks,
+            "frames": self.frames,
+            "target_tickrate": self.target_tickrate,
+            "target_framerate": self.target_framerate,
+            "tickrate": self.ticks / seconds if seconds else 0.0,
+            "framerate": self.frames / seconds if seconds else 0.0,
+            "budget_ns": self.budget_ns,
+            "over_budget": self.over_budget,
+            "phases": {phase: {**histogram.summary(), "buckets": histogram.buckets()}
+                       for phase, histogram in self.histograms.items()},
+        }
+
+    def dump(self, path: str | None = None):
+        path = self.dump_path if path == None else path
+        if path == None:
+            return
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
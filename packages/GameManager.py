@@ -1,10 +1,15 @@
-from packages.Board import Board
+from packages.Board import Board, GridStorages
 from packages.Renderer import Renderer
 from packages.Vector2 import Vector2
 from packages.InputHandler import InputHandler, Command
 from packages.Player import Player
-import time
-import math
+from packages.Difficulty import difficulty
+from packages.ReplayRecorder import ReplayRecorder
+from packages.AutoPlayer import AutoPlayer
+from packages.Scheduler import Scheduler
+from packages.AutoShift import AutoShift, Direction
+from packages.KeyListener import KeyListener
+from packages.FrameProfiler import FrameProfiler
 import curses
 
 
@@ -15,23 +20,49 @@ class GameManager():
     renderer: Renderer
     target_tickrate: float
     target_framerate: int
+    animation_ticks: int
+    scheduler: Scheduler
+    gravity_counter: int
+    animation_counter: int
     input_handler: InputHandler
     player_manager: Player
     game_running: bool
-
-    def __init__(self, stdscr: curses.window, debug: bool = False):
-        self._board_dimensions = Vector2(12, 20)
+    storage: GridStorages
+    record_replays: bool
+    recorder: ReplayRecorder | None
+    autoplayer: AutoPlayer | None
+    profiler: FrameProfiler | None
+
+    def __init__(self, stdscr: curses.window, debug: bool = False, record_replays: bool = True, autoplay: bool = False,
+                 board_dimensions: Vector2 = Vector2(12, 20), storage: GridStorages = "LIST",
+                 auto_shift: AutoShift | None = None, profile_path: str | None = None):
+        self._board_dimensions = board_dimensions.copy()
         self._debug = debug
 
         self.input_handler = InputHandler(stdscr)
         self.renderer = Renderer(stdscr, self._board_dimensions, self._debug)
         self.player_manager = Player()
         self.player_manager.load_acummulated_score()
+        self.storage = storage
         self.board = Board(self._board_dimensions.x,
-                           self._board_dimensions.y, self.player_manager)
+                           self._board_dimensions.y, self.player_manager, storage=self.storage)
         self.target_tickrate = 128
         self.target_framerate = 256
+        # logic ticks per step of the collapse animation
+        self.animation_ticks = 2
+        self.scheduler = Scheduler(self.target_tickrate, self.target_framerate)
+        self.gravity_counter = 0
+        self.animation_counter = 0
         self.game_running = False
+        self.record_replays = record_replays
+        self.recorder = None
+        # plays the matches by itself, the keyboard still works alongside it
+        self.autoplayer = AutoPlayer() if autoplay else None
+        # phase timings of the game loop, written to `profile_path` after every match
+        self.profiler = None if profile_path == None else FrameProfiler(
+            self.target_tickrate, self.target_framerate, profile_path)
+        if auto_shift != None:
+            self.input_handler.enable_auto_shift(auto_shift, KeyListener(self.scheduler.clock))
 
     def menu(self, first_start: bool = False):
         if first_start:
@@ -39,8 +70,10 @@ class GameManager():
             self.renderer.show_startscreen()
 
         while True:
-            self.process_input(self.input_handler.get_command())
-            time.sleep(0.05)
+            # the menus only change on input, sleep until there is some
+            self.input_handler.wait(None)
+            for user_input in self.input_handler.commands():
+                self.process_input(user_input)
 
     def process_input(self, user_input: Command):
         if self.game_running:
@@ -54,7 +87,9 @@ class GameManager():
             if self.renderer.current_menu == "START_SCREEN":
                 if self.renderer.selection == "START_GAME":
                     self.board = Board(
-                        self.board.width, self.board.height, self.player_manager)
+                        self.board.width, self.board.height, self.player_manager, storage=self.storage)
+                    if self.record_replays:
+                        self.recorder = ReplayRecorder.for_board(self.board)
                     self.renderer.current_menu = "GAME_SCREEN"
                     self.renderer.selection = None
                     self.game_loop()
@@ -110,10 +145,13 @@ class GameManager():
 
     def game_inputs(self, user_input: Command):
         movement_commands: list[Command] = [
-            "LEFT", "RIGHT", "TRIGGER_POWERUP", "CLOCKWISE_ROTATION", "COUNTERWISE_ROTATION"]
+            "LEFT", "RIGHT", "TRIGGER_POWERUP", "CLOCKWISE_ROTATION", "COUNTERWISE_ROTATION", "HARD_DROP"]
 
         if user_input in movement_commands:
+            if self.recorder != None:
+                self.recorder.record(self.board.physics_ticks, user_input)
             self.board.movement(user_input)
+            self.checkpoint_score()
 
         if user_input == "DUMP":
             del self.renderer
@@ -123,35 +161,65 @@ class GameManager():
         if user_input == "ESCAPE":
             self.pause_game()
 
+    def shift_piece(self, direction: Direction, cells: int):
+        moved = self.board.shift(direction, cells)
+        if self.recorder != None:
+            # replays only know single moves, a shift is that many of them on the same tick
+            for _ in range(moved):
+                self.recorder.record(self.board.physics_ticks, direction)
+
     def game_loop(self):
         self.game_running = True
+        self.gravity_counter = 0
+        self.animation_counter = 0
+        self.scheduler.reset()
+        if self.input_handler.auto_shift != None:
+            self.input_handler.auto_shift.clear()
 
-        logic_timer = time.time_ns()
-        render_timer = time.time_ns()
+        profiler = self.profiler
+        if profiler != None:
+            profiler.reset()
 
-        tickrate_counter = 0
         while self.game_running:
-            self.level = self.board.level
-            if self.board.is_animating:
-                self.board.physics_logic()
-                self.renderer.draw(self.board)
-                time.sleep(0.016)
-            else:
-                if self.elapsed_time(logic_timer) > 1/self.target_tickrate:
-                    if self.board.game_over:
-                        self.game_running = False
-                        break
-                    if tickrate_counter == self.difficulty(self.level):
-                        self.board.physics_logic()
-                        tickrate_counter = 0
-                    tickrate_counter += 1
-                    logic_timer = time.time_ns()
-
-            self.process_input(self.input_handler.get_command())
-            self.renderer.draw(self.board)
-
-            self.wait_framerate(render_timer)
-            render_timer = time.time_ns()
+            if profiler != None:
+                profiler.start()
+
+            # every key pressed since the last wake up is applied before the next tick
+            pressed = False
+            for user_input in self.input_handler.commands():
+                self.process_input(user_input)
+                pressed = True
+            if not pressed and self.autoplayer != None:
+                self.process_input(self.autoplayer.command(self.board))
+            for direction, cells in self.input_handler.shifts():
+                self.shift_piece(direction, cells)
+            if profiler != None:
+                profiler.lap("INPUT")
+
+            ticks = self.scheduler.due_ticks()
+            for _ in range(ticks):
+                self.logic_tick()
+                if not self.game_running:
+                    break
+            if not self.game_running:
+                break
+            if profiler != None:
+                profiler.lap("LOGIC", ticks > 0)
+
+            # a due frame is skipped when the board did not change since the last one
+            drew = self.scheduler.frame_due() and self.renderer.draw(self.board)
+            if profiler != None:
+                profiler.lap("RENDER", drew)
+                profiler.finish(ticks, drew)
+
+            # sleeps until the next tick or frame is due, a key press wakes it earlier
+            self.input_handler.wait(self.scheduler.timeout_ns() / 10**9)
+
+        if self.recorder != None:
+            self.recorder.close(self.board.physics_ticks, self.player_manager.score)
+            self.recorder = None
+        if profiler != None:
+            profiler.dump()
 
         self.renderer.current_menu = "END_GAME_SCREEN"
         self.renderer.selection = None
@@ -160,10 +228,30 @@ class GameManager():
         self.player_manager.end_match()
         self.menu()
 
-    def wait_framerate(self, timer: int):
-        diff = 1/self.target_framerate - self.elapsed_time(timer)
-        if diff > 0:
-            time.sleep(diff)
+    def logic_tick(self):
+        self.level = self.board.level
+        if self.board.is_animating:
+            self.animation_counter += 1
+            if self.animation_counter >= self.animation_ticks:
+                self.board.physics_logic()
+                self.checkpoint_score()
+                self.animation_counter = 0
+            return
+
+        if self.board.game_over:
+            self.game_running = False
+            return
+
+        # not ==, a level up can shorten the interval under the ticks already counted
+        if self.gravity_counter >= self.difficulty(self.level):
+            self.board.physics_logic()
+            self.checkpoint_score()
+            self.gravity_counter = 0
+        self.gravity_counter += 1
+
+    def checkpoint_score(self):
+        if self.recorder != None:
+            self.recorder.checkpoint(self.board.physics_ticks, self.player_manager.score)
 
     def pause_game(self):
         pass
@@ -172,9 +260,4 @@ class GameManager():
         self.game_loop()
 
     def difficulty(self, level: int) -> int:
-        # mathematical function that represnts the number of frames that
-        # takes for the block to fall based on the level
-        return math.ceil(1.096**(-(level-36))+4.6)
-
-    def elapsed_time(self, timer: int) -> float:
-        return time.time_ns()/10**9 - timer/10**9
+        return difficulty(level)
@@ -0,0 +1,44 @@
+from packages.Block import Block
+from typing import Any, Callable, Iterable
+
+CellWriter = Callable[[int, int, Block | None], None]
+
+
+class GridColumn(list[Block | None]):
+    '''
+    A column of the board grid.
+
+    Reads behave exactly like a regular list, writes are forwarded to the board
+    so the indexes it keeps (bitboard rows, counters, ...) never go out of sync,
+    even when the grid is written directly as `board.grid[x][y] = Block()`.
+    Slices are written cell by cell, the list methods that would change the
+    height or the order of the cells raise TypeError.
+    '''
+    x: int
+    on_write: CellWriter
+
+    def __init__(self, x: int, on_write: CellWriter, cells: Iterable[Block | None] = ()):
+        super().__init__(cells)
+        self.x = x
+        self.on_write = on_write
+
+    def __setitem__(self, y: int | slice, block: Any):  # type: ignore[override]
+        if isinstance(y, slice):
+            rows = range(*y.indices(len(self)))
+            blocks = list(block)
+            if len(blocks) != len(rows):
+                raise ValueError("a grid column keeps the board height")
+            for row, cell in zip(rows, blocks):
+                self.on_write(self.x, row, cell)
+            return
+
+        self.on_write(self.x, y, block)
+
+    def _fixed_height(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("a grid column keeps the board height, write its cells by index")
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _fixed_height
+    __delitem__ = __iadd__ = __imul__ = _fixed_height
+
+    def raw_set(self, y: int, block: Block | None):
+        list.__setitem__(self, y, block)
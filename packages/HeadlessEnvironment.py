@@ -0,0 +1,91 @@
+from packages.Board import Board, BoardEngines, CollapseModes, GridStorages
+from packages.Player import Player
+from packages.Command import Command
+from packages.Difficulty import difficulty
+from dataclasses import dataclass
+from typing import Callable
+
+# the same subset of commands GameManager.game_inputs hands to the board
+MOVEMENT_COMMANDS: frozenset[Command] = frozenset(
+    ["LEFT", "RIGHT", "TRIGGER_POWERUP", "CLOCKWISE_ROTATION", "COUNTERWISE_ROTATION", "HARD_DROP"])
+
+
+@dataclass
+class StepResult:
+    tick: int
+    score: int
+    level: int
+    game_over: bool
+
+
+class HeadlessEnvironment:
+    '''
+    Runs a match without a terminal, one logic tick per `step` call.
+
+    Follows the tick rules of GameManager.logic_tick (the piece falls every
+    `difficulty(level)` ticks) except that the collapse animation advances on
+    every tick, and never sleeps, never imports curses and never touches the
+    save file.
+    '''
+    width: int
+    height: int
+    engine: BoardEngines
+    collapse_mode: CollapseModes
+    storage: GridStorages
+    difficulty_curve: Callable[[int], int]
+    score_multiplier: float
+    retire_depth: int | None
+    board: Board
+    player_manager: Player
+    tick: int
+    seed: int
+
+    def __init__(self, width: int = 12, height: int = 20, engine: BoardEngines = "GRID", collapse_mode: CollapseModes = "ANIMATED", storage: GridStorages = "LIST",
+                 difficulty_curve: Callable[[int], int] = difficulty, score_multiplier: float = 1.0, retire_depth: int | None = None):
+        self.width = width
+        self.height = height
+        self.engine = engine
+        self.collapse_mode = collapse_mode
+        self.storage = storage
+        self.difficulty_curve = difficulty_curve
+        self.score_multiplier = score_multiplier
+        # endless mode, the stack scrolls down once it is deeper than this
+        self.retire_depth = retire_depth
+        self.reset()
+
+    def reset(self, seed: int | None = None) -> StepResult:
+        self.player_manager = Player(persistent=False, score_multiplier=self.score_multiplier)
+        self.board = Board(self.width, self.height, self.player_manager, engine=self.engine,
+                           collapse_mode=self.collapse_mode, storage=self.storage, seed=seed)
+        # the board picks a seed when none is given, keep it so the match can be replayed
+        self.seed = self.board.seed
+        self.tick = 0
+        self._tickrate_counter = 0
+
+        return self.result()
+
+    def step(self, command: Command = None) -> StepResult:
+        board = self.board
+
+        if board.game_over:
+            return self.result()
+
+        if board.is_animating:
+            board.physics_logic()
+        else:
+            # not ==, a level up can shorten the interval under the ticks already counted
+            if self._tickrate_counter >= self.difficulty_curve(board.level):
+                board.physics_logic()
+                self._tickrate_counter = 0
+            self._tickrate_counter += 1
+
+        if command in MOVEMENT_COMMANDS:
+            board.movement(command)
+        if self.retire_depth != None:
+            board.retire_rows(self.retire_depth)
+
+        self.tick += 1
+        return self.result()
+
+    def result(self) -> StepResult:
+        return StepResult(self.tick, self.player_manager.score, self.board.level, self.board.game_over)
@@ -0,0 +1,99 @@
+from typing import Any
+import math
+
+
+class Histogram:
+    '''
+    Fixed size log-linear histogram of non negative integers, HDR style.
+
+    Values below 2**sub_bits get a bucket each, above that every power of two
+    range is split in 2**(sub_bits - 1) buckets, so any value is known to
+    within 1 / 2**(sub_bits - 1) of itself. `record` is an index computation
+    and an increment, the bucket list never grows and values past `highest`
+    count as `highest`.
+    '''
+    sub_bits: int
+    sub_count: int
+    half_count: int
+    highest: int
+    counts: list[int]
+    total_count: int
+    total: int
+    min: int
+    max: int
+
+    def __init__(self, highest: int = 60 * 10**9, sub_bits: int = 7):
+        self.sub_bits = sub_bits
+        self.sub_count = 1 << sub_bits
+        self.half_count = self.sub_count >> 1
+        self.highest = highest
+        self.counts = [0] * (self.index(highest) + 1)
+        self.reset()
+
+    def reset(self):
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.total_count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def index(self, value: int) -> int:
+        if value < self.sub_count:
+            return value
+        shift = value.bit_length() - self.sub_bits
+        return shift * self.half_count + (value >> shift)
+
+    def highest_equivalent(self, index: int) -> int:
+        ''' largest value that lands in the bucket at `index` '''
+        if index < self.sub_count:
+            return index
+        shift = index // self.half_count - 1
+        mantissa = index - shift * self.half_count
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int):
+        if value > self.highest:
+            value = self.highest
+        elif value < 0:
+            value = 0
+
+        self.counts[self.index(value)] += 1
+        if self.total_count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.total_count += 1
+        self.total += value
+
+    def percentile(self, percent: float) -> int:
+        if self.total_count == 0:
+            return 0
+
+        # the rank of the value, 1 based, at least the first one
+        rank = max(1, math.ceil(self.total_count * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.highest_equivalent(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.total_count if self.total_count else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.total_count,
+            "min": self.min,
+            "mean": round(self.mean),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+    def buckets(self) -> list[tuple[int, int]]:
+        ''' (highest equivalent value, count) of the buckets holding a value '''
+        return [(self.highest_equivalent(index), count) for index, count in enumerate(self.counts) if count]
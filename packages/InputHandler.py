@@ -1,18 +1,42 @@
 import curses
-from typing import Literal, TypeAlias, get_args
+import selectors
+import sys
+import time
+from collections import deque
+from packages.Command import Command, KeyPress
+from packages.AutoShift import AutoShift, Direction, DIRECTIONS
+from packages.KeyListener import KeyListener, TerminalKeys
+from typing import Callable, Iterator, get_args
 
-Command: TypeAlias = Literal["UP", "DOWN",
-                             "LEFT", "RIGHT", "ESCAPE", "DUMP", "TRIGGER_POWERUP", "CLOCKWISE_ROTATION", "COUNTERWISE_ROTATION", "RETURN", "MOUSE_CLICK", "MOUSE_MOVEMENT"] | None
-KeyPress: TypeAlias = int | None
+# a command and the monotonic time in ns at which its key was read
+TimedCommand = tuple[int, Command]
 
 
 class InputHandler:
+    '''
+    Keyboard input, woken by stdin readiness instead of polling.
+
+    `wait` sleeps on a selector until a key arrives, `drain` reads every
+    pending key into a timestamped queue and `commands` hands out the whole
+    batch, so a burst of key presses is applied at once instead of one per
+    frame.
+
+    With `enable_auto_shift` the sideways keys stop being commands and feed an
+    AutoShift instead, whose shifts the game loop takes with `shifts`.
+    '''
     responses: list[Command] = list(get_args(Command))
 
     last_keypress: KeyPress
     bindings: dict[KeyPress, Command] = {}
+    selector: selectors.BaseSelector
+    queue: deque[TimedCommand]
+    clock: Callable[[], int]
+    auto_shift: AutoShift | None
+    key_listener: KeyListener | None
+    terminal_keys: TerminalKeys | None
 
-    def __init__(self, stdscr: curses.window, bindings: dict[KeyPress, Command] | None = None) -> None:
+    def __init__(self, stdscr: curses.window, bindings: dict[KeyPress, Command] | None = None,
+                 input_fd: int | None = None, clock: Callable[[], int] = time.monotonic_ns) -> None:
         self.default_bindings: dict[KeyPress, Command] = {
             ord("w"): "UP",
             ord("d"): "RIGHT",
@@ -21,6 +45,7 @@ class InputHandler:
             ord("p"): "TRIGGER_POWERUP",
             ord("e"): "CLOCKWISE_ROTATION",
             ord("q"): "COUNTERWISE_ROTATION",
+            ord(" "): "HARD_DROP",
             curses.KEY_ENTER: "RETURN",
             10: "RETURN",
         }
@@ -29,18 +54,87 @@ class InputHandler:
         self.stdscr.keypad(True)
         curses.mousemask(curses.ALL_MOUSE_EVENTS |
                          curses.REPORT_MOUSE_POSITION)
+        # getch never blocks, the selector does the waiting
         self.stdscr.nodelay(True)
         self.__class__.bindings = self.default_bindings if bindings == None else bindings
 
-    def get_command(self) -> Command:
-        try:
-            key = self.stdscr.getch()
-        except curses.error:
-            return None
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(sys.stdin.fileno() if input_fd == None else input_fd, selectors.EVENT_READ)
+        self.queue = deque()
+        self.clock = clock
+        self.auto_shift = None
+        self.key_listener = None
+        self.terminal_keys = None
+
+    def enable_auto_shift(self, auto_shift: AutoShift, key_listener: KeyListener | None = None):
+        ''' presses and releases come from `key_listener` when it starts, from the terminal repeat otherwise '''
+        self.auto_shift = auto_shift
+        self.key_listener = key_listener if key_listener != None and key_listener.start() else None
+        self.terminal_keys = TerminalKeys(auto_shift) if self.key_listener == None else None
+
+    def wait(self, timeout: float | None) -> bool:
+        ''' sleeps until a key is pending or `timeout` seconds pass, forever when it is None '''
+        if self.queue:
+            return True
+        return len(self.selector.select(timeout)) > 0
+
+    def drain(self) -> int:
+        ''' moves every pending key into the queue, returns how many commands it added '''
+        now = self.clock()
+        added = 0
+        while True:
+            try:
+                key = self.stdscr.getch()
+            except curses.error:
+                break
+
+            if key == curses.ERR:
+                break
 
-        if key == curses.ERR:
+            command = self.translate(key)
+            if self.auto_shift != None and command in DIRECTIONS:
+                # the listener sees these keys too, with their releases
+                if self.terminal_keys != None:
+                    self.terminal_keys.key(command, now)  # type: ignore
+                continue
+
+            if command != None:
+                self.queue.append((now, command))
+                added += 1
+        return added
+
+    def shifts(self) -> list[tuple[Direction, int]]:
+        ''' sideways shifts due by now as (direction, cells), see AutoShift.due_shifts '''
+        if self.auto_shift == None:
+            return []
+
+        now = self.clock()
+        if self.key_listener != None:
+            for time_ns, key, pressed in self.key_listener.events():
+                command = self.translate(key)
+                if command in DIRECTIONS:
+                    if pressed:
+                        self.auto_shift.press(command, time_ns)  # type: ignore
+                    else:
+                        self.auto_shift.release(command, time_ns)  # type: ignore
+        if self.terminal_keys != None:
+            self.terminal_keys.expire(now)
+        return self.auto_shift.due_shifts(now)
+
+    def commands(self) -> Iterator[Command]:
+        ''' drains the input and yields the queued commands, oldest first '''
+        self.drain()
+        # popped one at a time, whoever iterates next gets what is left
+        while self.queue:
+            yield self.queue.popleft()[1]
+
+    def get_command(self) -> Command:
+        self.drain()
+        if not self.queue:
             return None
+        return self.queue.popleft()[1]
 
+    def translate(self, key: KeyPress) -> Command:
         if key == curses.KEY_MOUSE:
             return "MOUSE_CLICK"
 
@@ -48,3 +142,8 @@ class InputHandler:
 
     def restore_bindings(self):
         self.__class__.bindings = self.default_bindings
+
+    def close(self):
+        self.selector.close()
+        if self.key_listener != None:
+            self.key_listener.stop()
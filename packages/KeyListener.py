@@ -0,0 +1,123 @@
+from packages.AutoShift import AutoShift, Direction
+from packages.Command import KeyPress
+from collections import deque
+from typing import Any, Callable, TypeAlias
+import time
+
+# monotonic time in ns, key code in the curses numbering and whether it went down
+KeyEvent: TypeAlias = tuple[int, KeyPress, bool]
+
+
+class KeyListener:
+    '''
+    Press and release events of the keyboard from pynput.
+
+    pynput calls back on its own thread, the events are stamped there and
+    wait in a deque until `events` hands them to the game loop. `start`
+    returns False when pynput is missing or its keyboard backend does not
+    come up here, a terminal over ssh or a Wayland session for one.
+    '''
+    clock: Callable[[], int]
+    queue: deque[KeyEvent]
+    listener: Any
+    startup_s: float
+
+    def __init__(self, clock: Callable[[], int] = time.monotonic_ns, startup_s: float = 0.25):
+        self.clock = clock
+        self.queue = deque()
+        self.listener = None
+        # how long the backend gets to come up or fail before it counts as running
+        self.startup_s = startup_s
+
+    def start(self) -> bool:
+        try:
+            from pynput import keyboard
+            self.listener = keyboard.Listener(on_press=lambda key: self.on_key(key, True),
+                                              on_release=lambda key: self.on_key(key, False))
+            self.listener.start()
+        except Exception:
+            # no module, no display or no input device
+            self.stop()
+            return False
+
+        # a backend that cannot connect ends its thread right after starting, without raising here
+        deadline = time.monotonic() + self.startup_s
+        while time.monotonic() < deadline:
+            if not self.listener.is_alive():
+                break
+            time.sleep(0.01)
+
+        if not (self.listener.is_alive() and self.listener.running):
+            self.stop()
+            return False
+        return True
+
+    def stop(self):
+        if self.listener != None:
+            try:
+                self.listener.stop()
+            except Exception:
+                pass
+            self.listener = None
+
+    def on_key(self, key: Any, pressed: bool):
+        code = self.key_code(key)
+        if code != None:
+            self.queue.append((self.clock(), code, pressed))
+
+    @staticmethod
+    def key_code(key: Any) -> KeyPress:
+        ''' the curses code of a pynput key, only the keys the bindings can use '''
+        char = getattr(key, "char", None)
+        if char != None:
+            return ord(char)
+
+        name = getattr(key, "name", None)
+        if name == "space":
+            return ord(" ")
+        if name == "enter":
+            return 10
+        return None
+
+    def events(self) -> list[KeyEvent]:
+        events: list[KeyEvent] = []
+        while self.queue:
+            events.append(self.queue.popleft())
+        return events
+
+
+class TerminalKeys:
+    '''
+    Stand-in for KeyListener over a terminal, which only reports key presses.
+
+    A key seen again within `hold_ms` is the terminal auto repeat, so it is
+    held from then on and released once its repeats stop for `release_ms`.
+    A key seen once is a tap. The terminal repeat delay adds to the DAS.
+    '''
+    auto_shift: AutoShift
+    hold_ns: int
+    release_ns: int
+    last_seen: dict[Direction, int]
+
+    def __init__(self, auto_shift: AutoShift, hold_ms: float = 700, release_ms: float = 60):
+        self.auto_shift = auto_shift
+        self.hold_ns = round(hold_ms * 10**6)
+        self.release_ns = round(release_ms * 10**6)
+        self.last_seen = {}
+
+    def key(self, direction: Direction, time_ns: int):
+        last = self.last_seen.get(direction)
+        self.last_seen[direction] = time_ns
+        if direction in self.auto_shift.held:
+            return
+
+        self.auto_shift.press(direction, time_ns)
+        if last == None or time_ns - last > self.hold_ns:
+            self.auto_shift.release(direction, time_ns)
+
+    def expire(self, time_ns: int):
+        ''' releases the held keys the terminal stopped repeating '''
+        for direction in list(self.auto_shift.held):
+            last = self.last_seen[direction]
+            if time_ns - last > self.release_ns:
+                self.auto_shift.release(direction, last)
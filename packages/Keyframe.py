@@ -0,0 +1,105 @@
+from packages.Board import Board
+from packages.Block import Block
+from packages.Piece import Piece, PIECE_CODES
+from packages.PowerUp import PowerUp, PowerUpNamesNSpecials, POWER_UP_CHOICES
+from packages.Vector2 import Vector2
+import random
+import struct
+
+# physics ticks, score, lines, pieces, level, collapse height, scan height, flags,
+# power up, queued pieces, remaining piece chunk
+KEYFRAME_FIELDS = struct.Struct("<QQIIHhhBBBH")
+# type, rotation, origin x, origin y
+KEYFRAME_PIECE = struct.Struct("<BBhh")
+# Mersenne Twister words plus the position, then the cached gauss value
+KEYFRAME_RANDOM = struct.Struct("<625I?d")
+
+POWER_UP_CODES: tuple[PowerUpNamesNSpecials, ...] = (None,) + POWER_UP_CHOICES
+BOARD_FLAGS = ("is_animating", "is_falling_blocks", "blocks_fell_in_scan", "game_over")
+
+
+def encode_piece(piece: Piece) -> bytes:
+    return KEYFRAME_PIECE.pack(PIECE_CODES.index(piece.type), piece.rotation, piece.origin.x, piece.origin.y)
+
+
+def decode_piece(data: bytes | memoryview, position: int) -> Piece:
+    type_code, rotation, x, y = KEYFRAME_PIECE.unpack_from(data, position)
+    piece = Piece(Vector2(x, y), PIECE_CODES[type_code])
+    piece.rotation = rotation
+    return piece
+
+
+def encode_random(generator: random.Random) -> bytes:
+    _, words, gauss_next = generator.getstate()
+    return KEYFRAME_RANDOM.pack(*words, gauss_next != None, gauss_next or 0.0)
+
+
+def decode_random(generator: random.Random, data: bytes | memoryview, position: int):
+    values = KEYFRAME_RANDOM.unpack_from(data, position)
+    gauss_next = values[626] if values[625] else None
+    generator.setstate((3, values[:625], gauss_next))
+
+
+def encode_keyframe(board: Board) -> bytes:
+    '''
+    Serializes everything a board needs to continue the match exactly where it
+    was: cells, pieces, power up, animation fields, counters and random streams.
+    '''
+    player = board.player_manager
+    generator = board.generator
+    remaining_chunk = generator.piece_chunk[generator.piece_cursor:]
+
+    flags = 0
+    for bit, name in enumerate(BOARD_FLAGS):
+        flags |= getattr(board, name) << bit
+    flags |= player.power_up.is_active << len(BOARD_FLAGS)
+
+    parts = [KEYFRAME_FIELDS.pack(board.physics_ticks, player.score, board.lines_cleared,
+                                  board.pieces_placed, board.level, board.collapse_height,
+                                  board.scan_height, flags, POWER_UP_CODES.index(player.power_up.name),
+                                  len(board.spawnlist), len(remaining_chunk))]
+    parts.append(encode_piece(board.player_piece))
+    parts.extend(encode_piece(piece) for piece in board.spawnlist)
+    parts.append(bytes(PIECE_CODES.index(piece_type) for piece_type in remaining_chunk))
+    parts.append(encode_random(generator.piece_random))
+    parts.append(encode_random(generator.power_up_random))
+    # column-major like Board.grid, the symbol byte of every block or 0 for empty cells
+    parts.append(bytes(0 if cell == None else ord(cell.symbol) for column in board.grid for cell in column))
+    return b"".join(parts)
+
+
+def restore_keyframe(board: Board, data: bytes | memoryview):
+    ''' loads a keyframe into a board created with the same settings and seed '''
+    (board.physics_ticks, score, board.lines_cleared, board.pieces_placed, board.level,
+     board.collapse_height, board.scan_height, flags, power_up, queued,
+     chunk_length) = KEYFRAME_FIELDS.unpack_from(data, 0)
+
+    for bit, name in enumerate(BOARD_FLAGS):
+        setattr(board, name, bool(flags >> bit & 1))
+
+    player = board.player_manager
+    player.score = score
+    player.power_up = PowerUp(POWER_UP_CODES[power_up])
+    player.power_up.is_active = bool(flags >> len(BOARD_FLAGS) & 1)
+
+    position = KEYFRAME_FIELDS.size
+    board.player_piece = decode_piece(data, position)
+    board.spawnlist = []
+    for _ in range(queued):
+        position += KEYFRAME_PIECE.size
+        board.spawnlist.append(decode_piece(data, position))
+    position += KEYFRAME_PIECE.size
+
+    generator = board.generator
+    generator.piece_chunk = [PIECE_CODES[code] for code in data[position:position + chunk_length]]  # type: ignore
+    generator.piece_cursor = 0
+    position += chunk_length
+    decode_random(generator.piece_random, data, position)
+    position += KEYFRAME_RANDOM.size
+    decode_random(generator.power_up_random, data, position)
+    position += KEYFRAME_RANDOM.size
+
+    for x, column in enumerate(board.grid):
+        for y in range(board.height):
+            symbol = data[position + x * board.height + y]
+            column[y] = None if symbol == 0 else Block.shared(chr(symbol))
@@ -5,91 +5,78 @@ from typing import Literal, TypeAlias, Union, get_args
 specialTypes: TypeAlias = Literal["BOMB"]
 pieceTypes: TypeAlias = Literal["PYRAMID", "LINE", "HALF_SQUARE"]
 generatableTypes: TypeAlias = Union[specialTypes, pieceTypes, None]
+RotationOffsets: TypeAlias = tuple[tuple[int, int], ...]
+
+# materialized once, get_args builds a new tuple on every call
+PIECE_TYPE_CHOICES: tuple[pieceTypes, ...] = get_args(pieceTypes)
+# every type a piece can have, in the order binary formats and hashes number them
+PIECE_CODES: tuple[pieceTypes | specialTypes, ...] = ("BOMB",) + PIECE_TYPE_CHOICES
+
+# blocks of every type in its spawn rotation, the order of the blocks is part of the rules
+PIECE_SHAPES: dict[pieceTypes | specialTypes, RotationOffsets] = {
+    "BOMB": ((0, 0),),
+    "HALF_SQUARE": ((-1, 0), (-1, 1), (0, 1), (1, 1)),
+    "LINE": ((-1, 0), (0, 0), (1, 0), (2, 0)),
+    "PYRAMID": ((0, 0), (-1, 1), (0, 1), (1, 1)),
+}
+
+PIECE_HEIGHTS: dict[pieceTypes | specialTypes, int] = {
+    "BOMB": 1,
+    "HALF_SQUARE": 2,
+    "LINE": 1,
+    "PYRAMID": 2,
+}
 
 
 class Piece:
     type: pieceTypes | specialTypes
     origin: Vector2
-    blocks_relative_pos: list[Vector2]
+    rotation: int
     height: int
 
+    # every rotation state of every type, index 1 is one clockwise turn from index 0
+    ROTATION_OFFSETS: dict[pieceTypes | specialTypes, tuple[RotationOffsets, ...]] = {}
+
     def __init__(self, origin: Vector2, type: generatableTypes = None):
 
         self.type = Piece.getRandomType() if type == None else type
         self.origin = origin
-        self.blocks_relative_pos = []
-        self.materializeType(self.type)
-        self.height = 0
+        self.rotation = 0
+        self.height = PIECE_HEIGHTS[self.type]
 
-    def copy(self) -> 'Piece':
-        new_piece = Piece(self.origin.copy(), self.type)
+    @property
+    def blocks_relative_pos(self) -> tuple[Vector2, ...]:
+        # new vectors on every call, the shared tables only hold tuples
+        return tuple(Vector2(x, y) for x, y in Piece.ROTATION_OFFSETS[self.type][self.rotation])
 
-        new_piece.blocks_relative_pos = []
-        for block in self.blocks_relative_pos:
-            new_piece.blocks_relative_pos.append(block.copy())
+    @property
+    def offsets(self) -> RotationOffsets:
+        return Piece.ROTATION_OFFSETS[self.type][self.rotation]
 
+    def copy(self) -> 'Piece':
+        # skips __init__, the type is already materialized
+        new_piece = Piece.__new__(Piece)
+        new_piece.type = self.type
+        new_piece.origin = self.origin.copy()
+        new_piece.rotation = self.rotation
+        new_piece.height = self.height
         return new_piece
 
     def materializeType(self, type: generatableTypes):
-        if type == "BOMB":
-            self.blocks_relative_pos = []
-
-            block1 = Vector2(0, 0)
-
-            self.height = 1
-            self.blocks_relative_pos.append(block1)
-            return
-
-        if type == "HALF_SQUARE":
-            block1 = Vector2(-1, 0)
-            block2 = Vector2(-1, 1)
-            block3 = Vector2(0, 1)
-            block4 = Vector2(1, 1)
-
-            self.blocks_relative_pos.append(block1)
-            self.blocks_relative_pos.append(block2)
-            self.blocks_relative_pos.append(block3)
-            self.blocks_relative_pos.append(block4)
-
-            self.height = 2
-            return
-
-        if type == "LINE":
-            block1 = Vector2(-1, 0)
-            block2 = Vector2(0, 0)
-            block3 = Vector2(1, 0)
-            block4 = Vector2(2, 0)
-
-            self.blocks_relative_pos.append(block1)
-            self.blocks_relative_pos.append(block2)
-            self.blocks_relative_pos.append(block3)
-            self.blocks_relative_pos.append(block4)
-
-            self.height = 1
+        if type == None:
             return
+        self.type = type
+        self.rotation = 0
+        self.height = PIECE_HEIGHTS[type]
 
-        if type == "PYRAMID":
-            block1 = Vector2(0, 0)
-            block2 = Vector2(-1, 1)
-            block3 = Vector2(0, 1)
-            block4 = Vector2(1, 1)
+    def rotated_index(self, is_clock_wise: bool) -> int:
+        return (self.rotation + (1 if is_clock_wise else -1)) % 4
 
-            self.blocks_relative_pos.append(block1)
-            self.blocks_relative_pos.append(block2)
-            self.blocks_relative_pos.append(block3)
-            self.blocks_relative_pos.append(block4)
-
-            self.height = 2
-            return
+    def rotated_offsets(self, is_clock_wise: bool) -> RotationOffsets:
+        return Piece.ROTATION_OFFSETS[self.type][self.rotated_index(is_clock_wise)]
 
     def rotateBlocks(self, is_clock_wise: bool):
-        new_rel_pos: list[Vector2] = []
-
-        for block in self.blocks_relative_pos:
-            block = self.vectorRightRotation(block, is_clock_wise)
-            new_rel_pos.append(block)
-
-        self.blocks_relative_pos = new_rel_pos
+        self.rotation = self.rotated_index(is_clock_wise)
 
     def getBlockAbsPos(self, block: Vector2):
         return block+self.origin
@@ -108,6 +95,22 @@ class Piece:
         else:
             return Vector2(-vector_to_rotate.y, vector_to_rotate.x)
 
+    @staticmethod
+    def build_rotation_tables():
+        for piece_type, shape in PIECE_SHAPES.items():
+            blocks = shape
+            rotations: list[RotationOffsets] = []
+
+            for _ in range(4):
+                rotations.append(blocks)
+                # clockwise matrix of vectorRightRotation
+                blocks = tuple((-y, x) for x, y in blocks)
+
+            Piece.ROTATION_OFFSETS[piece_type] = tuple(rotations)
+
     @staticmethod
     def getRandomType() -> pieceTypes:
-        return random.choice(list(get_args(pieceTypes)))
+        return random.choice(PIECE_TYPE_CHOICES)
+
+
+Piece.build_rotation_tables()
@@ -0,0 +1,70 @@
+from packages.Piece import Piece
+from packages.Vector2 import Vector2
+from packages.Command import Command
+from collections import deque
+from typing import TYPE_CHECKING, TypeAlias
+
+if TYPE_CHECKING:
+    from packages.Board import Board
+
+# origin x, origin y and rotation index of a piece
+Placement: TypeAlias = tuple[int, int, int]
+# commands that take the piece from its current state to a placement, None waits one gravity step
+PlacementPaths: TypeAlias = dict[Placement, tuple[Command, ...]]
+
+STEPS: tuple[Command, ...] = ("LEFT", "RIGHT", "CLOCKWISE_ROTATION", "COUNTERWISE_ROTATION", None)
+
+
+def enumerate_placements(board: 'Board', piece: Piece) -> PlacementPaths:
+    '''
+    Breadth first search over every (x, y, rotation) the piece can reach with the
+    board movement rules and gravity. Returns the states where the piece rests,
+    the ones it would petrify at on the next physics tick, each with the
+    shortest command sequence that gets there.
+    '''
+    probe = Piece(Vector2(piece.origin.x, piece.origin.y), piece.type)
+    start: Placement = (piece.origin.x, piece.origin.y, piece.rotation)
+
+    parents: dict[Placement, tuple[Placement, Command] | None] = {start: None}
+    queue: deque[Placement] = deque([start])
+    resting: list[Placement] = []
+
+    while queue:
+        state = queue.popleft()
+        x, y, rotation = state
+
+        for step in STEPS:
+            probe.origin.x = x
+            probe.origin.y = y
+            probe.rotation = rotation
+
+            if step == "LEFT" or step == "RIGHT":
+                if not board.piece_can_move(step, probe):
+                    continue
+                next_state = (x + (1 if step == "RIGHT" else -1), y, rotation)
+            elif step == None:
+                if board.has_collided(probe):
+                    resting.append(state)
+                    continue
+                next_state = (x, y + 1, rotation)
+            else:
+                is_clock_wise = step == "CLOCKWISE_ROTATION"
+                if not board.piece_can_rotate(probe, is_clock_wise):
+                    continue
+                next_state = (x, y, probe.rotated_index(is_clock_wise))
+
+            if next_state not in parents:
+                parents[next_state] = (state, step)
+                queue.append(next_state)
+
+    paths: PlacementPaths = {}
+    for placement in resting:
+        path: list[Command] = []
+        parent = parents[placement]
+        while parent != None:
+            state, step = parent
+            path.append(step)
+            parent = parents[state]
+        path.reverse()
+        paths[placement] = tuple(path)
+    return paths
@@ -1,8 +1,10 @@
 from packages.PowerUp import PowerUp
-from packages.InputHandler import InputHandler, KeyPress, Command
+from packages.RandomGenerator import RandomGenerator
+from packages.Command import KeyPress, Command
 from dataclasses import dataclass
 from typing import Literal, TypeAlias
 import pickle
+import copy
 import os
 import math
 
@@ -21,20 +23,36 @@ class Player:
     power_up: PowerUp
     acummulated_score: int
     score: int
+    persistent: bool
+    score_multiplier: float
+    generator: RandomGenerator | None
 
-    def __init__(self) -> None:
+    def __init__(self, persistent: bool = True, score_multiplier: float = 1.0) -> None:
+        # a non persistent player never reads or writes the save file
         self.score = 0
+        self.score_multiplier = score_multiplier
         self.power_up = PowerUp(None)
         self.acummulated_score = 0
-        self.load_acummulated_score()
+        self.persistent = persistent
+        # set by the board so power up rolls follow the match seed
+        self.generator = None
+        if self.persistent:
+            self.load_acummulated_score()
 
     def end_match(self):
         self.acummulated_score += self.score
         self.score = 0
         self.power_up = PowerUp(None)
-        self.save_acummulated_score()
+        if self.persistent:
+            self.save_acummulated_score()
+
+    def copy(self) -> 'Player':
+        player = copy.copy(self)
+        player.power_up = copy.copy(self.power_up)
+        return player
 
     def add_score(self, action: ScoreActions, multiplier: float = 1.0):
+        multiplier *= self.score_multiplier
         if action == "BLOCK_DESTROYED":
             self.score += math.floor(10 * multiplier)
             return
@@ -46,9 +64,15 @@ class Player:
     def add_powerup(self):
         if self.power_up.name != None:
             return
-        self.power_up = PowerUp()
+        if self.generator == None:
+            self.power_up = PowerUp()
+        else:
+            self.power_up = PowerUp(self.generator.next_power_up())
 
     def save_acummulated_score(self, save_file_location: str | None = None):
+        # imported here so the simulation never pulls curses in through the input handler
+        from packages.InputHandler import InputHandler
+
         save_file_to_save: str
         save_file_to_save = (
             SAVE_FILE_LOCATION + DATA_FILE_NAME) if save_file_location == None else save_file_location
@@ -68,6 +92,8 @@ class Player:
             print(error)
 
     def load_acummulated_score(self, save_file_location: str | None = None):
+        from packages.InputHandler import InputHandler
+
         save_file_to_load: str
         save_file_to_load = (
             SAVE_FILE_LOCATION + DATA_FILE_NAME) if save_file_location == None else save_file_location
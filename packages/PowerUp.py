@@ -4,6 +4,8 @@ import random
 PowerUpNames: TypeAlias = Literal["TELEPORTER", "BOMB"]
 PowerUpNamesNSpecials: TypeAlias = Union[PowerUpNames, None, Literal["EMPTY"]]
 
+POWER_UP_CHOICES: tuple[PowerUpNames, ...] = get_args(PowerUpNames)
+
 
 class PowerUp():
     name: PowerUpNamesNSpecials
@@ -12,7 +14,7 @@ class PowerUp():
     def __init__(self, power_up: PowerUpNamesNSpecials = "EMPTY") -> None:
         self.is_active = False
         if power_up == "EMPTY":
-            self.name = random.choice(list(get_args(PowerUpNames)))
+            self.name = random.choice(POWER_UP_CHOICES)
         elif power_up == None:
             self.name = None
         else:
@@ -0,0 +1,69 @@
+from packages.Piece import pieceTypes, PIECE_TYPE_CHOICES
+from packages.PowerUp import PowerUpNames, POWER_UP_CHOICES
+import random
+import copy
+import os
+
+
+class RandomGenerator:
+    '''
+    Seeded source of every random roll of a match.
+
+    Piece types and power ups draw from separate streams so the piece sequence
+    of a seed never depends on when the lines were cleared. Piece types are
+    rolled in chunks of `chunk_size` and handed out one by one.
+    '''
+    seed: int
+    chunk_size: int
+    piece_random: random.Random
+    power_up_random: random.Random
+    piece_chunk: list[pieceTypes]
+    piece_cursor: int
+    shared: bool
+
+    def __init__(self, seed: int | None = None, chunk_size: int = 256):
+        # an os entropy seed, forked workers never share the global random state
+        self.seed = int.from_bytes(os.urandom(8)) if seed == None else seed
+        self.chunk_size = chunk_size
+        # string seeds are hashed with sha512, stable across processes and runs
+        self.piece_random = random.Random(f"{self.seed}:PIECES")
+        self.power_up_random = random.Random(f"{self.seed}:POWER_UPS")
+        self.piece_chunk = []
+        self.piece_cursor = 0
+        # set while the random streams are shared with a copy
+        self.shared = False
+
+    def next_piece_type(self) -> pieceTypes:
+        if self.piece_cursor == len(self.piece_chunk):
+            if self.shared:
+                self.unshare()
+            # a fresh list every time, copies keep reading the chunk they share
+            self.piece_chunk = self.piece_random.choices(PIECE_TYPE_CHOICES, k=self.chunk_size)
+            self.piece_cursor = 0
+
+        piece_type = self.piece_chunk[self.piece_cursor]
+        self.piece_cursor += 1
+        return piece_type
+
+    def next_power_up(self) -> PowerUpNames:
+        if self.shared:
+            self.unshare()
+        return self.power_up_random.choice(POWER_UP_CHOICES)
+
+    def copy(self) -> 'RandomGenerator':
+        # the streams are only duplicated by the first of the two that rolls again,
+        # copying the Mersenne Twister state costs far more than a whole snapshot
+        generator = copy.copy(self)
+        self.shared = True
+        generator.shared = True
+        return generator
+
+    def unshare(self):
+        piece_random = random.Random()
+        piece_random.setstate(self.piece_random.getstate())
+        power_up_random = random.Random()
+        power_up_random.setstate(self.power_up_random.getstate())
+
+        self.piece_random = piece_random
+        self.power_up_random = power_up_random
+        self.shared = False
@@ -5,7 +5,7 @@ from typing import Callable, TypeVar, ParamSpec, Literal, TypeAlias, Annotated
 import curses
 import time
 import functools
-from packages.Piece import Piece
+from packages.FrameBuffer import FrameBuffer, UNKNOWN
 import os
 
 T = TypeVar('T')
@@ -14,8 +14,8 @@ P = ParamSpec('P')
 
 def draw_call(func: Callable[P, T]) -> Callable[P, T]:
     """
-    A decorator that clears the screen, calls the function,
-    and then refreshes the screen.
+    A decorator that starts a blank frame, calls the function,
+    and then sends what changed on the screen.
     """
     @functools.wraps(func)
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
@@ -37,9 +37,9 @@ def draw_call(func: Callable[P, T]) -> Callable[P, T]:
                 def void_return(): return None
                 return void_return  # type: ignore
 
-            instance.stdscr.clear()
+            instance.begin_frame()
             result = func(*args, **kwargs)
-            instance.stdscr.refresh()
+            instance.present()
             return result
         else:
             # Fallback if used on a function without 'stdscr'
@@ -66,7 +66,19 @@ Bounding_boxes: dict[UI_Elements, Annotated[list[Vector2], "length=2"]] = {
 
 
 class Renderer:
+    '''
+    Draws the screens of the game on a curses window.
+
+    Every draw call writes a whole frame into `canvas` and compares it with
+    `shown`, the cells the terminal holds, only the runs that differ are
+    sent and flushed with a single doupdate. `draw` also skips the frame when
+    the board revision is the one it drew last and the terminal kept its size.
+    '''
     stdscr: curses.window
+    canvas: FrameBuffer
+    shown: FrameBuffer
+    drawn_board: Board | None
+    drawn_revision: int
     board_dimensions: Vector2
     debug: bool
     selection: UI_Elements
@@ -85,6 +97,8 @@ class Renderer:
 
         self.selection = None
         self.debug = debug
+        self.drawn_board = None
+        self.drawn_revision = -1
 
         self._generate_dynamic_binding_ui()
 
@@ -94,6 +108,10 @@ class Renderer:
         self.board_dimensions = board_dimensions
         self.stdscr = stdscr
         curses.curs_set(0)
+        height, width = self.stdscr.getmaxyx()
+        self.canvas = FrameBuffer(height, width)
+        # what the terminal shows is unknown until the first frame, every cell gets sent
+        self.shown = FrameBuffer(height, width, UNKNOWN)
 
         self.require_window_resize()
 
@@ -195,13 +213,53 @@ class Renderer:
 
         return selected
 
+    def resized(self) -> bool:
+        ''' whether the terminal size differs from the last frame, curses updates it on KEY_RESIZE '''
+        if self.debug:
+            return False
+        return self.stdscr.getmaxyx() != (self.shown.height, self.shown.width)
+
+    def begin_frame(self):
+        self.drawn_board = None
+        height, width = self.stdscr.getmaxyx()
+        if (height, width) != (self.shown.height, self.shown.width):
+            # resized, the whole screen is sent again
+            self.canvas = FrameBuffer(height, width)
+            self.shown = FrameBuffer(height, width, UNKNOWN)
+            self.stdscr.erase()
+            return
+
+        self.canvas.clear()
+
+    def present(self):
+        for y, x, text in self.canvas.changes(self.shown):
+            try:
+                self.stdscr.addstr(y, x, text)
+            except curses.error:
+                # writing the bottom right cell pushes the cursor off the screen, the cell is drawn anyway
+                pass
+
+        self.canvas, self.shown = self.shown, self.canvas
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def draw(self, board: Board) -> bool:
+        ''' draws the match unless neither the board nor the terminal size changed since the last frame, returns whether it drew '''
+        if board is self.drawn_board and board.revision == self.drawn_revision and not self.resized():
+            return False
+
+        self.draw_board(board)
+        self.drawn_board = board
+        self.drawn_revision = board.revision
+        return True
+
     @draw_call
-    def draw(self, board: Board):
+    def draw_board(self, board: Board):
         x_offset = 2
         y_offset = 2
 
         # draw current level
-        self.stdscr.addstr(-2+y_offset, board.width//4 +
+        self.canvas.addstr(-2+y_offset, board.width//4 +
                            x_offset, f"Nível atual: {board.level}")
 
         # draw grid borders
@@ -211,59 +269,45 @@ class Renderer:
         # draws grid borders
         self.draw_square(tlc, rbc)
 
-        # draw the static blocks
-        for x in range(len(board.grid)):
-            for y in range(len(board.grid[x])):
-                item = board.grid[x][y]
-                if item == None:
-                    self.stdscr.addstr(y+y_offset, x+x_offset, " ")
-                else:
-                    self.stdscr.addstr(y+y_offset, x+x_offset, item.symbol)
+        # draw the static blocks, the empty cells are already blank
+        for x in range(board.width):
+            column = board.grid[x]
+            filled = board.column_masks[x]
+            while filled:
+                y = filled.bit_length() - 1
+                filled ^= 1 << y
+                item = column[y]
+                if item != None:
+                    self.canvas.addstr(y+y_offset, x+x_offset, item.symbol)
 
         # draw piece landing spot
-        piece_clone: Piece = board.player_piece.copy()
-
-        # get piece height(distance from origin to bottom), independent of rotation
-        biggest_height: int = 0
-        for block in piece_clone.blocks_relative_pos:
-            if block.y < 0:
-                if block.y < biggest_height:
-                    biggest_height = block.y
-
-        clone_height: int = abs(biggest_height)
-
-        if piece_clone.origin.y+clone_height < board.height - 1:
-            while True:
-                piece_clone.origin.y += 1
-                if board.has_collided(piece_clone):
-                    break
-
-            for block in piece_clone.blocks_relative_pos:
-                block_abs = piece_clone.getBlockAbsPos(block)
-                self.stdscr.addstr(block_abs.y+y_offset,
-                                   block_abs.x+x_offset, "-")
-
         piece = board.player_piece
+        landing_row = board.landing_row(piece)
+
+        if landing_row > piece.origin.y:
+            for relative_x, relative_y in piece.offsets:
+                self.canvas.addstr(landing_row+relative_y+y_offset,
+                                   piece.origin.x+relative_x+x_offset, "-")
 
         # draw current piece
-        for piece_block in piece.blocks_relative_pos:
-            abs_pos = Piece.getBlockAbsPos(piece, piece_block)
-            self.stdscr.addstr(abs_pos.y+y_offset, abs_pos.x+x_offset, "X")
+        for relative_x, relative_y in piece.offsets:
+            self.canvas.addstr(piece.origin.y+relative_y+y_offset,
+                               piece.origin.x+relative_x+x_offset, "X")
 
         # draw current power up
         safezone = board.width+2
-        self.stdscr.addstr(
+        self.canvas.addstr(
             2, safezone+3, f"Power up atual: {"Nenhum" if board.player_manager.power_up.name == None else board.player_manager.power_up.name}")
 
-        self.stdscr.addstr((board.height+2)+2, 2,
+        self.canvas.addstr((board.height+2)+2, 2,
                            f"Pontuação: {board.player_manager.score}")
-        self.stdscr.addstr((board.height+2)+3, 2,
+        self.canvas.addstr((board.height+2)+3, 2,
                            f"Pontuação acumulada: {board.player_manager.acummulated_score}")
 
         preview_x = safezone + 6
         preview_start_y = 4
 
-        self.stdscr.addstr(preview_start_y, preview_x-3, "Próximas peças:")
+        self.canvas.addstr(preview_start_y, preview_x-3, "Próximas peças:")
 
         for i, next_piece in enumerate(board.spawnlist[:3]):
 
@@ -283,19 +327,19 @@ class Renderer:
             center_x = preview_x + (box_width // 2)
             center_y = box_y + (box_height // 2)
 
-            for block in next_piece.blocks_relative_pos:
-                draw_x = center_x + block.x
-                draw_y = center_y + block.y
+            for relative_x, relative_y in next_piece.offsets:
+                draw_x = center_x + relative_x
+                draw_y = center_y + relative_y
 
-                self.stdscr.addstr(draw_y, draw_x, "X")
+                self.canvas.addstr(draw_y, draw_x, "X")
 
     @draw_call
     def show_alert(self, message: str):
-        self.stdscr.addstr(message)
+        self.canvas.addstr(0, 0, message)
 
     @draw_call
     def show_bindingscreen(self, selected_bind: None | Command = None):
-        self.stdscr.addstr(2, 2, "CONTROLES (Selecione para alterar)")
+        self.canvas.addstr(2, 2, "CONTROLES (Selecione para alterar)")
 
         localization = {
             "UP": "Mover Cima", "DOWN": "Mover Baixo",
@@ -303,7 +347,8 @@ class Renderer:
             "CLOCKWISE_ROTATION": "Girar Horário",
             "COUNTERWISE_ROTATION": "Girar Anti-H",
             "RETURN": "Selecionar", "ESCAPE": "Sair/Pausar",
-            "TRIGGER_POWERUP": "Powerup"
+            "TRIGGER_POWERUP": "Powerup",
+            "HARD_DROP": "Queda rápida"
         }
 
         for ui_element in self.elements_per_screen["BINDINGS_SCREEN"]:
@@ -365,22 +410,27 @@ class Renderer:
 
         self.show_bindingscreen(cmd)
 
-        while True:
-            try:
-                key = self.stdscr.getch()
-            except curses.error:
-                continue
+        # blocks on the next key instead of spinning on the non blocking getch
+        self.stdscr.timeout(-1)
+        try:
+            while True:
+                try:
+                    key = self.stdscr.getch()
+                except curses.error:
+                    continue
 
-            if key == curses.ERR:
-                continue
+                if key == curses.ERR:
+                    continue
 
-            if key == curses.KEY_MOUSE:
-                continue
+                if key == curses.KEY_MOUSE:
+                    continue
 
-            if key == 27:
-                return
+                if key == 27:
+                    return
 
-            break
+                break
+        finally:
+            self.stdscr.nodelay(True)
 
         if cmd in InputHandler.bindings.values():
             keys_to_delete: list[KeyPress] = []
@@ -420,10 +470,10 @@ class Renderer:
         if left_top_corner.y > right_bottom_corner.y:
             return
 
-        self.stdscr.addstr(left_top_corner.y, left_top_corner.x, "+")
-        self.stdscr.addstr(left_top_corner.y, right_bottom_corner.x, "+")
-        self.stdscr.addstr(right_bottom_corner.y, left_top_corner.x, "+")
-        self.stdscr.addstr(right_bottom_corner.y, right_bottom_corner.x, "+")
+        self.canvas.addstr(left_top_corner.y, left_top_corner.x, "+")
+        self.canvas.addstr(left_top_corner.y, right_bottom_corner.x, "+")
+        self.canvas.addstr(right_bottom_corner.y, left_top_corner.x, "+")
+        self.canvas.addstr(right_bottom_corner.y, right_bottom_corner.x, "+")
 
         if symbol == None:
             draw_with = "-"
@@ -431,8 +481,8 @@ class Renderer:
             draw_with = symbol
 
         for x in range(left_top_corner.x+1, right_bottom_corner.x):
-            self.stdscr.addstr(left_top_corner.y, x, draw_with)
-            self.stdscr.addstr(right_bottom_corner.y, x, draw_with)
+            self.canvas.addstr(left_top_corner.y, x, draw_with)
+            self.canvas.addstr(right_bottom_corner.y, x, draw_with)
 
         if symbol == None:
             draw_with = "|"
@@ -440,8 +490,8 @@ class Renderer:
             draw_with = symbol
 
         for y in range(left_top_corner.y+1, right_bottom_corner.y):
-            self.stdscr.addstr(y, left_top_corner.x, draw_with)
-            self.stdscr.addstr(y, right_bottom_corner.x, draw_with)
+            self.canvas.addstr(y, left_top_corner.x, draw_with)
+            self.canvas.addstr(y, right_bottom_corner.x, draw_with)
 
     @draw_call
     def show_endscreen(self, match_score: int, accumulated_score: int):
@@ -482,7 +532,7 @@ class Renderer:
         text_length = len(text)
         start_vector = Vector2(text_center.y, text_center.x-(text_length//2))
 
-        self.stdscr.addstr(start_vector.x, start_vector.y, text)
+        self.canvas.addstr(start_vector.x, start_vector.y, text)
 
     def get_square_middle(self, top_left_corner: Vector2, bottom_right_corner: Vector2):
         middle = Vector2((top_left_corner.x+bottom_right_corner.x) //
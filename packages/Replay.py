@@ -0,0 +1,158 @@
+from packages.Board import Board, BoardEngines, CollapseModes
+from packages.Player import Player
+from packages.Command import Command
+from dataclasses import dataclass, field
+from typing import Iterator, get_args
+import struct
+
+# magic, version, seed, width, height, starting level, collapse mode, score multiplier
+REPLAY_HEADER = struct.Struct("<4sBQHHHBd")
+REPLAY_MAGIC = b"FLRP"
+REPLAY_VERSION = 1
+
+# only the commands that reach Board.movement are recorded, code 0 marks the end of the stream
+REPLAY_COMMANDS: tuple[Command, ...] = (
+    None, "LEFT", "RIGHT", "TRIGGER_POWERUP", "CLOCKWISE_ROTATION", "COUNTERWISE_ROTATION", "HARD_DROP")
+COMMAND_CODES: dict[Command, int] = {command: code for code, command in enumerate(REPLAY_COMMANDS)}
+COMMAND_BITS = 3
+COMMAND_MASK = (1 << COMMAND_BITS) - 1
+# followed by a varint with the score the client had at that point of the stream
+CHECKPOINT_CODE = 7
+COLLAPSE_MODES: tuple[CollapseModes, ...] = get_args(CollapseModes)
+
+
+def write_varint(buffer: bytearray, value: int):
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data: bytes | memoryview, position: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def encode_event(buffer: bytearray, tick_delta: int, command: Command):
+    # the tick delta and the command share one varint, most events fit in a single byte
+    write_varint(buffer, tick_delta << COMMAND_BITS | COMMAND_CODES[command])
+
+
+def encode_checkpoint(buffer: bytearray, tick_delta: int, score: int):
+    write_varint(buffer, tick_delta << COMMAND_BITS | CHECKPOINT_CODE)
+    write_varint(buffer, score)
+
+
+@dataclass
+class Replay:
+    '''
+    A recorded match: the board settings plus every command that reached
+    Board.movement, stamped with the number of physics_logic calls before it.
+
+    Checkpoints are (events before it, tick, score) triples with the score the
+    recording client had at that point, used to verify the match.
+    '''
+    seed: int
+    width: int
+    height: int
+    level: int = 1
+    collapse_mode: CollapseModes = "ANIMATED"
+    score_multiplier: float = 1.0
+    events: list[tuple[int, Command]] = field(default_factory=list)
+    checkpoints: list[tuple[int, int, int]] = field(default_factory=list)
+    final_tick: int = 0
+    final_score: int = 0
+
+    def header(self) -> bytes:
+        return REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.width, self.height,
+                                  self.level, COLLAPSE_MODES.index(self.collapse_mode), self.score_multiplier)
+
+    def new_board(self, engine: BoardEngines = "BITBOARD") -> Board:
+        player = Player(persistent=False, score_multiplier=self.score_multiplier)
+        return Board(self.width, self.height, player, self.level, engine=engine,
+                     collapse_mode=self.collapse_mode, seed=self.seed)
+
+    def play(self, engine: BoardEngines = "BITBOARD") -> Board:
+        ''' re-simulates the whole match as fast as possible and returns the final board '''
+        board = self.new_board(engine)
+
+        for tick, command in self.events:
+            while board.physics_ticks < tick:
+                board.physics_logic()
+            board.movement(command)
+
+        while board.physics_ticks < self.final_tick:
+            board.physics_logic()
+
+        return board
+
+    def stream(self) -> Iterator[tuple[int, Command, int | None]]:
+        ''' events and checkpoints in recording order, checkpoints come as (tick, None, score) '''
+        checkpoints = iter(self.checkpoints)
+        checkpoint = next(checkpoints, None)
+
+        for index, (tick, command) in enumerate(self.events):
+            while checkpoint != None and checkpoint[0] <= index:
+                yield checkpoint[1], None, checkpoint[2]
+                checkpoint = next(checkpoints, None)
+            yield tick, command, None
+
+        while checkpoint != None:
+            yield checkpoint[1], None, checkpoint[2]
+            checkpoint = next(checkpoints, None)
+
+    def to_bytes(self) -> bytes:
+        buffer = bytearray(self.header())
+        last_tick = 0
+        for tick, command, score in self.stream():
+            if score == None:
+                encode_event(buffer, tick - last_tick, command)
+            else:
+                encode_checkpoint(buffer, tick - last_tick, score)
+            last_tick = tick
+        encode_event(buffer, self.final_tick - last_tick, None)
+        write_varint(buffer, self.final_score)
+        return bytes(buffer)
+
+    def save(self, path: str):
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @staticmethod
+    def from_bytes(data: bytes | memoryview) -> 'Replay':
+        magic, version, seed, width, height, level, collapse_mode, score_multiplier = \
+            REPLAY_HEADER.unpack_from(data, 0)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("not a Fallock replay")
+
+        replay = Replay(seed, width, height, level, COLLAPSE_MODES[collapse_mode], score_multiplier)
+        position = REPLAY_HEADER.size
+        tick = 0
+        while True:
+            value, position = read_varint(data, position)
+            tick += value >> COMMAND_BITS
+            if value & COMMAND_MASK == CHECKPOINT_CODE:
+                score, position = read_varint(data, position)
+                replay.checkpoints.append((len(replay.events), tick, score))
+                continue
+
+            command = REPLAY_COMMANDS[value & COMMAND_MASK]
+            if command == None:
+                break
+            replay.events.append((tick, command))
+
+        replay.final_tick = tick
+        replay.final_score, _ = read_varint(data, position)
+        return replay
+
+    @staticmethod
+    def load(path: str) -> 'Replay':
+        with open(path, "rb") as file:
+            return Replay.from_bytes(file.read())
@@ -0,0 +1,168 @@
+from packages.Replay import Replay, REPLAY_HEADER, REPLAY_VERSION, REPLAY_COMMANDS, COMMAND_BITS, \
+    COMMAND_MASK, COLLAPSE_MODES, encode_event, write_varint, read_varint
+from packages.Keyframe import encode_keyframe, restore_keyframe
+from packages.Board import Board, BoardEngines
+from packages.Command import Command
+from typing import BinaryIO, Iterator
+import struct
+import mmap
+
+ARCHIVE_MAGIC = b"FLRA"
+ARCHIVE_INDEX_MAGIC = b"FLRI"
+# tick, keyframe offset, keyframe length, offset of the next event, tick of the event before it
+ARCHIVE_INDEX_ENTRY = struct.Struct("<QQIQQ")
+# events offset, index offset, index entries, magic
+ARCHIVE_FOOTER = struct.Struct("<QQQ4s")
+
+
+class ReplayArchive:
+    '''
+    Replay container with a full keyframe every `interval` physics ticks.
+
+    Layout: header, the replay event stream, the keyframes, an index of fixed
+    size entries sorted by tick and a footer pointing at the index. The file is
+    read through mmap, seeking decodes one keyframe and simulates at most one
+    interval of ticks from it.
+    '''
+    path: str
+    replay: Replay
+    events_offset: int
+    index_offset: int
+    index_count: int
+    _file: BinaryIO
+    _data: mmap.mmap
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, seed, width, height, level, collapse_mode, score_multiplier = \
+            REPLAY_HEADER.unpack_from(self._data, 0)
+        self.events_offset, self.index_offset, self.index_count, index_magic = \
+            ARCHIVE_FOOTER.unpack_from(self._data, len(self._data) - ARCHIVE_FOOTER.size)
+
+        if magic != ARCHIVE_MAGIC or version != REPLAY_VERSION or index_magic != ARCHIVE_INDEX_MAGIC:
+            self.close()
+            raise ValueError("not a Fallock replay archive")
+
+        # the event list stays in the file, only the settings are decoded up front
+        self.replay = Replay(seed, width, height, level, COLLAPSE_MODES[collapse_mode], score_multiplier)
+        self.replay.final_tick, self.replay.final_score = self.final_state()
+
+    def __enter__(self) -> 'ReplayArchive':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def index_entry(self, index: int) -> tuple[int, int, int, int, int]:
+        return ARCHIVE_INDEX_ENTRY.unpack_from(self._data, self.index_offset + index * ARCHIVE_INDEX_ENTRY.size)
+
+    def keyframe_ticks(self) -> list[int]:
+        return [self.index_entry(index)[0] for index in range(self.index_count)]
+
+    def events(self, offset: int, tick: int) -> Iterator[tuple[int, Command]]:
+        ''' decodes the event stream from a byte offset, `tick` is the tick of the event before it '''
+        position = offset
+        while True:
+            value, position = read_varint(self._data, position)
+            tick += value >> COMMAND_BITS
+            command = REPLAY_COMMANDS[value & COMMAND_MASK]
+            if command == None:
+                return
+            yield tick, command
+
+    def final_state(self) -> tuple[int, int]:
+        _, _, _, event_offset, event_tick = self.index_entry(self.index_count - 1)
+        position = event_offset
+        tick = event_tick
+        while True:
+            value, position = read_varint(self._data, position)
+            tick += value >> COMMAND_BITS
+            if value & COMMAND_MASK == 0:
+                score, _ = read_varint(self._data, position)
+                return tick, score
+
+    def find_keyframe(self, tick: int) -> int:
+        # binary search straight over the mapped index, the last keyframe at or before tick
+        low, high = 0, self.index_count - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.index_entry(middle)[0] <= tick:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def seek(self, tick: int, engine: BoardEngines = "BITBOARD") -> Board:
+        ''' returns the board after `tick` physics ticks and every command stamped up to it '''
+        tick = max(0, min(tick, self.replay.final_tick))
+        keyframe_tick, keyframe_offset, keyframe_length, event_offset, event_tick = \
+            self.index_entry(self.find_keyframe(tick))
+
+        board = self.replay.new_board(engine)
+        restore_keyframe(board, memoryview(self._data)[keyframe_offset:keyframe_offset + keyframe_length])
+
+        for event_tick, command in self.events(event_offset, event_tick):
+            if event_tick > tick:
+                break
+            while board.physics_ticks < event_tick:
+                board.physics_logic()
+            board.movement(command)
+
+        while board.physics_ticks < tick:
+            board.physics_logic()
+        return board
+
+    @staticmethod
+    def write(replay: Replay, path: str, interval: int = 1024, engine: BoardEngines = "BITBOARD"):
+        ''' simulates the replay once and stores it with a keyframe every `interval` ticks, without checkpoints '''
+        header = bytearray(replay.header())
+        header[:4] = ARCHIVE_MAGIC
+
+        events = bytearray()
+        event_offsets: list[int] = []
+        last_tick = 0
+        for event_tick, command in replay.events:
+            event_offsets.append(len(events))
+            encode_event(events, event_tick - last_tick, command)
+            last_tick = event_tick
+        event_offsets.append(len(events))
+        encode_event(events, replay.final_tick - last_tick, None)
+        write_varint(events, replay.final_score)
+
+        events_offset = len(header)
+        keyframes = bytearray()
+        index = bytearray()
+        keyframes_offset = events_offset + len(events)
+
+        board = replay.new_board(engine)
+        next_event = 0
+        for tick in range(replay.final_tick + 1):
+            while next_event < len(replay.events) and replay.events[next_event][0] == tick:
+                board.movement(replay.events[next_event][1])
+                next_event += 1
+
+            if tick % interval == 0:
+                keyframe = encode_keyframe(board)
+                previous_tick = replay.events[next_event - 1][0] if next_event > 0 else 0
+                index += ARCHIVE_INDEX_ENTRY.pack(tick, keyframes_offset + len(keyframes), len(keyframe),
+                                                  events_offset + event_offsets[next_event], previous_tick)
+                keyframes += keyframe
+
+            if tick < replay.final_tick:
+                board.physics_logic()
+
+        index_offset = keyframes_offset + len(keyframes)
+        with open(path, "wb") as file:
+            file.write(header)
+            file.write(events)
+            file.write(keyframes)
+            file.write(index)
+            file.write(ARCHIVE_FOOTER.pack(events_offset, index_offset,
+                                           len(index) // ARCHIVE_INDEX_ENTRY.size, ARCHIVE_INDEX_MAGIC))
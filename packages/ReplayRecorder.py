@@ -0,0 +1,92 @@
+from packages.Replay import Replay, COMMAND_CODES, encode_event, encode_checkpoint, write_varint
+from packages.Board import Board
+from packages.Command import Command
+import threading
+import queue
+import os
+
+REPLAY_DIRECTORY = "./data/replays/"
+
+
+class ReplayRecorder:
+    '''
+    Streams the commands of a live match into a replay file.
+
+    `record` only appends a few bytes to an in-memory buffer. Full buffers are
+    handed to a writer thread, so the frame loop never waits on the disk.
+    '''
+    path: str
+    buffer: bytearray
+    flush_size: int
+    last_tick: int
+    last_score: int
+    closed: bool
+    _chunks: 'queue.SimpleQueue[bytes | None]'
+    _writer: threading.Thread
+
+    def __init__(self, path: str, replay: Replay, flush_size: int = 4096):
+        self.path = path
+        self.buffer = bytearray(replay.header())
+        self.flush_size = flush_size
+        self.last_tick = 0
+        self.last_score = 0
+        self.closed = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._chunks = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self.write_chunks, daemon=True)
+        self._writer.start()
+
+    @staticmethod
+    def for_board(board: Board, path: str | None = None) -> 'ReplayRecorder':
+        if path == None:
+            path = os.path.join(REPLAY_DIRECTORY, f"{board.seed}.flrp")
+        replay = Replay(board.seed, board.width, board.height, board.level,
+                        board.collapse_mode, board.player_manager.score_multiplier)
+        return ReplayRecorder(path, replay)
+
+    def record(self, tick: int, command: Command):
+        if command not in COMMAND_CODES or command == None:
+            return
+
+        encode_event(self.buffer, tick - self.last_tick, command)
+        self.last_tick = tick
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+
+    def checkpoint(self, tick: int, score: int):
+        # only score changes are written, a few per line clear
+        if score == self.last_score:
+            return
+
+        encode_checkpoint(self.buffer, tick - self.last_tick, score)
+        self.last_tick = tick
+        self.last_score = score
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        self._chunks.put(bytes(self.buffer))
+        self.buffer.clear()
+
+    def close(self, final_tick: int, final_score: int):
+        if self.closed:
+            return
+        self.closed = True
+
+        encode_event(self.buffer, final_tick - self.last_tick, None)
+        write_varint(self.buffer, final_score)
+        self.flush()
+        self._chunks.put(None)
+        self._writer.join()
+
+    def write_chunks(self):
+        with open(self.path, "wb") as file:
+            while True:
+                chunk = self._chunks.get()
+                if chunk == None:
+                    return
+                file.write(chunk)
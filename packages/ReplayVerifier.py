@@ -0,0 +1,129 @@
+from packages.Replay import Replay
+from packages.Board import BoardEngines
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Literal, TypeAlias
+import functools
+import struct
+import time
+import os
+
+# CHECKPOINT: a recorded score differs from the simulation at that point of the stream
+# SCORE_EXCEEDED: the simulation already scored more than the claimed final score
+# FINAL_SCORE: the simulated match ended with a different score
+# CORRUPT: the file could not be decoded
+DivergenceReasons: TypeAlias = Literal["CHECKPOINT", "SCORE_EXCEEDED", "FINAL_SCORE", "CORRUPT"]
+
+REPLAY_EXTENSION = ".flrp"
+
+
+@dataclass
+class VerificationResult:
+    path: str
+    claimed_score: int
+    simulated_score: int
+    matches: bool
+    divergence_tick: int | None = None
+    divergence_reason: DivergenceReasons | None = None
+    simulated_ticks: int = 0
+
+
+@dataclass
+class VerificationReport:
+    results: list[VerificationResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def replays_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def rejected(self) -> list[VerificationResult]:
+        return [result for result in self.results if not result.matches]
+
+
+def verify_replay(path: str, stop_early: bool = True, engine: BoardEngines = "BITBOARD") -> VerificationResult:
+    '''
+    Re-simulates a replay and checks the recorded scores against the simulation.
+
+    Scores never go down, so once the simulation passes the claimed final score
+    or disagrees with a checkpoint the match has diverged for good and, with
+    `stop_early`, the rest of the replay is skipped.
+    '''
+    try:
+        replay = Replay.load(path)
+    except (ValueError, IndexError, struct.error):
+        return VerificationResult(path, 0, 0, False, 0, "CORRUPT")
+
+    board = replay.new_board(engine)
+    player = board.player_manager
+    divergence: tuple[int, DivergenceReasons] | None = None
+
+    def diverged(tick: int, reason: DivergenceReasons) -> bool:
+        ''' keeps the first divergence, returns whether to stop simulating '''
+        nonlocal divergence
+        if divergence == None:
+            divergence = (tick, reason)
+        return stop_early
+
+    def advance(tick: int) -> bool:
+        while board.physics_ticks < tick:
+            board.physics_logic()
+            if player.score > replay.final_score and diverged(board.physics_ticks, "SCORE_EXCEEDED"):
+                return True
+        return False
+
+    stopped = False
+    for tick, command, recorded_score in replay.stream():
+        stopped = advance(tick)
+        if stopped:
+            break
+
+        if recorded_score == None:
+            board.movement(command)
+        elif player.score != recorded_score:
+            stopped = diverged(tick, "CHECKPOINT")
+            if stopped:
+                break
+
+    if not stopped:
+        advance(replay.final_tick)
+    if divergence == None and player.score != replay.final_score:
+        divergence = (board.physics_ticks, "FINAL_SCORE")
+
+    tick, reason = divergence if divergence != None else (None, None)
+    return VerificationResult(path, replay.final_score, player.score, divergence == None,
+                              tick, reason, board.physics_ticks)
+
+
+class ReplayVerifier:
+    '''
+    Verifies every replay of a directory over a process pool, without rendering.
+    '''
+    workers: int
+    stop_early: bool
+    engine: BoardEngines
+
+    def __init__(self, workers: int | None = None, stop_early: bool = True, engine: BoardEngines = "BITBOARD"):
+        self.workers = (os.cpu_count() or 1) if workers == None else workers
+        self.stop_early = stop_early
+        self.engine = engine
+
+    def verify(self, paths: list[str]) -> VerificationReport:
+        start = time.perf_counter()
+        verify = functools.partial(verify_replay, stop_early=self.stop_early, engine=self.engine)
+
+        if self.workers <= 1 or len(paths) <= 1:
+            results = [verify(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(self.workers) as executor:
+                # a few replays per task keeps the pickling overhead low on short matches
+                chunk_size = max(1, len(paths) // (self.workers * 4))
+                results = list(executor.map(verify, paths, chunksize=chunk_size))
+
+        return VerificationReport(results, time.perf_counter() - start)
+
+    def verify_directory(self, directory: str) -> VerificationReport:
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                       if name.endswith(REPLAY_EXTENSION))
+        return self.verify(paths)
@@ -0,0 +1,61 @@
+from typing import Callable
+import time
+
+
+class Scheduler:
+    '''
+    Fixed timestep clock of the game loop, on the monotonic clock.
+
+    Logic runs in whole ticks of 1/tickrate drawn from an accumulator, so the
+    simulation speed never depends on how often the loop wakes up. Frames have
+    their own deadline and `timeout_ns` tells how long the loop may sleep
+    before the next tick or frame is due.
+    '''
+    tick_ns: int
+    frame_ns: int
+    max_ticks: int
+    clock: Callable[[], int]
+    accumulator: int
+    last_time: int
+    next_frame: int
+
+    def __init__(self, tickrate: float, framerate: float, max_ticks: int = 8, clock: Callable[[], int] = time.monotonic_ns):
+        self.tick_ns = round(10**9 / tickrate)
+        self.frame_ns = round(10**9 / framerate)
+        # ticks run at most per wake up, the rest of a long stall is dropped
+        self.max_ticks = max_ticks
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        now = self.clock()
+        self.accumulator = 0
+        self.last_time = now
+        self.next_frame = now
+
+    def due_ticks(self) -> int:
+        now = self.clock()
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        ticks = min(self.accumulator // self.tick_ns, self.max_ticks)
+        self.accumulator -= ticks * self.tick_ns
+        if ticks == self.max_ticks:
+            self.accumulator = min(self.accumulator, self.tick_ns - 1)
+        return ticks
+
+    def frame_due(self) -> bool:
+        now = self.clock()
+        if now < self.next_frame:
+            return False
+
+        self.next_frame += self.frame_ns
+        if self.next_frame <= now:
+            # late frames are skipped, never drawn in a burst
+            self.next_frame = now + self.frame_ns
+        return True
+
+    def timeout_ns(self) -> int:
+        now = self.clock()
+        next_tick = self.last_time + self.tick_ns - self.accumulator
+        return max(0, min(next_tick, self.next_frame) - now)
@@ -0,0 +1,126 @@
+from packages.Board import Board, BoardEngines, CollapseModes, GridStorages
+from packages.Player import Player
+from packages.Command import Command
+from packages.Difficulty import difficulty
+from packages.HeadlessEnvironment import MOVEMENT_COMMANDS
+from dataclasses import dataclass
+from typing import Callable
+import asyncio
+
+
+@dataclass
+class SessionResult:
+    seed: int
+    score: int
+    lines: int
+    physics_ticks: int
+    level: int
+    game_over: bool
+    # what the session raised, its result is then the state it stopped in
+    error: str | None = None
+
+
+class Session:
+    '''
+    One match hosted on an asyncio event loop.
+
+    Input, logic and rendering are separate coroutines. The logic sleeps until
+    the next physics step is due, `difficulty(level)` ticks after the last one
+    (`animation_ticks` while a collapse animates), so an idle session costs
+    nothing between its steps and hundreds of them can share one loop.
+    Commands sent with `send` are applied as soon as the loop gets to them.
+    The three run together, the first one to raise stops the session with it.
+    '''
+    board: Board
+    player_manager: Player
+    tickrate: float
+    framerate: float
+    animation_ticks: int
+    difficulty_curve: Callable[[int], int]
+    render: Callable[[Board], None] | None
+    commands: 'asyncio.Queue[Command]'
+    changed: asyncio.Event
+    max_lateness: float
+
+    def __init__(self, width: int = 12, height: int = 20, seed: int | None = None, engine: BoardEngines = "BITBOARD",
+                 collapse_mode: CollapseModes = "ANIMATED", storage: GridStorages = "LIST",
+                 difficulty_curve: Callable[[int], int] = difficulty, render: Callable[[Board], None] | None = None,
+                 tickrate: float = 128, framerate: float = 30, animation_ticks: int = 2, score_multiplier: float = 1.0):
+        self.player_manager = Player(persistent=False, score_multiplier=score_multiplier)
+        self.board = Board(width, height, self.player_manager, engine=engine,
+                           collapse_mode=collapse_mode, storage=storage, seed=seed)
+        self.tickrate = tickrate
+        self.framerate = framerate
+        self.animation_ticks = animation_ticks
+        self.difficulty_curve = difficulty_curve
+        # called with the board at most `framerate` times a second, only after a change
+        self.render = render
+        self.commands = asyncio.Queue()
+        self.changed = asyncio.Event()
+        # worst delay of a physics step past its deadline, in seconds
+        self.max_lateness = 0.0
+
+    def send(self, command: Command):
+        ''' queues a command, only from the thread running the event loop '''
+        self.commands.put_nowait(command)
+
+    def result(self) -> SessionResult:
+        board = self.board
+        return SessionResult(board.seed, self.player_manager.score, board.lines_cleared,
+                             board.physics_ticks, board.level, board.game_over)
+
+    async def run(self) -> SessionResult:
+        tasks = [asyncio.create_task(self.logic_loop()), asyncio.create_task(self.input_loop())]
+        if self.render != None:
+            tasks.append(asyncio.create_task(self.render_loop()))
+
+        # only the logic ends by itself, any other loop finishing first has raised
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for task in done:
+            error = task.exception()
+            if error != None:
+                raise error
+
+        if self.render != None:
+            self.render(self.board)
+        return self.result()
+
+    async def logic_loop(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+
+        while not self.board.game_over:
+            ticks = self.animation_ticks if self.board.is_animating else self.difficulty_curve(self.board.level)
+            # deadlines follow each other so sleeping late never drifts the match
+            deadline += ticks / self.tickrate
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+
+            lateness = loop.time() - deadline
+            self.max_lateness = max(self.max_lateness, lateness)
+            if lateness > ticks / self.tickrate:
+                # too far behind to catch up, start over from now
+                deadline = loop.time()
+
+            self.board.physics_logic()
+            self.changed.set()
+
+    async def input_loop(self):
+        while True:
+            command = await self.commands.get()
+            if command in MOVEMENT_COMMANDS and not self.board.game_over:
+                self.board.movement(command)
+                self.changed.set()
+
+    async def render_loop(self):
+        assert self.render != None
+        while True:
+            await self.changed.wait()
+            self.changed.clear()
+            self.render(self.board)
+            await asyncio.sleep(1 / self.framerate)
@@ -0,0 +1,79 @@
+from packages.Session import Session, SessionResult
+from packages.Command import Command
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRuntime:
+    '''
+    Hosts many sessions on the running asyncio event loop.
+
+    Every session gets an id and its own task, finished sessions leave the
+    runtime by themselves and their results are kept by id. A session that
+    raised is logged and keeps the state it stopped in, with the error.
+    '''
+    sessions: dict[int, Session]
+    tasks: dict[int, 'asyncio.Task[SessionResult]']
+    results: dict[int, SessionResult]
+    next_id: int
+
+    def __init__(self):
+        self.sessions = {}
+        self.tasks = {}
+        self.results = {}
+        self.next_id = 0
+
+    def start(self, session: Session) -> int:
+        session_id = self.next_id
+        self.next_id += 1
+
+        task = asyncio.get_running_loop().create_task(session.run())
+        self.sessions[session_id] = session
+        self.tasks[session_id] = task
+        task.add_done_callback(lambda task: self.finish(session_id, task))
+        return session_id
+
+    def finish(self, session_id: int, task: 'asyncio.Task[SessionResult]'):
+        session = self.sessions.pop(session_id)
+        del self.tasks[session_id]
+        # a stopped session keeps the state it had
+        if task.cancelled():
+            self.results[session_id] = session.result()
+            return
+
+        error = task.exception()
+        if error != None:
+            logger.error("session %d failed", session_id, exc_info=error)
+            result = session.result()
+            result.error = f"{type(error).__name__}: {error}"
+            self.results[session_id] = result
+            return
+
+        self.results[session_id] = task.result()
+
+    def send(self, session_id: int, command: Command):
+        session = self.sessions.get(session_id)
+        if session != None:
+            session.send(command)
+
+    def stop(self, session_id: int):
+        task = self.tasks.get(session_id)
+        if task != None:
+            task.cancel()
+
+    async def stop_all(self):
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def join(self):
+        ''' waits until every session started so far has finished '''
+        while self.tasks:
+            await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+    @property
+    def max_lateness(self) -> float:
+        return max((session.max_lateness for session in self.sessions.values()), default=0.0)
@@ -0,0 +1,251 @@
+from packages.HeadlessEnvironment import HeadlessEnvironment
+from packages.Board import Board, BoardEngines, CollapseModes
+from packages.Piece import Piece
+from packages.Command import Command
+from packages.Difficulty import difficulty
+from packages.AutoPlayer import AutoPlayer
+from dataclasses import dataclass, asdict, fields
+from typing import Any, Callable, Iterator, Literal, TypeAlias
+import multiprocessing
+import queue as queues
+import traceback
+import statistics
+import random
+import json
+import csv
+import os
+
+# RANDOM_PLACEMENT steers every piece to a random column and rotation
+# AUTOPLAYER plays the beam search of the AutoPlayer without a time budget
+FarmPolicies: TypeAlias = Literal["RANDOM_PLACEMENT", "AUTOPLAYER"]
+OutputFormats: TypeAlias = Literal["CSV", "JSONL"]
+
+STATISTIC_FIELDS = ("score", "lines", "pieces", "ticks", "level")
+
+
+@dataclass(frozen=True)
+class MatchConfig:
+    width: int = 12
+    height: int = 20
+    # any picklable callable, a top level function or a functools.partial of one
+    difficulty_curve: Callable[[int], int] = difficulty
+    score_multiplier: float = 1.0
+    engine: BoardEngines = "BITBOARD"
+    collapse_mode: CollapseModes = "INSTANT"
+    policy: FarmPolicies = "RANDOM_PLACEMENT"
+    max_ticks: int = 200_000
+
+    def label(self) -> str:
+        ''' every field that changes the matches, the farm needs it unique per config '''
+        curve = getattr(self.difficulty_curve, "__name__", None) or repr(self.difficulty_curve)
+        return (f"{self.width}x{self.height} x{self.score_multiplier:g} {curve} {self.engine} "
+                f"{self.collapse_mode} {self.policy} {self.max_ticks}t")
+
+
+@dataclass
+class MatchResult:
+    job: int
+    config: int
+    seed: int
+    score: int
+    lines: int
+    pieces: int
+    ticks: int
+    level: int
+    game_over: bool
+
+
+@dataclass
+class WorkerFailure:
+    ''' sent back instead of a result when a match raised, the traceback as text always pickles '''
+    job: int
+    error: str
+
+
+@dataclass
+class FieldSummary:
+    mean: float
+    stdev: float
+    minimum: float
+    median: float
+    maximum: float
+
+
+class RandomPlacementPolicy:
+    '''
+    Picks a random column and rotation for every new piece and steers it there,
+    then lets gravity, a hard drop or a power up finish the placement.
+    '''
+    random: random.Random
+    piece: Piece | None
+    target_x: int
+    rotations: int
+
+    def __init__(self, seed: int):
+        self.random = random.Random(seed)
+        self.piece = None
+        self.target_x = 0
+        self.rotations = 0
+
+    def command(self, board: Board) -> Command:
+        piece = board.player_piece
+        if piece is not self.piece:
+            self.piece = piece
+            self.target_x = self.random.randrange(board.width)
+            self.rotations = self.random.randrange(4)
+
+        if self.rotations:
+            self.rotations -= 1
+            return "CLOCKWISE_ROTATION"
+        if piece.origin.x < self.target_x:
+            return "RIGHT"
+        if piece.origin.x > self.target_x:
+            return "LEFT"
+        return self.random.choice(["HARD_DROP", "TRIGGER_POWERUP", None, None])
+
+
+def play_match(job: int, config_index: int, config: MatchConfig, seed: int) -> MatchResult:
+    env = HeadlessEnvironment(config.width, config.height, engine=config.engine,
+                              collapse_mode=config.collapse_mode,
+                              difficulty_curve=config.difficulty_curve,
+                              score_multiplier=config.score_multiplier)
+    env.reset(seed)
+    # the policy rolls from its own stream, the board seed alone fixes the pieces
+    policy = RandomPlacementPolicy(seed) if config.policy == "RANDOM_PLACEMENT" else AutoPlayer(budget_ms=None)
+
+    while not env.board.game_over and env.tick < config.max_ticks:
+        env.step(policy.command(env.board))
+
+    board = env.board
+    return MatchResult(job, config_index, seed, env.player_manager.score, board.lines_cleared,
+                       board.pieces_placed, env.tick, board.level, board.game_over)
+
+
+def run_worker(jobs: list[tuple[int, int, MatchConfig, int]], results: Any):
+    try:
+        for job in jobs:
+            try:
+                results.put(play_match(*job))
+            except Exception:
+                results.put(WorkerFailure(job[0], traceback.format_exc()))
+                return
+    finally:
+        # one sentinel per worker, the collector counts them to know when to stop
+        results.put(None)
+
+
+class SimulationFarm:
+    '''
+    Plays seeded headless matches over a pool of worker processes.
+
+    Every (config, match) pair gets a seed drawn from the master seed, so a run
+    is reproducible no matter how many workers share it. Results stream back
+    through a bounded queue and are written as they arrive.
+    '''
+    configs: list[MatchConfig]
+    matches_per_config: int
+    master_seed: int
+    workers: int
+    queue_size: int
+
+    def __init__(self, configs: list[MatchConfig], matches_per_config: int, master_seed: int = 0,
+                 workers: int | None = None, queue_size: int = 256):
+        labels = [config.label() for config in configs]
+        duplicates = sorted({label for label in labels if labels.count(label) > 1})
+        if duplicates:
+            # results and summaries are told apart by label
+            raise ValueError(f"configs with the same label: {', '.join(duplicates)}")
+
+        self.configs = configs
+        self.matches_per_config = matches_per_config
+        self.master_seed = master_seed
+        self.workers = (os.cpu_count() or 1) if workers == None else workers
+        self.queue_size = queue_size
+
+    def jobs(self) -> list[tuple[int, int, MatchConfig, int]]:
+        seeds = random.Random(self.master_seed)
+        jobs: list[tuple[int, int, MatchConfig, int]] = []
+        for config_index, config in enumerate(self.configs):
+            for _ in range(self.matches_per_config):
+                jobs.append((len(jobs), config_index, config, seeds.getrandbits(63)))
+        return jobs
+
+    def results(self) -> Iterator[MatchResult]:
+        jobs = self.jobs()
+        workers = max(1, min(self.workers, len(jobs)))
+
+        if workers == 1:
+            for job in jobs:
+                yield play_match(*job)
+            return
+
+        context = multiprocessing.get_context()
+        queue = context.Queue(maxsize=self.queue_size)
+        # strided slices keep the configs spread evenly over the workers
+        processes = [context.Process(target=run_worker, args=(jobs[worker::workers], queue), daemon=True)
+                     for worker in range(workers)]
+        for process in processes:
+            process.start()
+
+        try:
+            finished = 0
+            while finished < workers:
+                try:
+                    result: MatchResult | WorkerFailure | None = queue.get(timeout=1.0)
+                except queues.Empty:
+                    # a worker killed before its sentinel would leave the loop waiting forever
+                    for process in processes:
+                        if process.exitcode not in (None, 0):
+                            raise RuntimeError(f"farm worker exited with code {process.exitcode}")
+                    continue
+
+                if result == None:
+                    finished += 1
+                    continue
+                if isinstance(result, WorkerFailure):
+                    raise RuntimeError(f"match {result.job} failed in a farm worker:\n{result.error}")
+                yield result
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+    def run(self, output_path: str | None = None) -> dict[str, dict[str, FieldSummary]]:
+        collected: list[MatchResult] = []
+
+        if output_path == None:
+            collected.extend(self.results())
+        else:
+            output_format: OutputFormats = "JSONL" if output_path.endswith(".jsonl") else "CSV"
+            with open(output_path, "w", newline="") as file:
+                writer = None
+                if output_format == "CSV":
+                    writer = csv.writer(file)
+                    writer.writerow(["label"] + [field.name for field in fields(MatchResult)])
+
+                for result in self.results():
+                    collected.append(result)
+                    label = self.configs[result.config].label()
+                    if writer != None:
+                        writer.writerow([label] + list(asdict(result).values()))
+                    else:
+                        file.write(json.dumps({"label": label} | asdict(result)) + "\n")
+
+        return self.summarize(collected)
+
+    def summarize(self, results: list[MatchResult]) -> dict[str, dict[str, FieldSummary]]:
+        summaries: dict[str, dict[str, FieldSummary]] = {}
+        for config_index, config in enumerate(self.configs):
+            matches = [result for result in results if result.config == config_index]
+            if not matches:
+                continue
+
+            summary: dict[str, FieldSummary] = {}
+            for name in STATISTIC_FIELDS:
+                values = [getattr(result, name) for result in matches]
+                summary[name] = FieldSummary(statistics.fmean(values),
+                                             statistics.pstdev(values),
+                                             min(values), statistics.median(values), max(values))
+            summaries[config.label()] = summary
+        return summaries
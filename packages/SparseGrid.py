@@ -0,0 +1,133 @@
+from packages.Block import Block
+from packages.GridColumn import CellWriter
+from typing import Any, Iterator
+
+
+class SparseColumn:
+    '''
+    Column view over a SparseGrid, reads and writes like a GridColumn.
+    '''
+    grid: 'SparseGrid'
+    x: int
+
+    def __init__(self, grid: 'SparseGrid', x: int):
+        self.grid = grid
+        self.x = x
+
+    def __len__(self) -> int:
+        return self.grid.height
+
+    def __getitem__(self, y: int) -> Block | None:
+        grid = self.grid
+        if y < 0:
+            y += grid.height
+        if not 0 <= y < grid.height:
+            raise IndexError("column index out of range")
+
+        chunk = grid.chunks.get(y // grid.chunk_rows)
+        if chunk == None:
+            return None
+        return Block.palette[chunk[y % grid.chunk_rows * grid.width + self.x]]
+
+    def __setitem__(self, y: int, block: Block | None):
+        self.grid.on_write(self.x, y, block)
+
+    def __iter__(self) -> Iterator[Block | None]:
+        grid = self.grid
+        palette = Block.palette
+        for index in range(grid.chunk_count):
+            chunk = grid.chunks.get(index)
+            rows = min(grid.chunk_rows, grid.height - index * grid.chunk_rows)
+            if chunk == None:
+                for _ in range(rows):
+                    yield None
+            else:
+                for y in range(rows):
+                    yield palette[chunk[y * grid.width + self.x]]
+
+    def raw_set(self, y: int, block: Block | None):
+        self.grid.raw_set(self.x, y, block)
+
+
+class SparseGrid:
+    '''
+    Board grid that only stores the chunks of `chunk_rows` rows holding a block.
+
+    Every chunk is a row-major bytearray of Block palette ids, like a small
+    CompactGrid, and is dropped again as soon as its last block is cleared, so
+    memory follows the live blocks instead of the board area. Indexes like the
+    column-major list grid (`grid[x][y]`).
+    '''
+    width: int
+    height: int
+    chunk_rows: int
+    chunk_count: int
+    on_write: CellWriter
+    chunks: dict[int, bytearray]
+    chunk_blocks: dict[int, int]
+    columns: list[SparseColumn]
+
+    def __init__(self, width: int, height: int, on_write: CellWriter, chunk_rows: int = 16):
+        self.width = width
+        self.height = height
+        self.chunk_rows = chunk_rows
+        self.chunk_count = -(-height // chunk_rows)
+        self.on_write = on_write
+        self.chunks = {}
+        # filled cells of every stored chunk
+        self.chunk_blocks = {}
+        self.columns = [SparseColumn(self, x) for x in range(width)]
+
+    def __len__(self) -> int:
+        return self.width
+
+    def __getitem__(self, x: int) -> SparseColumn:
+        return self.columns[x]
+
+    def __iter__(self) -> Iterator[SparseColumn]:
+        return iter(self.columns)
+
+    def raw_set(self, x: int, y: int, block: Block | None):
+        index = y // self.chunk_rows
+        cell = y % self.chunk_rows * self.width + x
+        chunk = self.chunks.get(index)
+
+        if block == None:
+            if chunk == None or chunk[cell] == 0:
+                return
+            chunk[cell] = 0
+            self.chunk_blocks[index] -= 1
+            if self.chunk_blocks[index] == 0:
+                del self.chunks[index]
+                del self.chunk_blocks[index]
+            return
+
+        if chunk == None:
+            chunk = bytearray(self.chunk_rows * self.width)
+            self.chunks[index] = chunk
+            self.chunk_blocks[index] = 0
+        if chunk[cell] == 0:
+            self.chunk_blocks[index] += 1
+        chunk[cell] = Block.palette_id(block.symbol)
+
+    def frozen_chunks(self) -> dict[int, bytes]:
+        return {index: bytes(chunk) for index, chunk in self.chunks.items()}
+
+    def load_chunks(self, chunks: dict[int, bytes]):
+        self.chunks = {index: bytearray(chunk) for index, chunk in chunks.items()}
+        self.chunk_blocks = {index: len(chunk) - chunk.count(0) for index, chunk in chunks.items()}
+
+    def copy(self, on_write: CellWriter) -> 'SparseGrid':
+        grid = SparseGrid(self.width, self.height, on_write, self.chunk_rows)
+        grid.load_chunks(self.chunks)  # type: ignore
+        return grid
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the column views are rebuilt on load
+        state = self.__dict__.copy()
+        del state["columns"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self.columns = [SparseColumn(self, x) for x in range(self.width)]
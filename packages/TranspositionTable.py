@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+Value = TypeVar("Value")
+
+
+class TranspositionTable(Generic[Value]):
+    '''
+    Bounded memo of evaluations keyed by position hash, or any hashable key,
+    the least recently used entry is dropped once `capacity` entries are stored.
+    '''
+    capacity: int
+    entries: 'OrderedDict[Hashable, Value]'
+    hits: int
+    misses: int
+
+    def __init__(self, capacity: int = 1 << 16):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def get(self, key: Hashable) -> Value | None:
+        ''' None on a miss, a stored None is still a hit and `in` tells the two apart '''
+        if key not in self.entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key: Hashable, value: Value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,93 @@
+from packages.Piece import Piece, PIECE_CODES
+from packages.PowerUp import PowerUpNamesNSpecials, POWER_UP_CHOICES
+from typing import Sequence
+import functools
+import random
+
+# fixed so the same position hashes the same in every process and every run
+ZOBRIST_SEED = 0x5EED_F411_0C4B
+SPAWN_DEPTH = 8
+# coordinates below this have a key in a table, the others are hashed
+PIECE_RANGE = 64
+
+_keys = random.Random(ZOBRIST_SEED)
+
+
+def random_keys(count: int) -> tuple[int, ...]:
+    return tuple(_keys.getrandbits(64) for _ in range(count))
+
+
+# active piece: (type, rotation) and each coordinate are separate features
+PIECE_STATE_KEYS = random_keys(len(PIECE_CODES) * 4)
+PIECE_X_KEYS = random_keys(PIECE_RANGE)
+PIECE_Y_KEYS = random_keys(PIECE_RANGE)
+# upcoming piece of every spawnlist slot
+SPAWN_KEYS = random_keys(SPAWN_DEPTH * len(PIECE_CODES))
+POWER_UP_KEYS: dict[PowerUpNamesNSpecials, int] = dict(zip((None,) + POWER_UP_CHOICES, random_keys(3)))
+
+
+# boards with more cells than this hash their cell keys instead of keeping a table
+CELL_TABLE_LIMIT = 1 << 16
+MASK_64 = (1 << 64) - 1
+PIECE_X_SALT = random.Random(f"{ZOBRIST_SEED}:piece x").getrandbits(64)
+PIECE_Y_SALT = random.Random(f"{ZOBRIST_SEED}:piece y").getrandbits(64)
+
+
+def splitmix64(salt: int, index: int) -> int:
+    key = (salt + (index + 1) * 0x9E3779B97F4A7C15) & MASK_64
+    key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return key ^ (key >> 31)
+
+
+class HashedCellKeys:
+    '''
+    Cell keys of a large board computed on demand with splitmix64, so a sparse
+    mega board does not hold a key for every one of its cells.
+    '''
+    salt: int
+    length: int
+
+    def __init__(self, width: int, height: int):
+        self.salt = random.Random(f"{ZOBRIST_SEED}:{width}x{height}").getrandbits(64)
+        self.length = width * height
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.length:
+            raise IndexError("cell key index out of range")
+
+        return splitmix64(self.salt, index)
+
+
+@functools.cache
+def cell_keys(width: int, height: int) -> Sequence[int]:
+    ''' one key per cell, indexed x * height + y, the same for every board of that size '''
+    if width * height > CELL_TABLE_LIMIT:
+        return HashedCellKeys(width, height)
+
+    # own generator per size so the keys never depend on which sizes were asked first
+    keys = random.Random(f"{ZOBRIST_SEED}:{width}x{height}")
+    return tuple(keys.getrandbits(64) for _ in range(width * height))
+
+
+def coordinate_key(keys: tuple[int, ...], salt: int, value: int) -> int:
+    if 0 <= value < PIECE_RANGE:
+        return keys[value]
+    # every other coordinate of a wide or tall board, negative ones included, gets its own key
+    return splitmix64(salt, value & MASK_64)
+
+
+def piece_key(piece: Piece) -> int:
+    return (PIECE_STATE_KEYS[PIECE_CODES.index(piece.type) * 4 + piece.rotation]
+            ^ coordinate_key(PIECE_X_KEYS, PIECE_X_SALT, piece.origin.x)
+            ^ coordinate_key(PIECE_Y_KEYS, PIECE_Y_SALT, piece.origin.y))
+
+
+def spawn_key(spawnlist: list[Piece]) -> int:
+    key = 0
+    for index, piece in enumerate(spawnlist[:SPAWN_DEPTH]):
+        key ^= SPAWN_KEYS[index * len(PIECE_CODES) + PIECE_CODES.index(piece.type)]
+    return key
@@ -0,0 +1,115 @@
+import unittest
+import time
+from packages.AutoPlayer import AutoPlayer
+from packages.Board import Board
+from packages.Block import Block
+from packages.Piece import Piece
+from packages.Player import Player
+from packages.PowerUp import PowerUp
+from packages.Vector2 import Vector2
+from packages.HeadlessEnvironment import HeadlessEnvironment
+from packages.SimulationFarm import RandomPlacementPolicy
+
+
+def roofed_board() -> Board:
+    # the two bottom rows are only missing the two leftmost columns, which sit under a roof
+    board = Board(6, 10, Player(persistent=False), engine="BITBOARD", seed=1)
+    for x in range(2, 6):
+        board.grid[x][9] = Block()
+        board.grid[x][8] = Block()
+    board.grid[0][7] = Block()
+    board.grid[1][7] = Block()
+    board.player_piece = Piece(Vector2(3, 0), "LINE")
+    return board
+
+
+class AutoPlayerTester(unittest.TestCase):
+
+    def test_roofed_board_features(self):
+        features = roofed_board().features
+
+        self.assertEqual(features.aggregate_height, 3 + 3 + 2 * 4)
+        self.assertEqual(features.holes, 4)
+        self.assertEqual(features.bumpiness, 1)
+
+    def test_outplays_random_placements(self):
+        lines = {"AUTOPLAYER": 0, "RANDOM_PLACEMENT": 0}
+        for name in lines:
+            env = HeadlessEnvironment(8, 16, engine="BITBOARD", collapse_mode="INSTANT")
+            env.reset(5)
+            policy = AutoPlayer(budget_ms=None, depth=1) if name == "AUTOPLAYER" else RandomPlacementPolicy(5)
+            while not env.board.game_over and env.board.pieces_placed < 60:
+                env.step(policy.command(env.board))
+            lines[name] = env.board.lines_cleared
+
+            if name == "AUTOPLAYER":
+                self.assertFalse(env.board.game_over)
+        self.assertGreater(lines["AUTOPLAYER"], 20)
+        self.assertGreater(lines["AUTOPLAYER"], lines["RANDOM_PLACEMENT"])
+
+    def test_plays_the_chosen_placement(self):
+        board = Board(8, 14, Player(persistent=False), engine="BITBOARD", seed=2)
+        player = AutoPlayer(budget_ms=None)
+        piece = board.player_piece
+
+        while board.player_piece is piece:
+            command = player.command(board)
+            if command == None:
+                board.physics_logic()
+            else:
+                board.movement(command)
+
+        assert player.move != None
+        x, y, rotation = player.move.placement
+        filled = {(x + relative_x, y + relative_y) for relative_x, relative_y in Piece.ROTATION_OFFSETS[piece.type][rotation]}
+        self.assertEqual({(cx, cy) for cx in range(8) for cy in range(14) if board.grid[cx][cy] != None}, filled)
+
+    def test_budget_cuts_the_lookahead(self):
+        board = Board(8, 14, Player(persistent=False), engine="BITBOARD", seed=3)
+
+        unbounded = AutoPlayer(budget_ms=None, depth=3)
+        self.assertNotEqual(unbounded.search(board), None)
+        self.assertEqual(unbounded.last_search_depth, 3)
+
+        # out of time on the first level it still plays the best move scored so far
+        rushed = AutoPlayer(budget_ms=0, depth=3)
+        self.assertNotEqual(rushed.search(board), None)
+        self.assertEqual(rushed.last_search_depth, 0)
+
+    def test_budget_holds_on_the_first_level(self):
+        board = Board(200, 40, Player(persistent=False), engine="BITBOARD", storage="SPARSE", seed=3)
+        board.reachable_placements()
+
+        start = time.perf_counter()
+        unbounded = AutoPlayer(budget_ms=None, depth=1).search(board)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rushed = AutoPlayer(budget_ms=1, depth=1).search(board)
+        self.assertNotEqual(rushed, None)
+        self.assertNotEqual(unbounded, None)
+        self.assertLess(time.perf_counter() - start, full / 2)
+
+    def test_fires_power_ups_when_worthwhile(self):
+        board = roofed_board()
+        player = AutoPlayer(budget_ms=None)
+
+        board.player_manager.power_up = PowerUp(None)
+        self.assertEqual(player.search(board).kind, "PLACE")  # type: ignore
+        board.player_manager.power_up = PowerUp("TELEPORTER")
+        self.assertEqual(player.search(board).kind, "TELEPORTER")  # type: ignore
+        board.player_manager.power_up = PowerUp("BOMB")
+        self.assertEqual(player.search(board).kind, "BOMB")  # type: ignore
+
+    def test_search_leaves_the_board_untouched(self):
+        board = roofed_board()
+        board.player_manager.power_up = PowerUp("BOMB")
+        hash_before = board.position_hash()
+
+        AutoPlayer(budget_ms=None).search(board)
+        self.assertEqual(board.position_hash(), hash_before)
+        self.assertEqual(board.player_manager.power_up.name, "BOMB")
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
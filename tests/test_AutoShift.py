@@ -0,0 +1,141 @@
+import unittest
+import threading
+import types
+from unittest.mock import patch
+from packages.AutoShift import AutoShift
+from packages.KeyListener import KeyListener, TerminalKeys
+
+MS = 10**6
+
+
+class FakeKey:
+    def __init__(self, char: str | None = None, name: str | None = None):
+        self.char = char
+        self.name = name
+
+
+class FakeListener(threading.Thread):
+    ''' a pynput backend thread, `works` False ends it at once like a missing display '''
+    works = True
+
+    def __init__(self, on_press, on_release):
+        super().__init__(daemon=True)
+        self.stopped = threading.Event()
+        self.running = False
+
+    def run(self):
+        if not self.works:
+            return
+        self.running = True
+        self.stopped.wait()
+        self.running = False
+
+    def stop(self):
+        self.stopped.set()
+
+
+def fake_pynput(works: bool) -> types.ModuleType:
+    listener = type("Listener", (FakeListener,), {"works": works})
+    module = types.ModuleType("pynput")
+    module.keyboard = types.SimpleNamespace(Listener=listener)  # type: ignore
+    return module
+
+
+class TestAutoShift(unittest.TestCase):
+    def setUp(self):
+        self.auto_shift = AutoShift(das_ms=100, arr_ms=20)
+
+    def test_tap_shifts_once(self):
+        self.auto_shift.press("LEFT", 0)
+        self.auto_shift.release("LEFT", 10 * MS)
+        self.assertEqual(self.auto_shift.due_shifts(500 * MS), [("LEFT", 1)])
+        self.assertEqual(self.auto_shift.due_shifts(600 * MS), [])
+
+    def test_hold_repeats_after_das_on_arr(self):
+        self.auto_shift.press("RIGHT", 0)
+        self.assertEqual(self.auto_shift.due_shifts(99 * MS), [("RIGHT", 1)])
+        self.assertEqual(self.auto_shift.due_shifts(100 * MS), [("RIGHT", 1)])
+        self.assertEqual(self.auto_shift.due_shifts(119 * MS), [])
+        self.assertEqual(self.auto_shift.due_shifts(120 * MS), [("RIGHT", 1)])
+
+    def test_late_check_gets_one_multi_cell_shift(self):
+        self.auto_shift.press("RIGHT", 0)
+        self.assertEqual(self.auto_shift.due_shifts(200 * MS), [("RIGHT", 1), ("RIGHT", 6)])
+
+    def test_shift_count_does_not_depend_on_polling(self):
+        polled = AutoShift(das_ms=100, arr_ms=20)
+        polled.press("LEFT", 0)
+        cells = 0
+        for time_ms in range(0, 301):
+            cells += sum(count for _, count in polled.due_shifts(time_ms * MS))
+
+        self.auto_shift.press("LEFT", 0)
+        self.assertEqual(sum(count for _, count in self.auto_shift.due_shifts(300 * MS)), cells)
+
+    def test_instant_arr_slides_once(self):
+        auto_shift = AutoShift(das_ms=100, arr_ms=0)
+        auto_shift.press("LEFT", 0)
+        self.assertEqual(auto_shift.due_shifts(150 * MS), [("LEFT", 1), ("LEFT", -1)])
+        self.assertEqual(auto_shift.due_shifts(500 * MS), [])
+
+    def test_last_pressed_direction_wins(self):
+        self.auto_shift.press("LEFT", 0)
+        self.auto_shift.press("RIGHT", 50 * MS)
+        self.assertEqual(self.auto_shift.due_shifts(149 * MS), [("LEFT", 1), ("RIGHT", 1)])
+
+        # letting go of RIGHT charges LEFT again, without a tap
+        self.auto_shift.release("RIGHT", 149 * MS)
+        self.assertEqual(self.auto_shift.due_shifts(248 * MS), [])
+        self.assertEqual(self.auto_shift.due_shifts(249 * MS), [("LEFT", 1)])
+
+
+class TestKeySources(unittest.TestCase):
+    def test_terminal_single_key_is_a_tap(self):
+        auto_shift = AutoShift(das_ms=100, arr_ms=20)
+        keys = TerminalKeys(auto_shift)
+        keys.key("LEFT", 0)
+        self.assertEqual(auto_shift.held, [])
+        self.assertEqual(auto_shift.due_shifts(1000 * MS), [("LEFT", 1)])
+
+    def test_terminal_repeat_holds_until_it_stops(self):
+        auto_shift = AutoShift(das_ms=100, arr_ms=20)
+        keys = TerminalKeys(auto_shift, hold_ms=700, release_ms=60)
+        keys.key("RIGHT", 0)
+        keys.key("RIGHT", 500 * MS)
+        self.assertEqual(auto_shift.held, ["RIGHT"])
+
+        for time_ms in range(530, 700, 30):
+            keys.key("RIGHT", time_ms * MS)
+            keys.expire(time_ms * MS)
+        self.assertEqual(auto_shift.held, ["RIGHT"])
+
+        keys.expire(800 * MS)
+        self.assertEqual(auto_shift.held, [])
+
+    def test_listener_key_codes(self):
+        self.assertEqual(KeyListener.key_code(FakeKey(char="a")), ord("a"))
+        self.assertEqual(KeyListener.key_code(FakeKey(name="space")), ord(" "))
+        self.assertEqual(KeyListener.key_code(FakeKey(name="enter")), 10)
+        self.assertIsNone(KeyListener.key_code(FakeKey(name="shift")))
+
+    def test_listener_queues_stamped_events(self):
+        listener = KeyListener(clock=lambda: 42)
+        listener.on_key(FakeKey(char="d"), True)
+        listener.on_key(FakeKey(char="d"), False)
+        self.assertEqual(listener.events(), [(42, ord("d"), True), (42, ord("d"), False)])
+        self.assertEqual(listener.events(), [])
+
+    def test_listener_starts_only_when_the_backend_runs(self):
+        with patch.dict("sys.modules", {"pynput": fake_pynput(True)}):
+            listener = KeyListener(startup_s=0.05)
+            self.assertTrue(listener.start())
+            listener.stop()
+
+        with patch.dict("sys.modules", {"pynput": fake_pynput(False)}):
+            listener = KeyListener(startup_s=0.05)
+            self.assertFalse(listener.start())
+            self.assertIsNone(listener.listener)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,191 @@
+import unittest
+import random
+from unittest.mock import patch
+from typing import Any
+import numpy as np
+from packages.BatchBoard import BatchBoard, COMMAND_CODES, POWERUP_NAMES
+from packages.Board import Board
+from packages.HeadlessEnvironment import HeadlessEnvironment
+from packages.Piece import Piece, PIECE_CODES
+from packages.PowerUp import PowerUp
+from packages.RandomGenerator import RandomGenerator
+from packages.Command import Command
+
+BOARDS = 12
+TICKS = 3000
+
+
+def board_state(env: HeadlessEnvironment) -> tuple[Any, ...]:
+    board = env.board
+    cells = tuple(tuple(board.grid[x][y] != None for x in range(board.width))
+                  for y in range(board.height))
+    piece = board.player_piece
+    piece_cells = tuple(sorted((block.x + piece.origin.x, block.y + piece.origin.y)
+                               for block in piece.blocks_relative_pos))
+    return (cells, piece.type, piece_cells, env.player_manager.score, board.level,
+            board.game_over, board.collapse_height, board.scan_height,
+            env.player_manager.power_up.name)
+
+
+def batch_state(batch: BatchBoard, index: int) -> tuple[Any, ...]:
+    cells = tuple(tuple(bool(cell) for cell in row) for row in batch.cells[index])
+    return (cells, PIECE_CODES[batch.piece_type[index]], tuple(sorted(batch.piece_cells(index))),
+            int(batch.score[index]), int(batch.level[index]), bool(batch.game_over[index]),
+            int(batch.collapse_height[index]), int(batch.scan_height[index]),
+            POWERUP_NAMES[batch.power_up[index]])
+
+
+# (tick, what fired, score it gave) of one board
+PowerUpEvent = tuple[int, str, int]
+
+
+def record_batch_powerups(batch: BatchBoard) -> list[list[PowerUpEvent]]:
+    ''' wraps the power up steps of `batch` so each board logs what fired on it '''
+    events: list[list[PowerUpEvent]] = [[] for _ in range(batch.count)]
+
+    def recording(name: str, run: Any) -> Any:
+        def wrapper(boards: np.ndarray):
+            before = batch.score[boards].copy()
+            run(boards)
+            for board, gained in zip(boards.tolist(), (batch.score[boards] - before).tolist()):
+                events[board].append((batch.tick, name, gained))
+        return wrapper
+
+    batch.teleport_piece = recording("TELEPORTER", batch.teleport_piece)
+    batch.activate_bomb = recording("BOMB_ARMED", batch.activate_bomb)
+    batch.explode_bomb = recording("BOMB_EXPLODED", batch.explode_bomb)
+    return events
+
+
+def play_board(batch: BatchBoard, index: int, seed: int) \
+        -> tuple[list[Command], list[tuple[Any, ...]], list[PowerUpEvent]]:
+    # the board draws the same piece types and power ups the batch pre-generated
+    piece_draws = (PIECE_CODES[draw] for draw in batch.piece_sequence[index].tolist())
+    powerup_draws = (POWERUP_NAMES[draw] for draw in batch.powerup_sequence[index].tolist())
+
+    placements = random.Random(seed)
+    commands: list[Command] = []
+    states: list[tuple[Any, ...]] = []
+    events: list[PowerUpEvent] = []
+    run_powerup = Board.run_powerup
+
+    def recording_powerup(board: Board, powerup: PowerUp):
+        if powerup.name == None:
+            return run_powerup(board, powerup)
+        name = "TELEPORTER" if powerup.name == "TELEPORTER" else \
+            "BOMB_EXPLODED" if powerup.is_active else "BOMB_ARMED"
+        before = board.player_manager.score
+        run_powerup(board, powerup)
+        # the states are appended after each step, so their count is the tick being played
+        events.append((len(states), name, board.player_manager.score - before))
+
+    with patch.object(RandomGenerator, "next_piece_type", side_effect=piece_draws), \
+            patch.object(RandomGenerator, "next_power_up", side_effect=powerup_draws), \
+            patch.object(Board, "run_powerup", recording_powerup):
+        env = HeadlessEnvironment(batch.width, batch.height)
+        piece: Piece | None = None
+        target_x = 0
+        rotations = 0
+
+        for _ in range(TICKS):
+            if env.board.player_piece is not piece:
+                piece = env.board.player_piece
+                target_x = placements.randrange(env.width)
+                rotations = placements.randrange(4)
+
+            command: Command = placements.choice(
+                ["TRIGGER_POWERUP", "HARD_DROP", None, None, None, None, None, None])
+            if rotations:
+                command = placements.choice(["CLOCKWISE_ROTATION", "COUNTERWISE_ROTATION"])
+                rotations -= 1
+            elif piece.origin.x < target_x:
+                command = "RIGHT"
+            elif piece.origin.x > target_x:
+                command = "LEFT"
+
+            env.step(command)
+            commands.append(command)
+            states.append(board_state(env))
+
+    return commands, states, events
+
+
+class BatchBoardTester(unittest.TestCase):
+
+    def test_initial_state(self):
+        batch = BatchBoard(4, 9, 20, seed=1)
+
+        self.assertEqual(batch.cells.shape, (4, 20, 9))
+        self.assertFalse(batch.cells.any())
+        self.assertTrue((batch.piece_x == 4).all())
+        self.assertTrue((batch.piece_y == 0).all())
+        self.assertTrue((batch.level == 1).all())
+
+    def test_full_lines_clear_and_collapse(self):
+        batch = BatchBoard(2, 6, 10, seed=2)
+        batch.cells[0, 9] = 1
+        batch.cells[0, 7] = 1
+        batch.cells[0, 8, 2] = 1
+        batch.cells[1, 9, :5] = 1
+
+        batch.score_line(batch.boards)
+        self.assertEqual(batch.score.tolist(), [300, 0])
+        self.assertEqual(batch.collapse_height.tolist(), [9, -1])
+
+        while batch.is_animating.any():
+            batch.apply_block_gravity(batch.boards[batch.is_animating])
+
+        self.assertEqual(batch.cells[0].sum(), 1)
+        self.assertEqual(batch.cells[0, 9, 2], 1)
+        self.assertEqual(batch.cells[1, 9].sum(), 5)
+
+    def test_matches_board_rules(self):
+        batch = BatchBoard(BOARDS, 6, 14, seed=1, chunk_size=4096)
+
+        commands: list[list[Command]] = []
+        expected: list[list[tuple[Any, ...]]] = []
+        expected_events: list[list[PowerUpEvent]] = []
+        for index in range(BOARDS):
+            board_commands, board_states, board_events = play_board(batch, index, index)
+            commands.append(board_commands)
+            expected.append(board_states)
+            expected_events.append(board_events)
+
+        events = record_batch_powerups(batch)
+
+        encoded = np.array([BatchBoard.encode_commands(board_commands)
+                            for board_commands in commands]).T
+
+        for tick in range(TICKS):
+            batch.step(encoded[tick])
+            for index in range(BOARDS):
+                self.assertEqual(batch_state(batch, index), expected[index][tick],
+                                 f"board {index} diverged at tick {tick}")
+
+        # both engines fired the same power ups on the same ticks, for the same score
+        for index in range(BOARDS):
+            self.assertEqual(events[index], expected_events[index], f"board {index} power ups")
+
+        # the match must have exercised line clears and every power up path
+        fired = [event for board_events in events for event in board_events]
+        self.assertTrue((batch.score > 0).any())
+        self.assertTrue(any(name == "TELEPORTER" for _, name, _ in fired))
+        self.assertTrue(any(name == "BOMB_ARMED" for _, name, _ in fired))
+        # BLOCK_DESTROYED scores every blasted cell inside the grid
+        self.assertTrue(any(name == "BOMB_EXPLODED" and gained > 0 for _, name, gained in fired))
+
+    def test_level_up_under_the_counter_still_falls(self):
+        batch = BatchBoard(2, 8, 16, seed=1)
+        start = batch.piece_y.copy()
+        for _ in range(20):
+            batch.step()
+        self.assertTrue((batch.piece_y == start).all())
+
+        # the new interval is shorter than the ticks already counted
+        batch.level[:] = 60
+        batch.step()
+        self.assertTrue((batch.piece_y == start + 1).all())
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
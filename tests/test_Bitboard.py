@@ -0,0 +1,131 @@
+import unittest
+import random
+from packages.Board import Board, BoardEngines
+from packages.Block import Block
+from packages.Vector2 import Vector2
+from packages.Piece import Piece
+from packages.Player import Player
+from packages.Command import Command
+
+def play_match(engine: BoardEngines, seed: int, ticks: int) -> list[tuple[list[list[bool]], int, int]]:
+    # the board seed drives the pieces and power ups, the placements come from their own generator
+    placements = random.Random(seed)
+    board = Board(6, 16, Player(), engine=engine, seed=seed)
+
+    piece: Piece | None = None
+    target_x = 0
+    rotations = 0
+
+    history: list[tuple[list[list[bool]], int, int]] = []
+    for _ in range(ticks):
+        if board.game_over:
+            break
+
+        if board.player_piece is not piece:
+            piece = board.player_piece
+            target_x = placements.randrange(board.width)
+            rotations = placements.randrange(4)
+
+        command: Command = placements.choice(["TRIGGER_POWERUP", None, None])
+        if rotations:
+            command = "CLOCKWISE_ROTATION"
+            rotations -= 1
+        elif piece.origin.x < target_x:
+            command = "RIGHT"
+        elif piece.origin.x > target_x:
+            command = "LEFT"
+
+        board.movement(command)
+        board.physics_logic()
+        cells = [[cell != None for cell in column] for column in board.grid]
+        history.append((cells, board.player_manager.score, board.level))
+
+    return history
+
+
+class BitboardParityTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.grid_board = Board(9, 20, Player())
+        self.bit_board = Board(9, 20, Player(), engine="BITBOARD")
+
+    def fill_both(self, rng: random.Random, density: float):
+        for x in range(9):
+            for y in range(4, 20):
+                block = Block() if rng.random() < density else None
+                self.grid_board.grid[x][y] = block
+                self.bit_board.grid[x][y] = block
+
+    def test_bitboard_tracks_grid_writes(self):
+        self.bit_board.grid[3][19] = Block()
+        self.bit_board.grid[4][-1] = Block()
+        self.assertEqual(self.bit_board.bitboard.rows[19], 0b11000)  # type: ignore
+
+        self.bit_board.grid[3][19] = None
+        self.assertEqual(self.bit_board.bitboard.rows[19], 0b10000)  # type: ignore
+
+    def test_column_slices_track_the_indexes(self):
+        board = Board(10, 20, Player(), engine="BITBOARD")
+        board.grid[2][17:] = [Block(), None, Block()]
+
+        self.assertEqual(board.bitboard.rows[17], 0b100)  # type: ignore
+        self.assertEqual(board.bitboard.rows[19], 0b100)  # type: ignore
+        self.assertEqual(board.column_heights[2], 17)
+        self.assertEqual(board.row_counts[17], 1)
+
+        with self.assertRaises(ValueError):
+            board.grid[2][17:] = [None]
+
+    def test_columns_keep_their_height(self):
+        column = Board(10, 20, Player(), engine="BITBOARD").grid[0]
+        for resize in (lambda: column.append(Block()), lambda: column.insert(0, None), column.pop,
+                       lambda: column.extend([None]), lambda: column.__delitem__(0), column.clear):
+            with self.assertRaises(TypeError):
+                resize()
+        self.assertEqual(len(column), 20)
+
+    def test_collision_queries_match_grid_engine(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            self.fill_both(rng, 0.4)
+            piece_type = rng.choice(["PYRAMID", "LINE", "HALF_SQUARE"])
+            piece = Piece(Vector2(rng.randint(2, 6), rng.randint(1, 17)), piece_type)
+            for _ in range(rng.randint(0, 3)):
+                piece.rotateBlocks(True)
+
+            self.grid_board.player_piece = piece
+            self.bit_board.player_piece = piece
+
+            self.assertEqual(self.grid_board.has_collided(piece),
+                             self.bit_board.has_collided(piece))
+            for direction in ("LEFT", "RIGHT"):
+                self.assertEqual(self.grid_board.piece_can_move(direction),
+                                 self.bit_board.piece_can_move(direction))
+            for is_clock_wise in (True, False):
+                self.assertEqual(self.grid_board.piece_can_rotate(piece, is_clock_wise),
+                                 self.bit_board.piece_can_rotate(piece, is_clock_wise))
+
+    def test_score_line_matches_grid_engine(self):
+        for board in (self.grid_board, self.bit_board):
+            for x in range(9):
+                board.grid[x][19] = Block()
+                board.grid[x][17] = Block()
+            board.grid[2][18] = Block()
+            board.grid[5][16] = Block()
+            board.score_line()
+
+        for x in range(9):
+            self.assertEqual([cell != None for cell in self.grid_board.grid[x]],
+                             [cell != None for cell in self.bit_board.grid[x]])
+        self.assertEqual(self.grid_board.collapse_height, self.bit_board.collapse_height)
+        self.assertEqual(self.grid_board.player_manager.score,
+                         self.bit_board.player_manager.score)
+
+    def test_random_matches_match_grid_engine(self):
+        for seed in range(20):
+            self.assertEqual(play_match("GRID", seed, 1500),
+                             play_match("BITBOARD", seed, 1500))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -1,10 +1,27 @@
 import unittest
+import random
 from packages.Board import Board
 from packages.Block import Block
 from packages.Vector2 import Vector2
 from packages.Piece import Piece
 from packages.Player import Player
 from packages.PowerUp import PowerUp
+from packages.Command import Command
+
+PLAY_COMMANDS: list[Command] = ["LEFT", "RIGHT", "CLOCKWISE_ROTATION", "HARD_DROP",
+                                "TRIGGER_POWERUP", None, None, None]
+
+
+def match_state(board: Board) -> tuple[object, ...]:
+    piece = board.player_piece
+    bitboard_rows = None if board.bitboard == None else board.bitboard.rows.copy()
+    return ([[cell != None for cell in column] for column in board.grid], bitboard_rows,
+            board.column_masks.copy(), board.column_heights.copy(), board.row_counts.copy(),
+            board.full_rows.copy(), piece.type, piece.rotation, piece.origin.copy(),
+            [(spawn.type, spawn.origin.copy()) for spawn in board.spawnlist],
+            board.player_manager.score, board.player_manager.power_up.name,
+            board.collapse_height, board.scan_height, board.is_animating, board.game_over,
+            board.level, board.physics_ticks)
 
 
 class TestBoard(unittest.TestCase):
@@ -155,5 +172,269 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(self.board.scan_height, 17)
 
 
+    def fill_cascading_stack(self, board: Board) -> None:
+        # two full rows with a stack above that completes another line once it lands
+        for x in range(board.width):
+            board.grid[x][19] = Block()
+            board.grid[x][17] = Block()
+        for x in range(board.width - 1):
+            board.grid[x][15] = Block()
+        board.grid[board.width - 1][13] = Block()
+        board.grid[2][12] = Block()
+
+    def test_instant_collapse_matches_animation(self) -> None:
+        instant_board = Board(9, 20, Player(), collapse_mode="INSTANT")
+        self.fill_cascading_stack(self.board)
+        self.fill_cascading_stack(instant_board)
+
+        self.board.score_line()
+        frames = 0
+        while self.board.is_animating:
+            self.board.physics_logic()
+            frames += 1
+
+        instant_board.score_line()
+
+        self.assertGreater(frames, 20)
+        self.assertFalse(instant_board.is_animating)
+        self.assertEqual(instant_board.collapse_height, -1)
+        for x in range(9):
+            self.assertEqual([cell != None for cell in self.board.grid[x]],
+                             [cell != None for cell in instant_board.grid[x]])
+        self.assertEqual(self.board.level, instant_board.level)
+        self.assertEqual(self.board.player_manager.score,
+                         instant_board.player_manager.score)
+
+    def test_collapse_frames_are_lazy(self) -> None:
+        self.fill_cascading_stack(self.board)
+        self.board.score_line()
+
+        frames = self.board.collapse_frames()
+        next(frames)
+        self.assertTrue(self.board.is_animating)
+        self.assertEqual(self.board.scan_height, 17)
+
+        self.board.resolve_collapse()
+        self.assertFalse(self.board.is_animating)
+        self.assertIsInstance(self.board.grid[2][19], Block)
+        self.assertEqual(list(frames), [])
+
+    def test_collapse_frames_are_snapshots(self) -> None:
+        for storage in ("LIST", "COMPACT", "SPARSE"):
+            board = Board(9, 20, Player(persistent=False), storage=storage)
+            self.fill_cascading_stack(board)
+            board.score_line()
+
+            frames = list(board.collapse_frames())
+            moving = [frame for frame in frames if frame.changed]
+            self.assertGreater(len(moving), 1)
+            self.assertNotEqual(moving[0].column_masks, moving[1].column_masks)
+            self.assertNotEqual(moving[0].changed, moving[1].changed)
+
+            # replaying the changes over the first frame lands on the settled board
+            masks = list(frames[0].column_masks)
+            for frame in frames[1:]:
+                for x, y in frame.changed:
+                    masks[x] ^= 1 << y
+            self.assertEqual(masks, board.column_masks)
+            self.assertEqual(frames[-1].column_masks, tuple(board.column_masks))
+
+
+    def test_landing_row_matches_falling_piece(self) -> None:
+        rng = random.Random(4)
+        for _ in range(100):
+            board = Board(9, 20, Player())
+            for x in range(9):
+                for y in range(6, 20):
+                    if rng.random() < 0.3:
+                        board.grid[x][y] = Block()
+
+            piece = Piece(Vector2(rng.randint(2, 6), 2), rng.choice(["PYRAMID", "LINE", "HALF_SQUARE"]))
+            if board.piece_can_rotate(piece, True):
+                piece.rotateBlocks(True)
+
+            falling_piece = piece.copy()
+            while not board.has_collided(falling_piece):
+                falling_piece.origin.y += 1
+
+            self.assertEqual(board.landing_row(piece), falling_piece.origin.y)
+
+    def test_landing_row_under_overhang(self) -> None:
+        self.board.grid[4][5] = Block()
+        self.board.grid[4][15] = Block()
+        self.board.player_piece = Piece(Vector2(4, 8), "LINE")
+
+        self.assertEqual(self.board.column_heights[4], 5)
+        self.assertEqual(self.board.landing_row(self.board.player_piece), 14)
+
+    def test_hard_drop_locks_piece(self) -> None:
+        self.board.player_piece = Piece(Vector2(4, 0), "PYRAMID")
+        self.board.movement("HARD_DROP")
+
+        self.assertIsInstance(self.board.grid[4][18], Block)
+        self.assertIsInstance(self.board.grid[3][19], Block)
+        self.assertEqual(self.board.column_heights[4], 18)
+        self.assertEqual(self.board.player_piece.origin, Vector2(4, 0))
+
+    def test_hard_drop_waits_for_the_collapse(self) -> None:
+        for x in range(self.board.width):
+            self.board.grid[x][19] = Block()
+        self.board.grid[2][18] = Block()
+        self.board.score_line()
+        self.board.physics_logic()
+        self.assertTrue(self.board.is_animating)
+
+        piece = self.board.player_piece
+        origin = piece.origin.copy()
+        placed = self.board.pieces_placed
+        self.board.movement("HARD_DROP")
+
+        self.assertIs(self.board.player_piece, piece)
+        self.assertEqual(piece.origin, origin)
+        self.assertEqual(self.board.pieces_placed, placed)
+
+    def test_column_heights_follow_line_clears(self) -> None:
+        for x in range(self.board.width):
+            self.board.grid[x][19] = Block()
+        self.board.grid[2][18] = Block()
+        self.board.grid[2][17] = Block()
+
+        self.board.score_line()
+        self.assertEqual(self.board.column_heights[0], 20)
+        while self.board.is_animating:
+            self.board.physics_logic()
+
+        self.assertEqual(self.board.column_heights[2], 18)
+        self.assertEqual(self.board.lowest_empty_row(2), 17)
+        self.assertEqual(self.board.lowest_empty_row(0), 19)
+
+    def test_teleport_fills_lowest_empty_cells(self) -> None:
+        self.board.grid[3][19] = Block()
+        self.board.grid[3][17] = Block()
+        self.board.player_manager.power_up = PowerUp("TELEPORTER")
+        self.board.player_piece = Piece(Vector2(4, 0), "HALF_SQUARE")
+
+        self.board.movement("TRIGGER_POWERUP")
+
+        self.assertIsInstance(self.board.grid[3][18], Block)
+        self.assertIsInstance(self.board.grid[3][16], Block)
+        self.assertIsInstance(self.board.grid[4][19], Block)
+        self.assertIsInstance(self.board.grid[5][19], Block)
+        self.assertIsNone(self.board.player_manager.power_up.name)
+
+
+    def test_row_counts_follow_random_play(self) -> None:
+        board = Board(7, 14, Player(), seed=12)
+        placements = random.Random(12)
+
+        for _ in range(2000):
+            if board.game_over:
+                break
+            board.movement(placements.choice(["LEFT", "RIGHT", "CLOCKWISE_ROTATION",
+                                              "HARD_DROP", "TRIGGER_POWERUP", None]))
+            board.physics_logic()
+
+            for y in range(board.height):
+                filled = sum(board.grid[x][y] != None for x in range(board.width))
+                self.assertEqual(board.row_counts[y], filled)
+            self.assertEqual(board.full_rows,
+                             {y for y in range(board.height) if board.row_counts[y] == board.width})
+
+    def test_wide_board_line_clear(self) -> None:
+        board = Board(48, 20, Player())
+        for x in range(48):
+            board.grid[x][19] = Block()
+            board.grid[x][18] = Block()
+        board.grid[0][18] = None
+
+        self.assertEqual(board.row_counts[18], 47)
+        self.assertEqual(board.full_rows, {19})
+
+        board.score_line()
+        self.assertEqual(board.row_counts[19], 0)
+        self.assertEqual(board.full_rows, set())
+        self.assertEqual(board.collapse_height, 19)
+
+    def test_snapshot_restore_round_trip(self) -> None:
+        for storage in ("LIST", "COMPACT"):
+            board = Board(6, 14, Player(persistent=False), engine="BITBOARD", storage=storage, seed=8)
+            moves = random.Random(8)
+
+            for _ in range(60):
+                if board.game_over:
+                    break
+                snapshot = board.snapshot()
+                expected = match_state(board)
+                reference = board.clone()
+
+                # look ahead, go back and look ahead again from the same snapshot
+                for _ in range(2):
+                    for _ in range(moves.randrange(1, 40)):
+                        board.movement(moves.choice(PLAY_COMMANDS))
+                        board.physics_logic()
+                    board.restore(snapshot)
+                    self.assertEqual(match_state(board), expected)
+
+                # the restored board plays on exactly like a board that never branched
+                for _ in range(moves.randrange(1, 30)):
+                    command = moves.choice(PLAY_COMMANDS)
+                    for played in (board, reference):
+                        played.movement(command)
+                        played.physics_logic()
+                self.assertEqual(match_state(board), match_state(reference))
+
+    def test_snapshot_shares_columns_until_written(self) -> None:
+        self.board.grid[2][19] = Block()
+        snapshot = self.board.snapshot()
+
+        self.assertIs(snapshot.grid[3], self.board.grid[3])
+        self.board.grid[3][19] = Block()
+
+        self.assertIsNot(snapshot.grid[3], self.board.grid[3])
+        self.assertIs(snapshot.grid[2], self.board.grid[2])
+        self.assertIsNone(snapshot.grid[3][19])
+
+        self.board.restore(snapshot)
+        self.assertIsNone(self.board.grid[3][19])
+        self.assertIsInstance(self.board.grid[2][19], Block)
+        self.assertEqual(self.board.row_counts[19], 1)
+
+    def test_shift_matches_repeated_moves(self) -> None:
+        for engine in ("GRID", "BITBOARD"):
+            board = Board(9, 20, Player(persistent=False), engine=engine, seed=3)
+            reference = board.clone()
+            board.player_piece.origin.y = reference.player_piece.origin.y = 5
+            board.grid[0][6] = reference.grid[0][6] = Block()
+
+            moved = board.shift("LEFT", 3)
+            for _ in range(3):
+                reference.movement("LEFT")
+            self.assertEqual(board.player_piece.origin.x, reference.player_piece.origin.x)
+
+            # to the wall with a negative count
+            moved += board.shift("LEFT", -1)
+            while reference.piece_can_move("LEFT"):
+                reference.movement("LEFT")
+            self.assertEqual(board.player_piece.origin.x, reference.player_piece.origin.x)
+            self.assertEqual(board.shift("LEFT", 2), 0)
+            self.assertGreater(moved, 0)
+
+    def test_revision_follows_changes(self) -> None:
+        board = Board(9, 20, Player(persistent=False), seed=4)
+        revision = board.revision
+        board.movement("LEFT")
+        self.assertGreater(board.revision, revision)
+
+        revision = board.revision
+        board.physics_logic()
+        self.assertGreater(board.revision, revision)
+
+        # a shift that moved nothing is not a change
+        board.shift("LEFT", -1)
+        revision = board.revision
+        board.shift("LEFT", 1)
+        self.assertEqual(board.revision, revision)
+
+
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
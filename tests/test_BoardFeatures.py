@@ -0,0 +1,114 @@
+import unittest
+from packages.Board import Board
+from packages.Block import Block
+from packages.Player import Player
+from packages.SimulationFarm import RandomPlacementPolicy
+
+
+def features_from_scratch(board: Board) -> dict[str, object]:
+    ''' every feature recomputed from the grid cells '''
+    filled = [[board.grid[x][y] != None for y in range(board.height)] for x in range(board.width)]
+
+    heights = []
+    holes = []
+    for column in filled:
+        top = next((y for y, cell in enumerate(column) if cell), board.height)
+        heights.append(board.height - top)
+        holes.append(sum(1 for cell in column[top:] if not cell))
+
+    row_transitions = []
+    for y in range(board.height):
+        row = [True] + [filled[x][y] for x in range(board.width)] + [True]
+        row_transitions.append(sum(1 for left, right in zip(row, row[1:]) if left != right))
+
+    walled = [board.height] + heights + [board.height]
+    wells = [max(0, min(walled[x], walled[x + 2]) - walled[x + 1]) for x in range(board.width)]
+
+    return {
+        "column_heights": tuple(heights),
+        "column_holes": tuple(holes),
+        "row_transitions": tuple(row_transitions),
+        "well_depths": tuple(wells),
+        "aggregate_height": sum(heights),
+        "holes": sum(holes),
+        "bumpiness": sum(abs(left - right) for left, right in zip(heights, heights[1:])),
+        "total_row_transitions": sum(row_transitions),
+        "well_sum": sum(wells),
+    }
+
+
+def tracked_features(board: Board) -> dict[str, object]:
+    return {name: getattr(board.features, name) for name in features_from_scratch(board)}
+
+
+class BoardFeaturesTester(unittest.TestCase):
+
+    def test_empty_board(self):
+        board = Board(6, 10, Player(persistent=False), seed=0)
+        self.assertEqual(tracked_features(board), features_from_scratch(board))
+        self.assertEqual(board.features.total_row_transitions, 20)
+
+        lone_column = Board(1, 10, Player(persistent=False), seed=0)
+        self.assertEqual(tracked_features(lone_column), features_from_scratch(lone_column))
+
+    def test_hand_built_board(self):
+        board = Board(5, 6, Player(persistent=False), seed=0)
+        for x, y in ((0, 5), (0, 3), (1, 5), (3, 4), (3, 5), (4, 2)):
+            board.grid[x][y] = Block()
+
+        features = board.features
+        self.assertEqual(features.column_heights, (3, 1, 0, 2, 4))
+        self.assertEqual(features.column_holes, (1, 0, 0, 0, 3))
+        self.assertEqual(features.well_depths, (0, 0, 1, 0, 0))
+        self.assertEqual(features.bumpiness, 2 + 1 + 2 + 2)
+        self.assertEqual(tracked_features(board), features_from_scratch(board))
+
+    def test_matches_recomputation_after_random_play(self):
+        for seed in range(6):
+            for engine, storage, collapse_mode in (("GRID", "LIST", "ANIMATED"), ("BITBOARD", "COMPACT", "INSTANT"),
+                                                   ("BITBOARD", "LIST", "ANIMATED")):
+                board = Board(7, 14, Player(persistent=False), engine=engine, storage=storage,  # type: ignore
+                              collapse_mode=collapse_mode, seed=seed)  # type: ignore
+                policy = RandomPlacementPolicy(seed)
+
+                for tick in range(1500):
+                    if board.game_over:
+                        break
+                    board.movement(policy.command(board))
+                    board.physics_logic()
+                    if tick % 50 == 0:
+                        self.assertEqual(tracked_features(board), features_from_scratch(board))
+
+                self.assertEqual(tracked_features(board), features_from_scratch(board))
+
+    def test_follows_snapshots_and_clones(self):
+        board = Board(7, 14, Player(persistent=False), engine="BITBOARD", seed=9)
+        policy = RandomPlacementPolicy(9)
+        for _ in range(300):
+            board.movement(policy.command(board))
+            board.physics_logic()
+
+        snapshot = board.snapshot()
+        expected = features_from_scratch(board)
+        clone = board.clone()
+
+        for _ in range(300):
+            board.movement(policy.command(board))
+            board.physics_logic()
+        self.assertEqual(tracked_features(board), features_from_scratch(board))
+        self.assertEqual(tracked_features(clone), expected)
+
+        board.restore(snapshot)
+        self.assertEqual(tracked_features(board), expected)
+
+    def test_view_is_read_only(self):
+        board = Board(6, 10, Player(persistent=False), seed=0)
+        with self.assertRaises(AttributeError):
+            board.features.holes = 3  # type: ignore
+        heights = board.features.column_heights
+        board.grid[0][9] = Block()
+        self.assertEqual(heights, (0,) * 6)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
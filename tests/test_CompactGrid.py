@@ -0,0 +1,97 @@
+import unittest
+import pickle
+import random
+from packages.Board import Board
+from packages.Block import Block
+from packages.Player import Player
+from packages.HeadlessEnvironment import HeadlessEnvironment
+from packages.Command import Command
+
+PLAY_COMMANDS: list[Command] = ["LEFT", "RIGHT", "CLOCKWISE_ROTATION",
+                                "HARD_DROP", "TRIGGER_POWERUP", None, None]
+
+
+def occupancy(board: Board) -> list[list[bool]]:
+    return [[cell != None for cell in column] for column in board.grid]
+
+
+class CompactGridTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.board = Board(9, 20, Player(persistent=False), storage="COMPACT")
+
+    def test_reads_and_writes_like_the_list_grid(self):
+        self.board.grid[3][19] = Block()
+        self.board.grid[4][-1] = Block('@')
+
+        self.assertEqual(len(self.board.grid), 9)
+        self.assertEqual(len(self.board.grid[0]), 20)
+        self.assertIs(self.board.grid[3][19], Block.shared())
+        self.assertEqual(self.board.grid[4][19].symbol, '@')  # type: ignore
+        self.assertIsNone(self.board.grid[5][19])
+        self.assertEqual(self.board.row_counts[19], 2)
+
+        with self.assertRaises(IndexError):
+            self.board.grid[0][20]
+
+    def test_rows_are_memoryviews(self):
+        self.board.grid[0][19] = Block()
+        row = self.board.grid.row(19)  # type: ignore
+
+        self.assertIsInstance(row, memoryview)
+        self.assertEqual(row[0], Block.palette_id('#'))
+        self.assertEqual(bytes(row[1:]), bytes(8))
+
+        self.board.grid[1][19] = Block()
+        self.assertEqual(row[1], Block.palette_id('#'))
+
+    def test_clone_is_independent(self):
+        self.board.grid[2][19] = Block()
+        clone = self.board.clone()
+
+        clone.grid[2][19] = None
+        clone.grid[6][18] = Block()
+        clone.player_piece.origin.y += 3
+        clone.player_manager.score += 100
+
+        self.assertIsInstance(self.board.grid[2][19], Block)
+        self.assertIsNone(self.board.grid[6][18])
+        self.assertEqual(self.board.player_piece.origin.y, 0)
+        self.assertEqual(self.board.player_manager.score, 0)
+        self.assertEqual(clone.column_heights[6], 18)
+        self.assertEqual(self.board.column_heights[6], 20)
+
+    def test_pickle_round_trip(self):
+        self.board.grid[1][19] = Block()
+        loaded: Board = pickle.loads(pickle.dumps(self.board))
+
+        self.assertEqual(loaded.grid.key(), self.board.grid.key())  # type: ignore
+        loaded.grid[2][19] = Block()
+        self.assertEqual(loaded.row_counts[19], 2)
+        self.assertEqual(self.board.row_counts[19], 1)
+
+    def test_key_hashes_equal_grids(self):
+        other = Board(9, 20, Player(persistent=False), storage="COMPACT")
+        self.board.grid[5][10] = Block()
+        other.grid[5][10] = Block()
+
+        self.assertEqual(hash(self.board.grid.key()), hash(other.grid.key()))  # type: ignore
+
+    def test_matches_list_storage(self):
+        for seed in range(6):
+            results: list[list[tuple[list[list[bool]], int]]] = []
+            for storage in ("LIST", "COMPACT"):
+                env = HeadlessEnvironment(6, 14, storage=storage)
+                env.reset(seed)
+                commands = random.Random(seed)
+                history: list[tuple[list[list[bool]], int]] = []
+                while not env.board.game_over:
+                    env.step(commands.choice(PLAY_COMMANDS))
+                    history.append((occupancy(env.board), env.player_manager.score))
+                results.append(history)
+
+            self.assertEqual(results[0], results[1])
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,35 @@
+import unittest
+from packages.FrameBuffer import FrameBuffer, UNKNOWN
+
+
+class TestFrameBuffer(unittest.TestCase):
+    def test_addstr_clips_at_the_edges(self):
+        buffer = FrameBuffer(3, 5)
+        buffer.addstr(0, 3, "abcd")
+        buffer.addstr(1, -2, "xyz")
+        buffer.addstr(5, 0, "out")
+        buffer.addstr(2, 9, "out")
+        self.assertEqual([buffer.row_text(y) for y in range(3)], ["   ab", "z    ", "     "])
+
+    def test_same_frame_has_no_changes(self):
+        frame = FrameBuffer(4, 10)
+        frame.addstr(1, 2, "Fallock")
+        shown = FrameBuffer(4, 10)
+        shown.addstr(1, 2, "Fallock")
+        self.assertEqual(list(frame.changes(shown)), [])
+
+    def test_changes_are_runs(self):
+        shown = FrameBuffer(2, 10)
+        shown.addstr(0, 0, "abcdefghij")
+        frame = FrameBuffer(2, 10)
+        frame.addstr(0, 0, "abXYefghiZ")
+        frame.addstr(1, 4, "#")
+        self.assertEqual(list(frame.changes(shown)), [(0, 2, "XY"), (0, 9, "Z"), (1, 4, "#")])
+
+    def test_unknown_shadow_sends_everything(self):
+        frame = FrameBuffer(2, 3)
+        self.assertEqual(list(frame.changes(FrameBuffer(2, 3, UNKNOWN))), [(0, 0, "   "), (1, 0, "   ")])
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
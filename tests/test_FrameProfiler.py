@@ -0,0 +1,72 @@
+import unittest
+import json
+import os
+import tempfile
+from packages.FrameProfiler import FrameProfiler
+
+MS = 10**6
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.profiler = FrameProfiler(100, 50, clock=self.clock)
+
+    def run_pass(self, input_ms: float, logic_ms: float, render_ms: float, ticks: int, drew: bool):
+        self.profiler.start()
+        self.clock.now += round(input_ms * MS)
+        self.profiler.lap("INPUT")
+        self.clock.now += round(logic_ms * MS)
+        self.profiler.lap("LOGIC", ticks > 0)
+        self.clock.now += round(render_ms * MS)
+        self.profiler.lap("RENDER", drew)
+        self.profiler.finish(ticks, drew)
+        # the sleep is not part of the pass
+        self.clock.now += 5 * MS
+
+    def test_phases_and_budget(self):
+        for _ in range(9):
+            self.run_pass(0.1, 1, 2, 1, True)
+        self.run_pass(0.1, 30, 0, 2, False)
+
+        report = self.profiler.report()
+        self.assertEqual(report["phases"]["INPUT"]["count"], 10)
+        self.assertEqual(report["phases"]["RENDER"]["count"], 9)
+        self.assertEqual(report["phases"]["LOGIC"]["max"], 30 * MS)
+        self.assertEqual(report["over_budget"], 1)
+        self.assertEqual((report["ticks"], report["frames"]), (11, 9))
+
+    def test_achieved_rates(self):
+        for _ in range(100):
+            self.run_pass(0, 0, 0, 1, True)
+            self.clock.now += 5 * MS
+
+        report = self.profiler.report()
+        self.assertAlmostEqual(report["tickrate"], 100, delta=2)
+        self.assertAlmostEqual(report["framerate"], 100, delta=2)
+
+    def test_dump_on_request(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            self.profiler.dump_path = path
+            self.run_pass(0.1, 1, 2, 1, True)
+            self.assertFalse(os.path.exists(path))
+
+            self.profiler.request_dump()
+            self.run_pass(0.1, 1, 2, 1, True)
+            with open(path) as file:
+                report = json.load(file)
+            self.assertEqual(report["passes"], 2)
+            self.assertEqual(report["target_framerate"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
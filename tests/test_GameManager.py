@@ -6,6 +6,8 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
 from packages.GameManager import GameManager  # nopep8
+from packages.Board import Board  # nopep8
+from packages.Player import Player  # nopep8
 
 
 def run_manual_test():
@@ -15,6 +17,24 @@ def run_manual_test():
     mgr.menu(True)
 
 
+class GameManagerTester(unittest.TestCase):
+
+    def test_level_up_under_the_counter_still_falls(self):
+        # logic_tick only needs the match state, not the terminal
+        manager = GameManager.__new__(GameManager)
+        manager.board = Board(8, 16, Player(persistent=False), seed=1)
+        manager.recorder = None
+        manager.game_running = True
+        manager.animation_ticks = 2
+        manager.animation_counter = 0
+        manager.gravity_counter = 20
+
+        # the new interval is shorter than the ticks already counted
+        manager.board.level = 60
+        manager.logic_tick()
+        self.assertEqual(manager.board.player_piece.origin.y, 1)
+
+
 if __name__ == '__main__':
     if '--manual' in sys.argv:
         run_manual_test()
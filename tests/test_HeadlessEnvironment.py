@@ -0,0 +1,88 @@
+import unittest
+import subprocess
+import sys
+import random
+from unittest.mock import patch
+from packages.HeadlessEnvironment import HeadlessEnvironment
+from packages.Player import Player
+from packages.Difficulty import difficulty
+from packages.Command import Command
+
+PLAY_COMMANDS: list[Command] = ["LEFT", "RIGHT", "CLOCKWISE_ROTATION", None, None]
+
+
+def run_until_game_over(env: HeadlessEnvironment, seed: int) -> list[tuple[int, int, int]]:
+    commands = random.Random(seed)
+    env.reset(seed)
+    history: list[tuple[int, int, int]] = []
+    while not env.board.game_over:
+        result = env.step(commands.choice(PLAY_COMMANDS))
+        history.append((result.tick, result.score, env.board.player_piece.origin.x))
+    return history
+
+
+class HeadlessEnvironmentTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.env = HeadlessEnvironment(8, 16)
+
+    def test_reset_starts_a_fresh_match(self):
+        self.env.step("LEFT")
+        result = self.env.reset(3)
+
+        self.assertEqual(result.tick, 0)
+        self.assertEqual(result.score, 0)
+        self.assertFalse(result.game_over)
+        self.assertEqual(self.env.board.player_piece.origin.y, 0)
+
+    def test_piece_falls_at_difficulty_rate(self):
+        self.env.reset(1)
+        interval = difficulty(self.env.board.level)
+
+        for _ in range(interval):
+            self.env.step()
+        self.assertEqual(self.env.board.player_piece.origin.y, 0)
+
+        self.env.step()
+        self.assertEqual(self.env.board.player_piece.origin.y, 1)
+
+    def test_steps_until_game_over(self):
+        history = run_until_game_over(self.env, 5)
+
+        self.assertTrue(self.env.board.game_over)
+        self.assertEqual(history[-1][0], self.env.tick)
+
+        result = self.env.step("LEFT")
+        self.assertEqual(result.tick, self.env.tick)
+
+    def test_same_seed_replays_the_same_match(self):
+        self.assertEqual(run_until_game_over(self.env, 11),
+                         run_until_game_over(HeadlessEnvironment(8, 16), 11))
+
+    def test_never_sleeps_or_touches_save_file(self):
+        with patch("time.sleep", side_effect=AssertionError("slept")), \
+                patch.object(Player, "load_acummulated_score", side_effect=AssertionError("loaded")), \
+                patch.object(Player, "save_acummulated_score", side_effect=AssertionError("saved")):
+            run_until_game_over(self.env, 2)
+            self.env.player_manager.end_match()
+
+    def test_does_not_import_curses(self):
+        code = "import sys; import packages.HeadlessEnvironment; print('curses' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code],
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "False")
+
+    def test_level_up_under_the_counter_still_falls(self):
+        self.env.reset(1)
+        for _ in range(20):
+            self.env.step()
+        self.assertEqual(self.env.board.player_piece.origin.y, 0)
+
+        # the new interval is shorter than the ticks already counted
+        self.env.board.level = 60
+        self.env.step()
+        self.assertEqual(self.env.board.player_piece.origin.y, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
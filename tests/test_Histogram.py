@@ -0,0 +1,54 @@
+import unittest
+import random
+from packages.Histogram import Histogram
+
+
+class TestHistogram(unittest.TestCase):
+    def test_small_values_are_exact(self):
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.record(value)
+        self.assertEqual(histogram.percentile(50), 50)
+        self.assertEqual(histogram.percentile(99), 99)
+        self.assertEqual(histogram.percentile(100), 100)
+        self.assertEqual((histogram.min, histogram.max), (1, 100))
+
+    def test_large_values_within_precision(self):
+        histogram = Histogram(sub_bits=7)
+        rng = random.Random(5)
+        values = sorted(rng.randrange(10**3, 10**9) for _ in range(5000))
+        for value in values:
+            histogram.record(value)
+
+        for percent in (50, 90, 99):
+            exact = values[max(0, -(-len(values) * percent // 100) - 1)]
+            self.assertGreaterEqual(histogram.percentile(percent), exact)
+            self.assertLessEqual(histogram.percentile(percent), exact * (1 + 1 / 64))
+
+    def test_bucket_bounds_cover_every_value(self):
+        histogram = Histogram(highest=10**6, sub_bits=5)
+        for value in range(0, 10**6, 997):
+            index = histogram.index(value)
+            self.assertGreaterEqual(histogram.highest_equivalent(index), value)
+            if index > 0:
+                self.assertLess(histogram.highest_equivalent(index - 1), value)
+
+    def test_size_is_fixed(self):
+        histogram = Histogram(highest=10**6)
+        size = len(histogram.counts)
+        histogram.record(10**12)
+        histogram.record(-5)
+        self.assertEqual(len(histogram.counts), size)
+        self.assertEqual((histogram.min, histogram.max), (0, 10**6))
+
+    def test_reset(self):
+        histogram = Histogram()
+        histogram.record(42)
+        histogram.reset()
+        self.assertEqual(histogram.summary()["count"], 0)
+        self.assertEqual(histogram.percentile(50), 0)
+        self.assertEqual(histogram.buckets(), [])
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
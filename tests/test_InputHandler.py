@@ -1,6 +1,9 @@
 from unittest.mock import patch
+import curses
 import unittest
 from packages.InputHandler import InputHandler, Command, KeyPress
+from packages.AutoShift import AutoShift
+from packages.KeyListener import KeyListener
 import sys
 import os
 
@@ -71,5 +74,92 @@ class TestInputHandler(unittest.TestCase):
         self.assertIsNone(self.handler.get_command())
 
 
+class FakeWindow:
+    '''
+    Stands in for the curses window, getch hands out the queued keys.
+    '''
+
+    def __init__(self):
+        self.keys: list[int] = []
+
+    def keypad(self, flag: bool):
+        pass
+
+    def nodelay(self, flag: bool):
+        pass
+
+    def getch(self) -> int:
+        if not self.keys:
+            return curses.ERR
+        return self.keys.pop(0)
+
+
+class TestInputQueue(unittest.TestCase):
+    @patch('packages.InputHandler.curses.mousemask')
+    def setUp(self, MockMousemask):
+        self.window = FakeWindow()
+        self.read_fd, self.write_fd = os.pipe()
+        self.time = 0
+        self.handler = InputHandler(self.window, input_fd=self.read_fd, clock=lambda: self.time)  # type: ignore
+
+    def tearDown(self):
+        self.handler.close()
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+    def test_burst_is_handed_out_in_one_batch(self):
+        self.window.keys = [ord("a"), ord("a"), ord("e"), ord(" ")]
+        self.assertEqual(list(self.handler.commands()),
+                         ["LEFT", "LEFT", "CLOCKWISE_ROTATION", "HARD_DROP"])
+        self.assertEqual(list(self.handler.commands()), [])
+
+    def test_unbound_keys_are_dropped(self):
+        self.window.keys = [ord("x"), ord("d"), curses.KEY_MOUSE]
+        self.assertEqual(list(self.handler.commands()), ["RIGHT", "MOUSE_CLICK"])
+
+    def test_queue_is_timestamped(self):
+        self.time = 1000
+        self.window.keys = [ord("a")]
+        self.handler.drain()
+        self.time = 2000
+        self.window.keys = [ord("d")]
+        self.handler.drain()
+        self.assertEqual(list(self.handler.queue), [(1000, "LEFT"), (2000, "RIGHT")])
+
+    def test_commands_left_over_go_to_the_next_reader(self):
+        self.window.keys = [ord("a"), ord("d")]
+        commands = self.handler.commands()
+        self.assertEqual(next(commands), "LEFT")
+        self.assertEqual(self.handler.get_command(), "RIGHT")
+        self.assertEqual(list(commands), [])
+
+    def test_wait_wakes_on_readiness(self):
+        self.assertFalse(self.handler.wait(0))
+        os.write(self.write_fd, b"a")
+        self.assertTrue(self.handler.wait(1))
+
+    def test_wait_returns_at_once_with_queued_commands(self):
+        self.window.keys = [ord("a")]
+        self.handler.drain()
+        self.assertTrue(self.handler.wait(None))
+
+    def test_auto_shift_takes_the_sideways_keys(self):
+        self.handler.enable_auto_shift(AutoShift(das_ms=100, arr_ms=20))
+        self.window.keys = [ord("a"), ord("e")]
+        self.assertEqual(list(self.handler.commands()), ["CLOCKWISE_ROTATION"])
+        self.assertEqual(self.handler.shifts(), [("LEFT", 1)])
+
+    def test_dead_listener_keeps_the_terminal_fallback(self):
+        listener = KeyListener()
+        with patch.object(listener, "start", return_value=False):
+            self.handler.enable_auto_shift(AutoShift(das_ms=100, arr_ms=20), listener)
+        self.assertIsNone(self.handler.key_listener)
+        self.assertIsNotNone(self.handler.terminal_keys)
+
+        self.window.keys = [ord("d")]
+        list(self.handler.commands())
+        self.assertEqual(self.handler.shifts(), [("RIGHT", 1)])
+
+
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,62 @@
+import unittest
+from packages.Piece import Piece, PIECE_SHAPES
+from packages.Vector2 import Vector2
+
+
+class PieceTester(unittest.TestCase):
+
+    def test_rotation_table_matches_rotation_matrices(self):
+        for piece_type, shape in PIECE_SHAPES.items():
+            piece = Piece(Vector2(4, 4), piece_type)
+            blocks = [Vector2(x, y) for x, y in shape]
+
+            for is_clock_wise in (True, False, True, True, False, False, False):
+                blocks = [piece.vectorRightRotation(block, is_clock_wise)
+                          for block in blocks]
+                piece.rotateBlocks(is_clock_wise)
+                self.assertEqual(list(piece.blocks_relative_pos), blocks)
+
+    def test_four_rotations_return_to_spawn_state(self):
+        piece = Piece(Vector2(4, 4), "LINE")
+        spawn_offsets = piece.offsets
+
+        for _ in range(4):
+            piece.rotateBlocks(True)
+
+        self.assertEqual(piece.rotation, 0)
+        self.assertIs(piece.offsets, spawn_offsets)
+
+    def test_rotation_states_are_shared(self):
+        first = Piece(Vector2(1, 1), "PYRAMID")
+        second = Piece(Vector2(6, 3), "PYRAMID")
+        first.rotateBlocks(False)
+        second.rotateBlocks(False)
+
+        self.assertIs(first.offsets, second.offsets)
+        self.assertEqual(first.rotated_offsets(True), Piece.ROTATION_OFFSETS["PYRAMID"][0])
+
+    def test_blocks_cannot_corrupt_the_tables(self):
+        first = Piece(Vector2(1, 1), "PYRAMID")
+        second = Piece(Vector2(6, 3), "PYRAMID")
+
+        first.blocks_relative_pos[0].x += 1
+        self.assertEqual(second.blocks_relative_pos[0], Vector2(0, 0))
+        self.assertEqual(second.offsets[0], (0, 0))
+
+    def test_copy_is_independent(self):
+        piece = Piece(Vector2(3, 5), "HALF_SQUARE")
+        piece.rotateBlocks(True)
+
+        clone = piece.copy()
+        clone.origin.y += 1
+        clone.rotateBlocks(True)
+
+        self.assertEqual(piece.origin, Vector2(3, 5))
+        self.assertEqual(piece.rotation, 1)
+        self.assertEqual(clone.rotation, 2)
+        self.assertEqual(clone.type, "HALF_SQUARE")
+        self.assertEqual(clone.height, piece.height)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,88 @@
+import unittest
+from packages.Board import Board
+from packages.Block import Block
+from packages.Piece import Piece
+from packages.Player import Player
+from packages.Vector2 import Vector2
+from packages.Placements import Placement, enumerate_placements
+from packages.SimulationFarm import RandomPlacementPolicy
+
+
+def rest_cells(board: Board, placement: Placement) -> frozenset[tuple[int, int]]:
+    x, y, rotation = placement
+    offsets = Piece.ROTATION_OFFSETS[board.player_piece.type][rotation]
+    return frozenset((x + relative_x, y + relative_y) for relative_x, relative_y in offsets)
+
+
+class PlacementsTester(unittest.TestCase):
+
+    def test_empty_board_placements_rest_on_the_floor(self):
+        board = Board(8, 12, Player(persistent=False), seed=1)
+        board.player_piece = Piece(Vector2(4, 0), "LINE")
+        paths = board.reachable_placements()
+
+        horizontal = {placement for placement in paths if placement[2] % 2 == 0}
+        self.assertEqual({(x, y) for x, y, rotation in horizontal if rotation == 0},
+                         {(x, 11) for x in range(1, 6)})
+        for placement in paths:
+            self.assertEqual(max(y for _, y in rest_cells(board, placement)), 11)
+
+    def test_paths_lead_to_their_placement(self):
+        for seed in range(4):
+            for engine in ("GRID", "BITBOARD"):
+                board = Board(6, 14, Player(persistent=False), engine=engine, seed=seed)
+                policy = RandomPlacementPolicy(seed)
+                for _ in range(60):
+                    board.movement(policy.command(board))
+                    board.physics_logic()
+
+                if board.game_over:
+                    continue
+                for placement, path in board.reachable_placements().items():
+                    piece = board.player_piece.copy()
+                    probe = board.clone()
+                    probe.player_piece = piece
+                    for step in path:
+                        if step == None:
+                            self.assertFalse(probe.has_collided(piece))
+                            piece.origin.y += 1
+                        else:
+                            probe.movement(step)
+                    self.assertEqual((piece.origin.x, piece.origin.y, piece.rotation), placement)
+                    self.assertTrue(probe.has_collided(piece))
+
+    def test_finds_tucks_under_overhangs(self):
+        board = Board(6, 8, Player(persistent=False), seed=2)
+        # a roof over the two rightmost columns, only reachable by sliding under it
+        for x in range(3, 6):
+            board.grid[x][5] = Block()
+        board.player_piece = Piece(Vector2(1, 0), "LINE")
+        board.player_piece.rotation = 1
+
+        resting = {rest_cells(board, placement) for placement in board.reachable_placements()}
+        tucked = [cells for cells in resting if all(y > 5 for _, y in cells) and any(x > 3 for x, _ in cells)]
+        self.assertTrue(tucked)
+
+    def test_results_are_cached_by_position(self):
+        board = Board(8, 12, Player(persistent=False), seed=3)
+        first = board.reachable_placements()
+
+        self.assertIs(board.reachable_placements(), first)
+        board.grid[0][11] = Block()
+        self.assertIsNot(board.reachable_placements(), first)
+        board.grid[0][11] = None
+        self.assertIs(board.reachable_placements(), first)
+
+    def test_pieces_64_columns_apart_do_not_share_placements(self):
+        board = Board(200, 40, Player(persistent=False), storage="SPARSE", seed=3)
+        board.player_piece = Piece(Vector2(10, 37), "LINE")
+        near = board.reachable_placements()
+
+        board.player_piece = Piece(Vector2(74, 37), "LINE")
+        far = board.reachable_placements()
+        self.assertIsNot(far, near)
+        self.assertEqual(set(far), set(enumerate_placements(board, board.player_piece)))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,94 @@
+import unittest
+import pickle
+from packages.RandomGenerator import RandomGenerator
+from packages.Board import Board
+from packages.Player import Player
+from packages.Piece import PIECE_TYPE_CHOICES
+from packages.PowerUp import POWER_UP_CHOICES
+
+
+def piece_types(board: Board) -> list[str]:
+    return [board.player_piece.type] + [piece.type for piece in board.spawnlist]
+
+
+class RandomGeneratorTester(unittest.TestCase):
+
+    def test_same_seed_rolls_the_same_sequence(self):
+        first = RandomGenerator(42, chunk_size=8)
+        second = RandomGenerator(42, chunk_size=8)
+
+        self.assertEqual([first.next_piece_type() for _ in range(50)],
+                         [second.next_piece_type() for _ in range(50)])
+        self.assertEqual([first.next_power_up() for _ in range(20)],
+                         [second.next_power_up() for _ in range(20)])
+
+    def test_power_ups_do_not_shift_the_piece_sequence(self):
+        first = RandomGenerator(7)
+        second = RandomGenerator(7)
+        for _ in range(5):
+            second.next_power_up()
+
+        self.assertEqual([first.next_piece_type() for _ in range(300)],
+                         [second.next_piece_type() for _ in range(300)])
+
+    def test_rolls_every_choice(self):
+        generator = RandomGenerator(3, chunk_size=16)
+        pieces = {generator.next_piece_type() for _ in range(100)}
+        power_ups = {generator.next_power_up() for _ in range(100)}
+
+        self.assertEqual(pieces, set(PIECE_TYPE_CHOICES))
+        self.assertEqual(power_ups, set(POWER_UP_CHOICES))
+
+    def test_copy_continues_the_sequence(self):
+        generator = RandomGenerator(5, chunk_size=4)
+        for _ in range(6):
+            generator.next_piece_type()
+
+        clone = generator.copy()
+        expected = [generator.next_piece_type() for _ in range(20)]
+        self.assertEqual([clone.next_piece_type() for _ in range(20)], expected)
+
+        restored: RandomGenerator = pickle.loads(pickle.dumps(clone))
+        self.assertEqual(restored.next_power_up(), generator.next_power_up())
+
+    def test_unseeded_generators_pick_a_seed(self):
+        self.assertNotEqual(RandomGenerator().seed, RandomGenerator().seed)
+
+
+class BoardSeedTester(unittest.TestCase):
+
+    def test_board_exposes_its_seed(self):
+        board = Board(9, 20, Player(persistent=False))
+        replayed = Board(9, 20, Player(persistent=False), seed=board.seed)
+
+        self.assertEqual(piece_types(board), piece_types(replayed))
+
+    def test_seeded_boards_spawn_the_same_pieces(self):
+        first = Board(9, 20, Player(persistent=False), seed=1234)
+        second = Board(9, 20, Player(persistent=False), seed=1234)
+        for _ in range(40):
+            first.generate_piece()
+            second.generate_piece()
+
+        self.assertEqual(piece_types(first), piece_types(second))
+
+    def test_power_ups_roll_from_the_board(self):
+        first = Player(persistent=False)
+        second = Player(persistent=False)
+        Board(9, 20, first, seed=99)
+        Board(9, 20, second, seed=99)
+
+        names: list[tuple[str | None, str | None]] = []
+        for _ in range(10):
+            first.add_powerup()
+            second.add_powerup()
+            names.append((first.power_up.name, second.power_up.name))
+            first.power_up.name = None
+            second.power_up.name = None
+
+        for first_name, second_name in names:
+            self.assertEqual(first_name, second_name)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 import sys
 import os
 import time
@@ -12,6 +13,106 @@ from packages.Board import Board  # nopep8
 from packages.Player import Player  # nopep8
 
 
+class FakeWindow:
+    '''
+    Records what a renderer sends to the terminal.
+    '''
+
+    def __init__(self, height: int = 50, width: int = 120):
+        self.height = height
+        self.width = width
+        self.sent: list[tuple[int, int, str]] = []
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.height, self.width
+
+    def addstr(self, y: int, x: int, text: str):
+        self.sent.append((y, x, text))
+
+    def noutrefresh(self):
+        pass
+
+    def erase(self):
+        pass
+
+
+@patch('packages.Renderer.curses.doupdate')
+@patch('packages.Renderer.curses.curs_set')
+@patch('packages.Renderer.curses.LINES', 50, create=True)
+@patch('packages.Renderer.curses.COLS', 120, create=True)
+class TestDirtyRendering(unittest.TestCase):
+    def make_renderer(self) -> tuple[Renderer, FakeWindow]:
+        window = FakeWindow()
+        return Renderer(window, Vector2(12, 20)), window  # type: ignore
+
+    def test_unchanged_board_is_skipped(self, *mocks):
+        renderer, window = self.make_renderer()
+        board = Board(12, 20, Player(persistent=False), seed=1)
+
+        self.assertTrue(renderer.draw(board))
+        window.sent.clear()
+        self.assertFalse(renderer.draw(board))
+        self.assertEqual(window.sent, [])
+
+    def test_only_changed_cells_are_sent(self, *mocks):
+        renderer, window = self.make_renderer()
+        board = Board(12, 20, Player(persistent=False), seed=1)
+        renderer.draw(board)
+        first_frame = sum(len(text) for _, _, text in window.sent)
+
+        window.sent.clear()
+        board.physics_logic()
+        self.assertTrue(renderer.draw(board))
+        cells = sum(len(text) for _, _, text in window.sent)
+        self.assertGreater(cells, 0)
+        self.assertLess(cells, first_frame // 10)
+
+    def test_frame_matches_full_redraw(self, *mocks):
+        renderer, window = self.make_renderer()
+        board = Board(12, 20, Player(persistent=False), seed=2)
+        screen = [[" "] * window.width for _ in range(window.height)]
+        for _ in range(40):
+            board.movement("LEFT" if board.physics_ticks % 3 else "CLOCKWISE_ROTATION")
+            board.physics_logic()
+            renderer.draw(board)
+            for y, x, text in window.sent:
+                screen[y][x:x + len(text)] = text
+            window.sent.clear()
+
+        self.assertEqual(screen, renderer.shown.rows)
+        fresh, fresh_window = self.make_renderer()
+        fresh.draw(board)
+        self.assertEqual(screen, fresh.shown.rows)
+
+    def test_resize_redraws_an_unchanged_board(self, *mocks):
+        renderer, window = self.make_renderer()
+        board = Board(12, 20, Player(persistent=False), seed=1)
+        renderer.draw(board)
+
+        window.height, window.width = 40, 100
+        window.sent.clear()
+        self.assertTrue(renderer.draw(board))
+        self.assertGreater(len(window.sent), 0)
+        self.assertFalse(renderer.draw(board))
+
+    def test_blocked_moves_keep_the_frame(self, *mocks):
+        renderer, window = self.make_renderer()
+        board = Board(12, 20, Player(persistent=False), seed=1)
+        while board.piece_can_move("LEFT"):
+            board.movement("LEFT")
+        renderer.draw(board)
+
+        board.movement("LEFT")
+        self.assertFalse(renderer.draw(board))
+
+    def test_menus_force_the_next_board_frame(self, *mocks):
+        renderer, window = self.make_renderer()
+        board = Board(12, 20, Player(persistent=False), seed=1)
+        renderer.draw(board)
+        renderer.show_alert("Pausa")
+        self.assertTrue(renderer.draw(board))
+
+
 def run_manual_test():
     being_debugged = 'TERM_PROGRAM' in os.environ.keys()
     if being_debugged != True:
@@ -0,0 +1,106 @@
+import unittest
+import tempfile
+import random
+import os
+from packages.Replay import Replay, REPLAY_COMMANDS, write_varint, read_varint
+from packages.ReplayRecorder import ReplayRecorder
+from packages.Board import Board, CollapseModes
+from packages.Player import Player
+from packages.Command import Command
+from packages.SimulationFarm import RandomPlacementPolicy
+
+MOVES: list[Command] = [command for command in REPLAY_COMMANDS if command != None]
+
+
+def occupancy(board: Board) -> list[list[bool]]:
+    return [[cell != None for cell in column] for column in board.grid]
+
+
+def record_match(path: str, seed: int, collapse_mode: CollapseModes = "ANIMATED") -> Board:
+    # interleaves physics ticks and inputs irregularly, like the real time game loop does
+    board = Board(6, 14, Player(persistent=False), collapse_mode=collapse_mode, seed=seed)
+    recorder = ReplayRecorder.for_board(board, path)
+    recorder.flush_size = 64
+    policy = RandomPlacementPolicy(seed)
+    inputs = random.Random(seed)
+
+    while not board.game_over:
+        if inputs.random() < 0.3:
+            board.physics_logic()
+        else:
+            command: Command = inputs.choice([policy.command(board), "ESCAPE"])
+            recorder.record(board.physics_ticks, command)
+            if command in MOVES:
+                board.movement(command)
+        recorder.checkpoint(board.physics_ticks, board.player_manager.score)
+
+    recorder.close(board.physics_ticks, board.player_manager.score)
+    return board
+
+
+class ReplayTester(unittest.TestCase):
+
+    def test_varint_round_trip(self):
+        buffer = bytearray()
+        values = [0, 1, 127, 128, 300, 2**40 + 5]
+        for value in values:
+            write_varint(buffer, value)
+
+        position = 0
+        for value in values:
+            decoded, position = read_varint(buffer, position)
+            self.assertEqual(decoded, value)
+        self.assertEqual(position, len(buffer))
+        self.assertEqual(len(buffer), 1 + 1 + 1 + 2 + 2 + 6)
+
+    def test_bytes_round_trip(self):
+        replay = Replay(2**63 + 9, 12, 20, 3, "INSTANT", 1.5,
+                        [(0, "LEFT"), (0, "HARD_DROP"), (40, "CLOCKWISE_ROTATION"), (5000, "TRIGGER_POWERUP")],
+                        final_tick=5003, final_score=1200)
+
+        self.assertEqual(Replay.from_bytes(replay.to_bytes()), replay)
+
+    def test_checkpoints_keep_their_place_in_the_stream(self):
+        replay = Replay(1, 6, 14, events=[(3, "LEFT"), (3, "RIGHT"), (9, "HARD_DROP")],
+                        checkpoints=[(1, 3, 100), (3, 12, 300)], final_tick=12, final_score=300)
+        decoded = Replay.from_bytes(replay.to_bytes())
+
+        self.assertEqual(decoded, replay)
+        self.assertEqual(list(decoded.stream()), [(3, "LEFT", None), (3, None, 100), (3, "RIGHT", None),
+                                                  (9, "HARD_DROP", None), (12, None, 300)])
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            Replay.from_bytes(bytes(64))
+
+    def test_playback_reproduces_the_match(self):
+        scores: list[int] = []
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in range(8):
+                for collapse_mode in ("ANIMATED", "INSTANT"):
+                    path = os.path.join(directory, f"{seed}{collapse_mode}.flrp")
+                    board = record_match(path, seed, collapse_mode)
+                    replay = Replay.load(path)
+                    replayed = replay.play()
+
+                    self.assertEqual(replay.final_score, board.player_manager.score)
+                    self.assertEqual(replayed.physics_ticks, board.physics_ticks)
+                    self.assertEqual(replayed.player_manager.score, board.player_manager.score)
+                    self.assertEqual(occupancy(replayed), occupancy(board))
+                    self.assertTrue(replayed.game_over)
+                    scores.append(board.player_manager.score)
+
+        # the recorded matches must have cleared lines and rolled power ups
+        self.assertTrue(any(scores))
+
+    def test_recording_is_compact(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "match.flrp")
+            record_match(path, 11)
+            replay = Replay.load(path)
+
+            self.assertLess(os.path.getsize(path), 32 + 2 * len(replay.events))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
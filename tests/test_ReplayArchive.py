@@ -0,0 +1,93 @@
+import unittest
+import tempfile
+import os
+from packages.Replay import Replay
+from packages.ReplayArchive import ReplayArchive
+from packages.Keyframe import encode_keyframe, restore_keyframe
+from packages.Board import Board, CollapseModes
+from tests.test_Replay import record_match, occupancy
+
+
+def board_state(board: Board) -> tuple[object, ...]:
+    piece = board.player_piece
+    return (occupancy(board), board.physics_ticks, board.player_manager.score,
+            board.player_manager.power_up.name, board.player_manager.power_up.is_active,
+            piece.type, piece.rotation, piece.origin.copy(), [spawn.type for spawn in board.spawnlist],
+            board.collapse_height, board.scan_height, board.is_animating, board.level,
+            board.lines_cleared, board.pieces_placed, board.game_over, board.row_counts.copy())
+
+
+def states_by_tick(replay: Replay) -> list[tuple[object, ...]]:
+    # the reference run, the state after every tick and the commands stamped with it
+    board = replay.new_board()
+    states: list[tuple[object, ...]] = []
+    next_event = 0
+    for tick in range(replay.final_tick + 1):
+        while next_event < len(replay.events) and replay.events[next_event][0] == tick:
+            board.movement(replay.events[next_event][1])
+            next_event += 1
+        states.append(board_state(board))
+        board.physics_logic()
+    return states
+
+
+class ReplayArchiveTester(unittest.TestCase):
+
+    def record(self, directory: str, seed: int, collapse_mode: CollapseModes = "ANIMATED") -> Replay:
+        path = os.path.join(directory, f"{seed}.flrp")
+        record_match(path, seed, collapse_mode)
+        return Replay.load(path)
+
+    def test_keyframe_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            replay = self.record(directory, 3)
+
+        board = replay.play()
+        restored = replay.new_board()
+        restore_keyframe(restored, encode_keyframe(board))
+        self.assertEqual(board_state(restored), board_state(board))
+
+        # the restored random streams keep rolling the same pieces
+        for _ in range(300):
+            board.generate_piece()
+            restored.generate_piece()
+        self.assertEqual([piece.type for piece in restored.spawnlist],
+                         [piece.type for piece in board.spawnlist])
+
+    def test_seek_matches_full_simulation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for seed, collapse_mode in ((2, "ANIMATED"), (5, "INSTANT")):
+                replay = self.record(directory, seed, collapse_mode)
+                archive_path = os.path.join(directory, f"{seed}.flra")
+                ReplayArchive.write(replay, archive_path, interval=16)
+                expected = states_by_tick(replay)
+
+                with ReplayArchive(archive_path) as archive:
+                    self.assertEqual(archive.replay.final_tick, replay.final_tick)
+                    self.assertEqual(archive.replay.final_score, replay.final_score)
+                    self.assertEqual(archive.keyframe_ticks(), list(range(0, replay.final_tick + 1, 16)))
+
+                    for tick in list(range(0, replay.final_tick + 1, 7)) + [replay.final_tick]:
+                        self.assertEqual(board_state(archive.seek(tick)), expected[tick], f"tick {tick}")
+
+    def test_seek_clamps_to_the_match(self):
+        with tempfile.TemporaryDirectory() as directory:
+            replay = self.record(directory, 1)
+            archive_path = os.path.join(directory, "1.flra")
+            ReplayArchive.write(replay, archive_path, interval=8)
+
+            with ReplayArchive(archive_path) as archive:
+                board = archive.seek(10**9)
+                self.assertEqual(board.physics_ticks, replay.final_tick)
+                self.assertEqual(board.player_manager.score, replay.final_score)
+                self.assertEqual(archive.seek(-5).physics_ticks, 0)
+
+    def test_rejects_plain_replays(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.record(directory, 4)
+            with self.assertRaises(ValueError):
+                ReplayArchive(os.path.join(directory, "4.flrp"))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
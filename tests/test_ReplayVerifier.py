@@ -0,0 +1,91 @@
+import unittest
+import tempfile
+import os
+from packages.Replay import Replay
+from packages.ReplayVerifier import ReplayVerifier, verify_replay
+from tests.test_Replay import record_match
+
+
+class ReplayVerifierTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths: list[str] = []
+        self.scoring_path = ""
+        for seed in range(12):
+            path = os.path.join(self.directory.name, f"{seed}.flrp")
+            board = record_match(path, seed)
+            self.paths.append(path)
+            if board.player_manager.score > 0 and not self.scoring_path:
+                self.scoring_path = path
+        self.assertTrue(self.scoring_path)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def tamper(self, name: str, replay: Replay) -> str:
+        path = os.path.join(self.directory.name, name)
+        replay.save(path)
+        return path
+
+    def test_honest_replays_verify(self):
+        report = ReplayVerifier(workers=1).verify_directory(self.directory.name)
+
+        self.assertEqual(len(report.results), 12)
+        self.assertEqual(report.rejected, [])
+        self.assertGreater(report.replays_per_second, 0)
+
+    def test_parallel_matches_serial(self):
+        self.tamper("inflated.flrp", Replay.load(self.scoring_path))
+        serial = ReplayVerifier(workers=1).verify_directory(self.directory.name)
+        parallel = ReplayVerifier(workers=3).verify_directory(self.directory.name)
+
+        self.assertEqual(parallel.results, serial.results)
+
+    def test_inflated_score_is_rejected(self):
+        replay = Replay.load(self.scoring_path)
+        replay.final_score += 100
+        result = verify_replay(self.tamper("inflated.flrp", replay))
+
+        self.assertFalse(result.matches)
+        self.assertEqual(result.divergence_reason, "FINAL_SCORE")
+        self.assertEqual(result.claimed_score, replay.final_score)
+        self.assertEqual(result.simulated_score, replay.final_score - 100)
+
+    def test_lowered_score_stops_early(self):
+        replay = Replay.load(self.scoring_path)
+        replay.final_score = 0
+        replay.checkpoints = []
+        path = self.tamper("lowered.flrp", replay)
+
+        result = verify_replay(path)
+        self.assertEqual(result.divergence_reason, "SCORE_EXCEEDED")
+        self.assertEqual(result.divergence_tick, result.simulated_ticks)
+
+        full = verify_replay(path, stop_early=False)
+        self.assertEqual(full.divergence_tick, result.divergence_tick)
+        self.assertEqual(full.simulated_ticks, replay.final_tick)
+
+    def test_tampered_checkpoint_reports_its_tick(self):
+        replay = Replay.load(self.scoring_path)
+        events, tick, score = replay.checkpoints[0]
+        replay.checkpoints[0] = (events, tick, score + 10)
+        result = verify_replay(self.tamper("checkpoint.flrp", replay))
+
+        self.assertFalse(result.matches)
+        self.assertEqual(result.divergence_reason, "CHECKPOINT")
+        self.assertEqual(result.divergence_tick, tick)
+        self.assertLessEqual(result.simulated_ticks, tick)
+
+    def test_corrupt_files_are_rejected(self):
+        path = os.path.join(self.directory.name, "corrupt.flrp")
+        with open(path, "wb") as file:
+            file.write(b"FLRP\x01" + bytes(8))
+
+        result = verify_replay(path)
+        self.assertFalse(result.matches)
+        self.assertEqual(result.divergence_reason, "CORRUPT")
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,79 @@
+import unittest
+from packages.Scheduler import Scheduler
+
+MS = 10**6
+
+
+class FakeClock:
+    now: int
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+
+class SchedulerTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        # a tick every 10 ms and a frame every 25 ms
+        self.scheduler = Scheduler(100, 40, max_ticks=5, clock=self.clock)
+
+    def test_ticks_come_from_the_accumulator(self):
+        self.assertEqual(self.scheduler.due_ticks(), 0)
+
+        self.clock.now = 9 * MS
+        self.assertEqual(self.scheduler.due_ticks(), 0)
+        self.clock.now = 25 * MS
+        self.assertEqual(self.scheduler.due_ticks(), 2)
+        # the 5 ms left over count towards the next tick
+        self.clock.now = 30 * MS
+        self.assertEqual(self.scheduler.due_ticks(), 1)
+
+        total = 0
+        for now in [*range(31, 1000, 7), 1000]:
+            self.clock.now = now * MS
+            total += self.scheduler.due_ticks()
+        self.assertEqual(total + 3, 100)
+
+    def test_long_stalls_are_dropped(self):
+        self.clock.now = 1000 * MS
+        self.assertEqual(self.scheduler.due_ticks(), 5)
+        self.assertEqual(self.scheduler.due_ticks(), 0)
+        self.assertLess(self.scheduler.accumulator, self.scheduler.tick_ns)
+
+    def test_frames_have_their_own_deadline(self):
+        self.assertTrue(self.scheduler.frame_due())
+        self.assertFalse(self.scheduler.frame_due())
+
+        self.clock.now = 25 * MS
+        self.assertTrue(self.scheduler.frame_due())
+        # a late frame is drawn once and the next one is a full period away
+        self.clock.now = 140 * MS
+        self.assertTrue(self.scheduler.frame_due())
+        self.assertFalse(self.scheduler.frame_due())
+        self.clock.now = 164 * MS
+        self.assertFalse(self.scheduler.frame_due())
+        self.clock.now = 165 * MS
+        self.assertTrue(self.scheduler.frame_due())
+
+    def test_timeout_reaches_the_next_event(self):
+        self.scheduler.frame_due()
+        self.assertEqual(self.scheduler.timeout_ns(), 10 * MS)
+
+        self.clock.now = 12 * MS
+        self.scheduler.due_ticks()
+        self.assertEqual(self.scheduler.timeout_ns(), 8 * MS)
+
+        self.clock.now = 24 * MS
+        self.scheduler.due_ticks()
+        self.assertEqual(self.scheduler.timeout_ns(), 1 * MS)
+
+        self.clock.now = 40 * MS
+        self.assertEqual(self.scheduler.timeout_ns(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,141 @@
+import unittest
+import asyncio
+import random
+from packages.Board import Board
+from packages.Session import Session
+from packages.SessionRuntime import SessionRuntime
+from packages.Command import Command
+
+PLAY_COMMANDS: list[Command] = ["LEFT", "RIGHT", "CLOCKWISE_ROTATION",
+                                "HARD_DROP", "TRIGGER_POWERUP", None, None]
+
+
+async def play_randomly(runtime: SessionRuntime, session_id: int, seed: int):
+    rng = random.Random(seed)
+    while session_id in runtime.sessions:
+        runtime.send(session_id, rng.choice(PLAY_COMMANDS))
+        await asyncio.sleep(0.002)
+
+
+def broken_difficulty(level: int) -> int:
+    raise ValueError("broken curve")
+
+
+def broken_render(board: Board):
+    raise RuntimeError("no screen")
+
+
+class SessionTester(unittest.TestCase):
+
+    def test_physics_follows_the_difficulty(self):
+        async def run() -> tuple[int, int]:
+            slow = Session(seed=1, tickrate=1000, difficulty_curve=lambda level: 20)
+            fast = Session(seed=1, tickrate=1000, difficulty_curve=lambda level: 5)
+            tasks = [asyncio.create_task(session.run()) for session in (slow, fast)]
+            await asyncio.sleep(0.2)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return slow.board.physics_ticks, fast.board.physics_ticks
+
+        slow_ticks, fast_ticks = asyncio.run(run())
+        self.assertTrue(7 <= slow_ticks <= 10, slow_ticks)
+        self.assertTrue(25 <= fast_ticks <= 40, fast_ticks)
+
+    def test_commands_and_rendering(self):
+        frames: list[int] = []
+
+        def render(board: Board):
+            frames.append(board.physics_ticks)
+
+        async def run() -> Session:
+            session = Session(seed=2, tickrate=2000, framerate=200, render=render)
+            task = asyncio.create_task(session.run())
+            await asyncio.sleep(0.01)
+            session.send("HARD_DROP")
+            session.send("HARD_DROP")
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return session
+
+        session = asyncio.run(run())
+        self.assertEqual(session.board.pieces_placed, 2)
+        self.assertTrue(frames)
+        # frames are capped by the framerate, physics ran every few milliseconds
+        self.assertLess(len(frames), 20)
+
+    def test_runtime_hosts_many_sessions(self):
+        async def run() -> SessionRuntime:
+            runtime = SessionRuntime()
+            players = []
+            for seed in range(200):
+                session_id = runtime.start(Session(8, 12, seed=seed, collapse_mode="INSTANT",
+                                                   tickrate=1000, difficulty_curve=lambda level: 4))
+                players.append(asyncio.create_task(play_randomly(runtime, session_id, seed)))
+
+            self.assertEqual(len(runtime.sessions), 200)
+            await asyncio.wait_for(runtime.join(), 30)
+            await asyncio.gather(*players)
+            return runtime
+
+        runtime = asyncio.run(run())
+        self.assertEqual(runtime.sessions, {})
+        self.assertEqual(len(runtime.results), 200)
+        self.assertTrue(all(result.game_over for result in runtime.results.values()))
+        # every session ran its own match
+        self.assertGreater(len({result.physics_ticks for result in runtime.results.values()}), 20)
+
+    def test_stopped_sessions_keep_their_result(self):
+        async def run() -> SessionRuntime:
+            runtime = SessionRuntime()
+            session_id = runtime.start(Session(seed=3, tickrate=1000))
+            await asyncio.sleep(0.05)
+            runtime.stop(session_id)
+            await runtime.join()
+            return runtime
+
+        runtime = asyncio.run(run())
+        self.assertFalse(runtime.results[0].game_over)
+        self.assertGreater(runtime.results[0].physics_ticks, 0)
+
+    def test_failed_sessions_keep_their_result_and_error(self):
+        async def run() -> SessionRuntime:
+            runtime = SessionRuntime()
+            runtime.start(Session(seed=3, tickrate=1000, difficulty_curve=broken_difficulty))
+            runtime.start(Session(8, 12, seed=4, collapse_mode="INSTANT", tickrate=1000,
+                                  difficulty_curve=lambda level: 1))
+            await asyncio.wait_for(runtime.join(), 30)
+            return runtime
+
+        with self.assertLogs("packages.SessionRuntime", "ERROR") as logs:
+            runtime = asyncio.run(run())
+
+        self.assertEqual(runtime.sessions, {})
+        self.assertEqual(runtime.results[0].error, "ValueError: broken curve")
+        self.assertFalse(runtime.results[0].game_over)
+        self.assertIsNone(runtime.results[1].error)
+        self.assertTrue(runtime.results[1].game_over)
+        self.assertIn("session 0 failed", logs.output[0])
+
+    def test_a_failing_render_stops_the_session(self):
+        async def run() -> SessionRuntime:
+            runtime = SessionRuntime()
+            session = Session(seed=5, tickrate=1000, render=broken_render)
+            runtime.start(session)
+            await asyncio.wait_for(runtime.join(), 5)
+            ticks = session.board.physics_ticks
+            # nothing of the session is left running
+            await asyncio.sleep(0.05)
+            self.assertEqual(session.board.physics_ticks, ticks)
+            return runtime
+
+        with self.assertLogs("packages.SessionRuntime", "ERROR"):
+            runtime = asyncio.run(run())
+
+        self.assertEqual(runtime.results[0].error, "RuntimeError: no screen")
+        self.assertFalse(runtime.results[0].game_over)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
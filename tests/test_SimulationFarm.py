@@ -0,0 +1,84 @@
+import unittest
+import functools
+import tempfile
+import json
+import csv
+import os
+from packages.SimulationFarm import SimulationFarm, MatchConfig, play_match
+from packages.Difficulty import shifted_difficulty
+
+def broken_difficulty(level: int) -> int:
+    raise ValueError("broken curve")
+
+
+CONFIGS = [MatchConfig(6, 12, max_ticks=5000),
+           MatchConfig(6, 12, functools.partial(shifted_difficulty, 10), 2.0, max_ticks=5000)]
+
+
+class SimulationFarmTester(unittest.TestCase):
+
+    def test_same_master_seed_reproduces_the_run(self):
+        serial = SimulationFarm(CONFIGS, 4, master_seed=7, workers=1)
+        parallel = SimulationFarm(CONFIGS, 4, master_seed=7, workers=3)
+
+        self.assertEqual(list(serial.results()),
+                         sorted(parallel.results(), key=lambda result: result.job))
+
+    def test_match_counters(self):
+        result = play_match(0, 0, MatchConfig(6, 12), 3)
+
+        self.assertTrue(result.game_over)
+        self.assertGreater(result.pieces, 0)
+        self.assertGreater(result.ticks, 0)
+        # the level goes up once per clear, which removes at least one line
+        self.assertLessEqual(result.level - 1, result.lines)
+
+    def test_score_multiplier_scales_the_score(self):
+        normal = play_match(0, 0, MatchConfig(6, 12), 5)
+        doubled = play_match(0, 0, MatchConfig(6, 12, score_multiplier=2.0), 5)
+
+        self.assertEqual(doubled.lines, normal.lines)
+        self.assertEqual(doubled.score, normal.score * 2)
+
+    def test_writes_csv_and_jsonl(self):
+        farm = SimulationFarm(CONFIGS, 3, master_seed=1, workers=2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "results.csv")
+            jsonl_path = os.path.join(directory, "results.jsonl")
+            summaries = farm.run(csv_path)
+            farm.run(jsonl_path)
+
+            with open(csv_path, newline="") as file:
+                rows = list(csv.DictReader(file))
+            with open(jsonl_path) as file:
+                records = [json.loads(line) for line in file]
+
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(sorted(int(row["seed"]) for row in rows),
+                         sorted(record["seed"] for record in records))
+        self.assertEqual(list(summaries), [config.label() for config in CONFIGS])
+
+        pieces = [int(row["pieces"]) for row in rows if row["config"] == "0"]
+        summary = summaries[CONFIGS[0].label()]["pieces"]
+        self.assertEqual(summary.minimum, min(pieces))
+        self.assertEqual(summary.maximum, max(pieces))
+
+    def test_configs_need_distinct_labels(self):
+        configs = [MatchConfig(6, 12, max_ticks=5000), MatchConfig(6, 12, max_ticks=5000, engine="GRID"),
+                   MatchConfig(6, 12, max_ticks=5000, policy="AUTOPLAYER"), MatchConfig(6, 12, max_ticks=4000)]
+        self.assertEqual(len({config.label() for config in configs}), len(configs))
+
+        with self.assertRaises(ValueError):
+            SimulationFarm([CONFIGS[0], MatchConfig(6, 12, max_ticks=5000)], 2)
+
+    def test_worker_failure_is_raised_instead_of_hanging(self):
+        farm = SimulationFarm([CONFIGS[0], MatchConfig(6, 12, broken_difficulty)], 2, master_seed=3, workers=2)
+
+        with self.assertRaises(RuntimeError) as raised:
+            list(farm.results())
+        self.assertIn("broken curve", str(raised.exception))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
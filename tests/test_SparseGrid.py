@@ -0,0 +1,131 @@
+import unittest
+import pickle
+import tracemalloc
+import random
+from packages.Board import Board
+from packages.Block import Block
+from packages.Player import Player
+from packages.HeadlessEnvironment import HeadlessEnvironment
+from packages.SimulationFarm import RandomPlacementPolicy
+from packages.Command import Command
+
+PLAY_COMMANDS: list[Command] = ["LEFT", "RIGHT", "CLOCKWISE_ROTATION",
+                                "HARD_DROP", "TRIGGER_POWERUP", None, None]
+
+
+def occupancy(board: Board) -> list[list[bool]]:
+    return [[cell != None for cell in column] for column in board.grid]
+
+
+class SparseGridTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.board = Board(9, 40, Player(persistent=False), storage="SPARSE")
+
+    def test_reads_and_writes_like_the_list_grid(self):
+        self.board.grid[3][39] = Block()
+        self.board.grid[4][-1] = Block('@')
+
+        self.assertEqual(len(self.board.grid), 9)
+        self.assertEqual(len(self.board.grid[0]), 40)
+        self.assertEqual(len(list(self.board.grid[0])), 40)
+        self.assertIs(self.board.grid[3][39], Block.shared())
+        self.assertEqual(self.board.grid[4][39].symbol, '@')  # type: ignore
+        self.assertIsNone(self.board.grid[5][39])
+        self.assertIsNone(self.board.grid[5][0])
+        self.assertEqual(self.board.row_counts[39], 2)
+
+        with self.assertRaises(IndexError):
+            self.board.grid[0][40]
+
+    def test_only_chunks_with_blocks_are_stored(self):
+        grid = self.board.grid
+        self.assertEqual(grid.chunks, {})  # type: ignore
+
+        grid[0][39] = Block()
+        grid[1][2] = Block()
+        self.assertEqual(sorted(grid.chunks), [0, 2])  # type: ignore
+
+        grid[0][39] = None
+        self.assertEqual(sorted(grid.chunks), [0])  # type: ignore
+
+    def test_matches_the_list_grid_in_play(self):
+        for seed in range(4):
+            boards = [Board(7, 30, Player(persistent=False), engine="BITBOARD", storage=storage, seed=seed)  # type: ignore
+                      for storage in ("LIST", "SPARSE")]
+            policies = [RandomPlacementPolicy(seed) for _ in boards]
+
+            for _ in range(2000):
+                for board, policy in zip(boards, policies):
+                    if not board.game_over:
+                        board.movement(policy.command(board))
+                        board.physics_logic()
+
+            listed, sparse = boards
+            self.assertEqual(occupancy(sparse), occupancy(listed))
+            self.assertEqual(sparse.position_hash(), listed.position_hash())
+            self.assertEqual(sparse.player_manager.score, listed.player_manager.score)
+
+    def test_snapshot_clone_and_pickle(self):
+        board = self.board
+        policy = RandomPlacementPolicy(3)
+        for _ in range(400):
+            board.movement(policy.command(board))
+            board.physics_logic()
+
+        expected = occupancy(board)
+        snapshot = board.snapshot()
+        clone = board.clone()
+        loaded = pickle.loads(pickle.dumps(board.grid))
+
+        for x in range(board.width):
+            board.grid[x][board.height - 1] = None
+        self.assertEqual(occupancy(clone), expected)
+        self.assertEqual([[cell != None for cell in column] for column in loaded], expected)
+
+        board.restore(snapshot)
+        self.assertEqual(occupancy(board), expected)
+
+    def test_memory_follows_the_blocks(self):
+        tracemalloc.start()
+        board = Board(200, 5000, Player(persistent=False), storage="SPARSE", seed=1)
+        for x in range(200):
+            board.grid[x][4999] = Block()
+        board.position_hash()
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # a single list column of that board already takes 40 KB, the whole list grid 8 MB
+        self.assertLess(used, 1_000_000)
+        self.assertEqual(len(board.grid.chunks), 1)  # type: ignore
+
+    def test_retired_rows_scroll_the_stack(self):
+        board = Board(6, 20, Player(persistent=False), storage="SPARSE", seed=2)
+        for y in range(10, 20):
+            board.grid[0][y] = Block()
+        board.grid[3][12] = Block()
+
+        self.assertEqual(board.retire_rows(6), 4)
+        self.assertEqual(board.column_heights[0], 14)
+        self.assertEqual(sum(board.row_counts), 7)
+        self.assertIsNotNone(board.grid[3][16])
+        self.assertIsNone(board.grid[3][12])
+        self.assertEqual(board.retire_rows(6), 0)
+
+    def test_endless_match_keeps_a_bounded_grid(self):
+        env = HeadlessEnvironment(8, 400, engine="BITBOARD", collapse_mode="INSTANT", storage="SPARSE", retire_depth=24)
+        env.reset(4)
+        rng = random.Random(4)
+        for _ in range(20000):
+            env.step(rng.choice(PLAY_COMMANDS))
+
+        board = env.board
+        self.assertFalse(board.game_over)
+        # far more blocks than the play area holds went through the board
+        self.assertGreater(board.pieces_placed * 4, 8 * 24 * 4)
+        self.assertLessEqual(board.height - min(board.column_heights), 24)
+        self.assertLessEqual(len(board.grid.chunks), 3)  # type: ignore
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,48 @@
+import unittest
+from packages.TranspositionTable import TranspositionTable
+
+
+class TranspositionTableTester(unittest.TestCase):
+
+    def test_stores_and_counts_lookups(self):
+        table: TranspositionTable[float] = TranspositionTable(4)
+        table.put(10, 1.5)
+
+        self.assertEqual(table.get(10), 1.5)
+        self.assertIsNone(table.get(11))
+        self.assertEqual((table.hits, table.misses), (1, 1))
+
+    def test_stored_none_is_a_hit(self):
+        table: TranspositionTable[float | None] = TranspositionTable(4)
+        table.put(10, None)
+
+        self.assertIsNone(table.get(10))
+        self.assertEqual((table.hits, table.misses), (1, 0))
+        self.assertIn(10, table)
+
+    def test_drops_the_least_recently_used_entry(self):
+        table: TranspositionTable[int] = TranspositionTable(3)
+        for key in range(3):
+            table.put(key, key)
+
+        table.get(0)
+        table.put(3, 3)
+
+        self.assertEqual(len(table), 3)
+        self.assertNotIn(1, table)
+        self.assertIn(0, table)
+        self.assertIn(3, table)
+
+    def test_put_refreshes_existing_keys(self):
+        table: TranspositionTable[str] = TranspositionTable(2)
+        table.put(1, "a")
+        table.put(2, "b")
+        table.put(1, "c")
+        table.put(3, "d")
+
+        self.assertEqual(table.get(1), "c")
+        self.assertNotIn(2, table)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,106 @@
+import unittest
+from packages.Board import Board
+from packages.Block import Block
+from packages.Player import Player
+from packages.Zobrist import cell_keys, piece_key
+from packages.Piece import Piece
+from packages.Vector2 import Vector2
+from packages.SimulationFarm import RandomPlacementPolicy
+
+
+def hash_from_scratch(board: Board) -> int:
+    keys = cell_keys(board.width, board.height)
+    cell_hash = 0
+    for x, column in enumerate(board.grid):
+        for y, cell in enumerate(column):
+            if cell != None:
+                cell_hash ^= keys[x * board.height + y]
+    return cell_hash
+
+
+class ZobristTester(unittest.TestCase):
+
+    def test_incremental_hash_follows_random_play(self):
+        lines = 0
+        for seed in range(6):
+            for engine, storage, collapse_mode in (("GRID", "LIST", "ANIMATED"), ("BITBOARD", "COMPACT", "INSTANT")):
+                board = Board(6, 14, Player(persistent=False), engine=engine,
+                              collapse_mode=collapse_mode, storage=storage, seed=seed)
+                policy = RandomPlacementPolicy(seed)
+
+                while not board.game_over:
+                    board.movement(policy.command(board))
+                    board.physics_logic()
+                    self.assertEqual(board.cell_hash, hash_from_scratch(board))
+                lines += board.lines_cleared
+
+        # line clears, collapses and bombs all went through the hash
+        self.assertGreater(lines, 0)
+
+    def test_same_cells_hash_the_same_whatever_the_history(self):
+        first = Board(9, 20, Player(persistent=False), seed=1)
+        second = Board(9, 20, Player(persistent=False), seed=1)
+
+        first.grid[0][19] = Block()
+        first.grid[1][19] = Block()
+        second.grid[1][19] = Block()
+        second.grid[4][10] = Block()
+        second.grid[0][19] = Block('@')
+        second.grid[4][10] = None
+
+        self.assertEqual(first.cell_hash, second.cell_hash)
+        self.assertEqual(first.position_hash(), second.position_hash())
+
+    def test_position_hash_covers_the_piece_and_spawnlist(self):
+        board = Board(9, 20, Player(persistent=False), seed=2)
+        start = board.position_hash()
+
+        board.player_piece.origin.x += 1
+        moved = board.position_hash()
+        self.assertNotEqual(moved, start)
+
+        board.player_piece.origin.x -= 1
+        self.assertEqual(board.position_hash(), start)
+
+        board.spawnlist.reverse()
+        if board.spawnlist[0].type != board.spawnlist[-1].type:
+            self.assertNotEqual(board.position_hash(), start)
+
+    def test_snapshot_restore_restores_the_hash(self):
+        board = Board(6, 14, Player(persistent=False), seed=3)
+        board.grid[2][13] = Block()
+        snapshot = board.snapshot()
+        start = board.position_hash()
+
+        board.movement("HARD_DROP")
+        self.assertNotEqual(board.position_hash(), start)
+
+        board.restore(snapshot)
+        self.assertEqual(board.position_hash(), start)
+
+    def test_large_boards_hash_their_cell_keys(self):
+        board = Board(300, 300, Player(persistent=False), storage="SPARSE", seed=2)
+        keys = cell_keys(board.width, board.height)
+
+        self.assertNotIsInstance(keys, tuple)
+        self.assertEqual(len(keys), 300 * 300)
+        self.assertEqual(len({keys[index] for index in range(0, 300 * 300, 7)}), len(range(0, 300 * 300, 7)))
+
+        for x, y in ((0, 299), (150, 10), (299, 0), (7, 7)):
+            board.grid[x][y] = Block()
+        board.grid[150][10] = None
+        self.assertEqual(board.cell_hash, hash_from_scratch(board))
+
+    def test_piece_coordinates_past_the_key_table_do_not_collide(self):
+        keys = {piece_key(Piece(Vector2(x, y), "LINE")) for x in range(-2, 260) for y in (0, 37, 101)}
+        self.assertEqual(len(keys), 262 * 3)
+
+        board = Board(200, 40, Player(persistent=False), storage="SPARSE", seed=3)
+        board.player_piece = Piece(Vector2(10, 37), "LINE")
+        near = board.position_hash()
+        board.player_piece = Piece(Vector2(74, 37), "LINE")
+        self.assertNotEqual(board.position_hash(), near)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
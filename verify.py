@@ -0,0 +1,22 @@
+from packages.ReplayVerifier import ReplayVerifier
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica as pontuações de um diretório de replays.")
+    parser.add_argument("directory")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--full", action="store_true", help="simula até o fim mesmo após divergir")
+    args = parser.parse_args()
+
+    report = ReplayVerifier(args.workers, stop_early=not args.full).verify_directory(args.directory)
+
+    for result in report.rejected:
+        print(f"{result.path}: declarado {result.claimed_score}, simulado {result.simulated_score}, "
+              f"divergiu no tick {result.divergence_tick} ({result.divergence_reason})")
+    print(f"{len(report.results) - len(report.rejected)}/{len(report.results)} replays válidos, "
+          f"{report.replays_per_second:.1f} replays/s")
+
+
+if __name__ == "__main__":
+    main()